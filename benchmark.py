@@ -0,0 +1,166 @@
+"""
+Micro-benchmarks for the data loaders
+Times the optimised loader paths against the implementations they replaced,
+on synthetic data generated for the run, and checks that both agree.
+
+    excel        Acquisition workbook ingest: each sheet read twice with
+                 pd.read_excel and filtered once per well, versus one cached
+                 parse (excel_ingest.read_sheet) and a groupby split
+    trajectory   Survey to TVD/North/East: the former per-station average
+                 angle loop versus the vectorised minimum_curvature
+
+Writing the workbook needs openpyxl.
+
+Usage:
+    python benchmark.py                              # every case
+    python benchmark.py --case excel --wells 1000 --rows 30
+    python benchmark.py --case trajectory --stations 50000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# The loaders import each other flat, as Data_Import_Export does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flask', 'utils'))
+
+
+def best_of(repeat: int, func, *args):
+    """Fastest wall time of repeat runs (seconds) and the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+# ---------------------------------------------------------------- excel
+
+def write_workbook(path: str, wells: int, rows: int):
+    """Acquisition summary with DEV and ZONES sheets; the WELL header sits
+    below a title row and right of a notes column, as in the field files"""
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    names = np.repeat([f'W-{i:04d}' for i in range(wells)], rows)
+    md = np.tile(np.arange(rows) * 30.0, wells)
+    dev = pd.DataFrame({'WELL': names, 'MD': md,
+                        'INC': rng.uniform(0, 60, md.size), 'AZI': rng.uniform(0, 360, md.size)})
+    zones = pd.DataFrame({'WELL': names, 'ZONE': np.tile([f'Z{z}' for z in range(rows)], wells),
+                          'TOP': md, 'BASE': md + 30.0})
+    with pd.ExcelWriter(path) as writer:
+        for sheet, frame in (('DEV', dev), ('ZONES', zones)):
+            frame.to_excel(writer, sheet_name=sheet, startrow=1, startcol=1, index=False)
+            writer.sheets[sheet].cell(row=1, column=1, value='Acquisition summary')
+
+
+def excel_before(path: str, sheets) -> dict:
+    import pandas as pd
+    from excel_ingest import find_first_occurrence
+    result = {}
+    for sheet in sheets:
+        raw = pd.read_excel(path, sheet_name=sheet, header=None)
+        row, col = find_first_occurrence(raw, 'WELL')
+        df = pd.read_excel(path, sheet_name=sheet, header=row).iloc[:, col:].dropna(how='all')
+        result[sheet] = {well: df[df['WELL'] == well].drop('WELL', axis=1) for well in df['WELL'].unique()}
+    return result
+
+
+def excel_after(path: str, sheets) -> dict:
+    from excel_ingest import clear_workbook_cache, read_sheet, split_by_well
+    # Each run starts cold; the cache only shares the parse between sheets
+    clear_workbook_cache()
+    return {sheet: split_by_well(read_sheet(path, sheet, header_word='WELL').dropna(how='all'))
+            for sheet in sheets}
+
+
+def split_before(df) -> dict:
+    return {well: df[df['WELL'] == well].drop('WELL', axis=1) for well in df['WELL'].unique()}
+
+
+def bench_excel(args):
+    from excel_ingest import read_sheet, split_by_well
+    sheets = ('DEV', 'ZONES')
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'acquisition.xlsx')
+        write_workbook(path, args.wells, args.rows)
+        print(f'excel: {args.wells} wells x {args.rows} rows per sheet, sheets {", ".join(sheets)}')
+        before, old = best_of(args.repeat, excel_before, path, sheets)
+        after, new = best_of(args.repeat, excel_after, path, sheets)
+        df = read_sheet(path, 'DEV', header_word='WELL')
+        split_old, _ = best_of(args.repeat, split_before, df)
+        split_new, _ = best_of(args.repeat, split_by_well, df)
+
+    for sheet in sheets:
+        assert list(old[sheet]) == list(new[sheet]), f'{sheet}: well order differs'
+        for well, frame in old[sheet].items():
+            assert frame.reset_index(drop=True).equals(new[sheet][well].reset_index(drop=True)), \
+                f'{sheet}/{well}: frames differ'
+    report('ingest (read + split)', before, after)
+    report('per-well split only', split_old, split_new)
+
+
+# ----------------------------------------------------------- trajectory
+
+def trajectory_before(md, inc, azi):
+    """The per-station average angle loop Survey used before minimum_curvature"""
+    tvd, north, east = [md[0]], [0.0], [0.0]
+    for i in range(1, len(md)):
+        course = md[i] - md[i - 1]
+        inclination = np.radians(0.5 * (inc[i - 1] + inc[i]))
+        azimuth = np.radians(0.5 * (azi[i - 1] + azi[i]))
+        horizontal = course * np.sin(inclination)
+        tvd.append(tvd[-1] + course * np.cos(inclination))
+        north.append(north[-1] + horizontal * np.cos(azimuth))
+        east.append(east[-1] + horizontal * np.sin(azimuth))
+    return tvd, north, east
+
+
+def bench_trajectory(args):
+    from fe_data_objects import minimum_curvature
+    n = args.stations
+    md = np.linspace(0.0, 5000.0, n)
+    inc = np.clip(md / 40.0, 0.0, 85.0)
+    azi = (30.0 + md / 100.0) % 360.0
+    print(f'trajectory: {n} stations')
+    before, _ = best_of(args.repeat, trajectory_before, md, inc, azi)
+    after, _ = best_of(args.repeat, minimum_curvature, md, inc, azi)
+    report('survey to TVD/N/E', before, after)
+
+    # A constant build to horizontal over a quarter circle of radius 100
+    arc_md = np.linspace(0.0, np.pi * 50.0, 91)
+    arc = minimum_curvature(arc_md, np.linspace(0.0, 90.0, 91), np.zeros(91), tvd_start=0.0)
+    assert abs(arc.tvd[-1] - 100.0) < 1e-9 and abs(arc.north[-1] - 100.0) < 1e-9, 'quarter circle check failed'
+    print(f'{"":<24}90 degree arc of radius 100: TVD {arc.tvd[-1]:.6f}, North {arc.north[-1]:.6f}')
+
+
+def report(label: str, before: float, after: float):
+    print(f'  {label:<22}{before * 1000:>10.1f} ms -> {after * 1000:>9.1f} ms  ({before / after:.1f}x)')
+
+
+CASES = {
+    'excel': bench_excel,
+    'trajectory': bench_trajectory,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for the data loaders')
+    parser.add_argument('--case', choices=[*CASES, 'all'], default='all')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the fastest is reported')
+    parser.add_argument('--wells', type=int, default=1000, help='Wells in the generated workbook')
+    parser.add_argument('--rows', type=int, default=30, help='Rows per well and sheet in the generated workbook')
+    parser.add_argument('--stations', type=int, default=50000, help='Survey stations for the trajectory case')
+    args = parser.parse_args()
+
+    for name, bench in CASES.items():
+        if args.case in (name, 'all'):
+            bench(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,9 @@
 import os
 import secrets
-import logging
-import sys
-from flask import Flask, send_from_directory, session
+from flask import Flask, Response, send_from_directory, session
 from flask_cors import CORS
 from routes import api
+from utils import compression, log_config, metrics, profiling
 
 # Configuration
 WORKSPACE_ROOT = os.path.join(os.getcwd(), "petrophysics-workplace")
@@ -15,11 +14,10 @@ def create_app():
     static_folder = '../dist/public' if IS_PRODUCTION else None
     app = Flask(__name__, static_folder=static_folder)
     
-    # Configure logging
-    logging.basicConfig(
-        level=logging.DEBUG if not IS_PRODUCTION else logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        stream=sys.stdout
+    # Configure logging (LOG_LEVEL / LOG_FORMAT override the defaults)
+    log_config.configure_logging(
+        level=os.environ.get('LOG_LEVEL', 'INFO' if IS_PRODUCTION else 'DEBUG'),
+        fmt=os.environ.get('LOG_FORMAT', 'text')
     )
     
     # Session configuration
@@ -38,10 +36,27 @@ def create_app():
     # Register API routes
     app.register_blueprint(api, url_prefix='/api')
     
+    # Request ids on every log record and response
+    log_config.init_app(app)
+    
+    # Per-route latency, phase and response size metrics
+    metrics.init_app(app, prefix='/api')
+    
+    # Opt-in profiling of slow requests (PETRO_PROFILE=1)
+    profiling.init_app(app, workspace_root=WORKSPACE_ROOT, prefix='/api')
+    
+    # Negotiated gzip/brotli/zstd compression; registered last so it runs
+    # before the metrics hook and the recorded sizes are the encoded ones
+    compression.init_app(app, prefix='/api')
+    
     @app.route('/health')
     def health():
         return {'status': 'ok'}
     
+    @app.route('/metrics')
+    def prometheus_metrics():
+        return Response(metrics.render_metrics(), mimetype='text/plain; version=0.0.4')
+    
     # In production, serve frontend static files
     if IS_PRODUCTION:
         @app.route('/', defaults={'path': ''})
@@ -1,20 +1,35 @@
 import os
 import json
 import tempfile
-import traceback
+import logging
 import shutil
-import lasio
 import math
+import queue
+import time
 from pathlib import Path
 from datetime import datetime
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, Response, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 from utils.project_utils import create_project_structure
-from utils.fe_data_objects import Well, Dataset, Constant
-from utils.LogPlot import LogPlotManager
-from utils.logplotclass import create_multi_track_plot, FigureWidget
+from utils.fe_data_objects import (Well, Dataset, Constant, MergedView, DatasetExistsError, WellLockTimeout, well_lock,
+                                    project_well_files)
+from utils.las_import import LasParseError, import_las_file
+from utils.import_jobs import import_jobs
+from utils.batch_jobs import batch_jobs, OPERATIONS as BATCH_OPERATIONS
+from utils.trajectory import DIRECTIONAL_DATASET, project_trajectories, trajectory_summary, get_depth_converter
+from utils.zonation import (TOPS_DATASET, DEFAULT_CUTOFFS, load_zonations, ressum_table,
+                            ressum_to_dict, zone_statistics_table, sensitivity_table)
+from utils.petrophysics import COMPUTED_DATASET, compute_wells, load_vol_model, save_vol_model
+from utils.expressions import DEFAULT_CHUNK_SIZE, ExpressionError, evaluate_curves, stored_definitions
+from utils.provenance import recompute_wells, provenance_graph
+from utils.log_qc import METADATA_KEY as QC_KEY, qc_wells
+from utils.metrics import phase, timed
+from utils.etags import well_etag, not_modified, with_etag
+from utils.dir_tree import MAX_DEPTH, dir_snapshots, list_tree, tree_watcher
+from utils.file_reads import INLINE_MAX_BYTES, content_type, read_byte_range, read_line_range, head_lines, tail_lines
 
 api = Blueprint('api', __name__)
+logger = logging.getLogger(__name__)
 
 WORKSPACE_ROOT = os.path.join(os.getcwd(), "petrophysics-workplace")
 ALLOWED_EXTENSIONS = {'las', 'LAS'}
@@ -46,6 +61,7 @@ def get_workspace_info():
     })
 
 # Helper function to validate paths (prevents symlink traversal)
+@timed('validate')
 def validate_path(path_str):
     try:
         # Normalize paths for cross-platform compatibility
@@ -121,14 +137,11 @@ def list_directories():
         if not os.path.isdir(resolved_path):
             return jsonify({'error': 'Path is not a directory'}), 400
         
-        items = []
-        for item in os.listdir(resolved_path):
-            if not item.startswith('.'):
-                item_path = os.path.join(resolved_path, item)
-                if os.path.isdir(item_path):
-                    items.append({'name': item, 'path': item_path})
-        
-        items.sort(key=lambda x: x['name'])
+        items = [
+            {'name': name, 'path': os.path.join(resolved_path, name)}
+            for name, is_dir, _ in dir_snapshots.get(resolved_path).entries
+            if is_dir and not name.startswith('.')
+        ]
         can_go_up = resolved_path != WORKSPACE_ROOT
         
         return jsonify({
@@ -273,39 +286,59 @@ def list_data():
         if not os.path.isdir(resolved_path):
             return jsonify({'error': 'Path is not a directory'}), 400
         
-        items = []
-        for item in os.listdir(resolved_path):
-            if not item.startswith('.'):
-                item_path = os.path.join(resolved_path, item)
-                is_dir = os.path.isdir(item_path)
-                
-                has_files = False
-                if is_dir:
-                    try:
-                        has_files = any(os.path.isfile(os.path.join(item_path, f)) 
-                                      for f in os.listdir(item_path))
-                    except:
-                        pass
-                
-                items.append({
-                    'name': item,
-                    'path': item_path,
-                    'type': 'directory' if is_dir else 'file',
-                    'hasFiles': has_files
-                })
+        try:
+            depth = min(max(int(request.args.get('depth', 1)), 1), MAX_DEPTH)
+        except ValueError:
+            return jsonify({'error': 'depth must be an integer'}), 400
         
-        items.sort(key=lambda x: (x['type'] != 'directory', x['name']))
+        # Directory items carry 'children' down to the requested depth
+        items = list_tree(resolved_path, depth)
         can_go_up = resolved_path != WORKSPACE_ROOT
         
         return jsonify({
             'currentPath': resolved_path,
             'parentPath': os.path.dirname(resolved_path) if can_go_up else resolved_path,
             'items': items,
+            'depth': depth,
             'canGoUp': can_go_up
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api.route('/data/watch', methods=['GET'])
+def watch_data():
+    """Stream change notifications for a folder subtree as newline-delimited JSON"""
+    dir_path = request.args.get('path')
+    if not dir_path:
+        return jsonify({'error': 'Path is required'}), 400
+    
+    resolved_path = os.path.abspath(dir_path)
+    if not validate_path(resolved_path):
+        return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+    
+    if not os.path.isdir(resolved_path):
+        return jsonify({'error': 'Path is not a directory'}), 400
+    
+    def generate():
+        changes = tree_watcher.subscribe(resolved_path)
+        try:
+            yield json.dumps({'type': 'ready', 'path': resolved_path, 'mode': tree_watcher.mode}) + '\n'
+            while True:
+                try:
+                    changed = {changes.get(timeout=15.0)}
+                except queue.Empty:
+                    yield json.dumps({'type': 'heartbeat'}) + '\n'
+                    continue
+                # Coalesce the burst of events a single save or copy produces
+                time.sleep(0.2)
+                while not changes.empty():
+                    changed.add(changes.get_nowait())
+                yield json.dumps({'type': 'change', 'paths': sorted(changed)}) + '\n'
+        finally:
+            tree_watcher.unsubscribe(changes)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @api.route('/data/file', methods=['GET'])
 def read_file():
     try:
@@ -320,6 +353,28 @@ def read_file():
         if not os.path.isfile(resolved_path):
             return jsonify({'error': 'Path is not a file'}), 400
         
+        try:
+            args = {k: int(request.args[k]) for k in ('head', 'tail', 'offset', 'length', 'startLine', 'lineCount')
+                    if k in request.args}
+        except ValueError:
+            return jsonify({'error': 'head, tail, offset, length, startLine and lineCount must be integers'}), 400
+        
+        # Partial reads return only the requested part of the file
+        if 'head' in args:
+            return jsonify(head_lines(resolved_path, args['head']))
+        if 'tail' in args:
+            return jsonify(tail_lines(resolved_path, args['tail']))
+        if 'offset' in args or 'length' in args:
+            return jsonify(read_byte_range(resolved_path, args.get('offset', 0), args.get('length', INLINE_MAX_BYTES)))
+        if 'startLine' in args or 'lineCount' in args:
+            return jsonify(read_line_range(resolved_path, args.get('startLine', 0), args.get('lineCount', 100)))
+        
+        # Raw mode, and any file over the inline cap, is streamed from disk
+        # (send_file answers HTTP Range requests with 206 Partial Content)
+        if request.args.get('mode') == 'raw' or os.path.getsize(resolved_path) > INLINE_MAX_BYTES:
+            return send_file(resolved_path, mimetype=content_type(resolved_path), conditional=True,
+                             download_name=os.path.basename(resolved_path))
+        
         with open(resolved_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
@@ -352,6 +407,7 @@ def preview_las():
             tmp_path = tmp_file.name
         
         try:
+            import lasio
             las = lasio.read(tmp_path)
             
             # Extract well name - try multiple approaches
@@ -452,131 +508,41 @@ def create_from_las():
         try:
             logs.append({'message': 'Parsing LAS file...', 'type': 'info'})
             
-            # Read LAS file to get well information
-            las = lasio.read(tmp_las_path)
-            
-            # Extract well name - try multiple approaches
-            well_name = None
-            
-            # Try WELL mnemonic first
+            # Same import path as the batch import jobs: parse, QC, create or
+            # append under the well's write lock, copy the LAS and index it
             try:
-                if hasattr(las.well, 'WELL'):
-                    well_obj = las.well.WELL
-                    if well_obj and well_obj.value:
-                        well_name = str(well_obj.value).strip()
-            except:
-                pass
-            
-            # If not found, try accessing by iteration
-            if not well_name:
-                for item in las.well:
-                    if item.mnemonic.upper() == 'WELL' and item.value:
-                        well_name = str(item.value).strip()
-                        break
-            
-            # If still not found, use original filename without extension
-            if not well_name:
-                well_name = Path(filename).stem
+                result = import_las_file(tmp_las_path, resolved_project_path, filename=filename)
+            except WellLockTimeout as e:
+                logs.append({'message': f'ERROR: {e}', 'type': 'error'})
+                return jsonify({'error': 'Well is busy with another write, try again', 'logs': logs}), 503
+            except LasParseError as e:
+                logs.append({'message': f'ERROR: {e}', 'type': 'error'})
+                return jsonify({'error': str(e), 'logs': logs}), 400
+            except DatasetExistsError as e:
+                logs.append({'message': f'WARNING: {e}', 'type': 'warning'})
+                logs.append({'message': 'Upload cancelled to prevent duplicate data', 'type': 'error'})
+                return jsonify({
+                    'error': f'{e}. Cannot upload duplicate data.',
+                    'logs': logs
+                }), 400
             
+            well_name = result['well']
             logs.append({'message': f'Extracted well name: {well_name}', 'type': 'info'})
-            
-            # Extract dataset name from params.SET if available
-            dataset_name = 'MAIN'
-            try:
-                if hasattr(las.params, 'SET') and las.params.SET.value:
-                    dataset_name = str(las.params.SET.value).strip()
-            except:
-                pass
-            
-            logs.append({'message': f'Dataset name: {dataset_name}', 'type': 'info'})
-            
-            # Get top and bottom depths
-            top = las.well.STRT.value
-            bottom = las.well.STOP.value
-            
-            # Create dataset from LAS file using Dataset.from_las
-            dataset = Dataset.from_las(
-                filename=tmp_las_path,
-                dataset_name=dataset_name,
-                dataset_type='Cont',
-                well_name=well_name
-            )
-            
+            logs.append({'message': f"Dataset name: {result['dataset']}", 'type': 'info'})
             logs.append({'message': 'LAS file parsed successfully', 'type': 'success'})
-            logs.append({'message': f'Found {len(dataset.well_logs)} log curves', 'type': 'info'})
+            logs.append({'message': f"Found {result['curves']} log curves", 'type': 'info'})
             
-            # Check if well already exists
-            wells_folder = os.path.join(resolved_project_path, '10-WELLS')
-            os.makedirs(wells_folder, exist_ok=True)
+            qc_issues = result['qcIssues']
+            logs.append({'message': f'QC: {len(qc_issues)} issue(s) found', 'type': 'warning' if qc_issues else 'info'})
+            for issue in qc_issues:
+                logs.append({'message': f'QC: {issue}', 'type': 'warning'})
             
-            well_file_path = os.path.join(wells_folder, f'{well_name}.ptrc')
-            
-            if os.path.exists(well_file_path):
-                # Load existing well and check for duplicate dataset
-                logs.append({'message': f'Well "{well_name}" already exists, checking for duplicates...', 'type': 'info'})
-                well = Well.deserialize(filepath=well_file_path)
-                
-                # Check if dataset with same name already exists
-                existing_dataset_names = [dtst.name for dtst in well.datasets]
-                if dataset_name in existing_dataset_names:
-                    logs.append({'message': f'WARNING: Dataset "{dataset_name}" already exists in well "{well_name}"', 'type': 'warning'})
-                    logs.append({'message': 'Upload cancelled to prevent duplicate data', 'type': 'error'})
-                    return jsonify({
-                        'error': f'Dataset "{dataset_name}" already exists in well "{well_name}". Cannot upload duplicate data.',
-                        'logs': logs
-                    }), 400
-                
-                # Append new dataset
-                well.datasets.append(dataset)
-                logs.append({'message': f'Dataset "{dataset_name}" appended to existing well', 'type': 'success'})
+            if result['created']:
+                logs.append({'message': f'New well "{well_name}" created with REFERENCE and WELL_HEADER datasets', 'type': 'success'})
             else:
-                # Create new well with REFERENCE and WELL_HEADER datasets
-                logs.append({'message': f'Creating new well "{well_name}"...', 'type': 'info'})
-                well = Well(
-                    date_created=datetime.now(),
-                    well_name=well_name,
-                    well_type='Dev'
-                )
-                
-                # Create REFERENCE dataset
-                ref = Dataset.reference(
-                    top=0,
-                    bottom=bottom,
-                    dataset_name='REFERENCE',
-                    dataset_type='REFERENCE',
-                    well_name=well_name
-                )
-                
-                # Create WELL_HEADER dataset
-                wh = Dataset.well_header(
-                    dataset_name='WELL_HEADER',
-                    dataset_type='WELL_HEADER',
-                    well_name=well_name
-                )
-                const = Constant(name='WELL_NAME', value=well.well_name, tag=well.well_name)
-                wh.constants.append(const)
-                
-                # Add datasets to well
-                well.datasets.append(ref)
-                well.datasets.append(wh)
-                well.datasets.append(dataset)
-                
-                logs.append({'message': f'New well created with REFERENCE and WELL_HEADER datasets', 'type': 'success'})
-            
-            logs.append({'message': 'Saving well to project...', 'type': 'info'})
-            
-            # Save well to .ptrc file
-            well.serialize(filename=well_file_path)
-            
-            logs.append({'message': f'SUCCESS: Well saved to: {well_file_path}', 'type': 'success'})
-            
-            # Copy LAS file to 02-INPUT_LAS_FOLDER
-            las_folder = os.path.join(resolved_project_path, '02-INPUT_LAS_FOLDER')
-            os.makedirs(las_folder, exist_ok=True)
-            las_destination = os.path.join(las_folder, filename)
-            shutil.copy2(tmp_las_path, las_destination)
-            
-            logs.append({'message': f'SUCCESS: LAS file copied to: {las_destination}', 'type': 'success'})
+                logs.append({'message': f"Dataset \"{result['dataset']}\" appended to existing well", 'type': 'success'})
+            logs.append({'message': f"SUCCESS: Well saved to: {result['filePath']}", 'type': 'success'})
+            logs.append({'message': f"SUCCESS: LAS file copied to: {result['lasFilePath']}", 'type': 'success'})
             logs.append({'message': f'Well "{well_name}" created successfully!', 'type': 'success'})
             
             return jsonify({
@@ -585,10 +551,10 @@ def create_from_las():
                 'well': {
                     'id': well_name,
                     'name': well_name,
-                    'type': well.well_type
+                    'type': result['wellType']
                 },
-                'filePath': well_file_path,
-                'lasFilePath': las_destination,
+                'filePath': result['filePath'],
+                'lasFilePath': result['lasFilePath'],
                 'logs': logs
             }), 201
             
@@ -597,7 +563,7 @@ def create_from_las():
                 os.unlink(tmp_las_path)
                 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         logs.append({'message': f'ERROR: {str(e)}', 'type': 'error'})
         return jsonify({'error': str(e), 'logs': logs}), 500
 
@@ -620,57 +586,65 @@ def load_well():
         if not resolved_path.endswith('.ptrc'):
             return jsonify({'error': 'Invalid file type. Only .ptrc files are supported'}), 400
         
-        # Load well using Well.deserialize
-        well = Well.deserialize(filepath=resolved_path)
+        # Unchanged well: answer from the client's copy without deserializing
+        etag = well_etag(resolved_path)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        # Format datasets for frontend
-        datasets = []
-        for dataset in well.datasets:
-            # Format well logs
-            logs = []
-            for log in dataset.well_logs:
-                preview_values = log.log[:100] if hasattr(log, 'log') else []
-                logs.append({
-                    'name': log.name,
-                    'date': str(log.date) if hasattr(log, 'date') else '',
-                    'description': log.description if hasattr(log, 'description') else '',
-                    'dataset': log.dtst if hasattr(log, 'dtst') else dataset.name,
-                    'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
-                    'logType': log.log_type if hasattr(log, 'log_type') else '',
-                    'values': sanitize_list(preview_values)  # Limit to first 100 values for preview, sanitize NaN
-                })
-            
-            # Format constants
-            constants = []
-            if hasattr(dataset, 'constants') and dataset.constants:
-                for const in dataset.constants:
-                    constants.append({
-                        'name': const.name if hasattr(const, 'name') else '',
-                        'value': str(const.value) if hasattr(const, 'value') else '',
-                        'tag': const.tag if hasattr(const, 'tag') else ''
+        # Load well using Well.deserialize
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=resolved_path)
+        
+        with phase('encode'):
+            # Format datasets for frontend
+            datasets = []
+            for dataset in well.datasets:
+                # Format well logs
+                logs = []
+                for log in dataset.well_logs:
+                    preview_values = log.log[:100] if hasattr(log, 'log') else []
+                    logs.append({
+                        'name': log.name,
+                        'date': str(log.date) if hasattr(log, 'date') else '',
+                        'description': log.description if hasattr(log, 'description') else '',
+                        'dataset': log.dtst if hasattr(log, 'dtst') else dataset.name,
+                        'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
+                        'logType': log.log_type if hasattr(log, 'log_type') else '',
+                        'values': sanitize_list(preview_values)  # Limit to first 100 values for preview, sanitize NaN
                     })
             
-            datasets.append({
-                'name': dataset.name,
-                'type': dataset.type,
-                'wellname': dataset.wellname,
-                'indexName': dataset.index_name if hasattr(dataset, 'index_name') else 'DEPTH',
-                'logs': logs,
-                'constants': constants
-            })
+                # Format constants
+                constants = []
+                if hasattr(dataset, 'constants') and dataset.constants:
+                    for const in dataset.constants:
+                        constants.append({
+                            'name': const.name if hasattr(const, 'name') else '',
+                            'value': str(const.value) if hasattr(const, 'value') else '',
+                            'tag': const.tag if hasattr(const, 'tag') else ''
+                        })
+            
+                datasets.append({
+                    'name': dataset.name,
+                    'type': dataset.type,
+                    'wellname': dataset.wellname,
+                    'indexName': dataset.index_name if hasattr(dataset, 'index_name') else 'DEPTH',
+                    'logs': logs,
+                    'constants': constants
+                })
         
-        return jsonify({
-            'success': True,
-            'well': {
-                'name': well.well_name,
-                'type': well.well_type,
-                'dateCreated': str(well.date_created) if hasattr(well, 'date_created') else '',
-                'datasets': datasets
-            }
-        }), 200
+            return with_etag(jsonify({
+                'success': True,
+                'well': {
+                    'name': well.well_name,
+                    'type': well.well_type,
+                    'dateCreated': str(well.date_created) if hasattr(well, 'date_created') else '',
+                    'datasets': datasets
+                }
+            }), etag), 200
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
 @api.route('/wells/data', methods=['GET'])
@@ -689,52 +663,60 @@ def get_well_data():
         if not os.path.exists(resolved_path):
             return jsonify({'error': 'Well file not found'}), 404
         
-        # Load well using Well.deserialize
-        well = Well.deserialize(filepath=resolved_path)
+        # Unchanged well: answer from the client's copy without deserializing
+        etag = well_etag(resolved_path)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        # Format datasets with complete data
-        datasets = []
-        for dataset in well.datasets:
-            # Format well logs with all values
-            logs = []
-            for log in dataset.well_logs:
-                logs.append({
-                    'name': log.name,
-                    'date': str(log.date) if hasattr(log, 'date') else '',
-                    'description': log.description if hasattr(log, 'description') else '',
-                    'dtst': log.dtst if hasattr(log, 'dtst') else dataset.name,
-                    'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
-                    'log_type': log.log_type if hasattr(log, 'log_type') else '',
-                    'log': sanitize_list(log.log) if hasattr(log, 'log') else []  # Complete values with NaN converted to null
-                })
-            
-            # Format constants
-            constants = []
-            if hasattr(dataset, 'constants') and dataset.constants:
-                for const in dataset.constants:
-                    constants.append({
-                        'name': const.name if hasattr(const, 'name') else '',
-                        'value': const.value if hasattr(const, 'value') else '',
-                        'tag': const.tag if hasattr(const, 'tag') else ''
+        # Load well using Well.deserialize
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=resolved_path)
+        
+        with phase('encode'):
+            # Format datasets with complete data
+            datasets = []
+            for dataset in well.datasets:
+                # Format well logs with all values
+                logs = []
+                for log in dataset.well_logs:
+                    logs.append({
+                        'name': log.name,
+                        'date': str(log.date) if hasattr(log, 'date') else '',
+                        'description': log.description if hasattr(log, 'description') else '',
+                        'dtst': log.dtst if hasattr(log, 'dtst') else dataset.name,
+                        'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
+                        'log_type': log.log_type if hasattr(log, 'log_type') else '',
+                        'log': sanitize_list(log.log) if hasattr(log, 'log') else []  # Complete values with NaN converted to null
                     })
             
-            datasets.append({
-                'name': dataset.name,
-                'type': dataset.type,
-                'wellname': dataset.wellname,
-                'index_name': dataset.index_name if hasattr(dataset, 'index_name') else 'DEPTH',
-                'index_log': sanitize_list(dataset.index_log) if hasattr(dataset, 'index_log') else [],
-                'well_logs': logs,
-                'constants': constants
-            })
+                # Format constants
+                constants = []
+                if hasattr(dataset, 'constants') and dataset.constants:
+                    for const in dataset.constants:
+                        constants.append({
+                            'name': const.name if hasattr(const, 'name') else '',
+                            'value': const.value if hasattr(const, 'value') else '',
+                            'tag': const.tag if hasattr(const, 'tag') else ''
+                        })
+            
+                datasets.append({
+                    'name': dataset.name,
+                    'type': dataset.type,
+                    'wellname': dataset.wellname,
+                    'index_name': dataset.index_name if hasattr(dataset, 'index_name') else 'DEPTH',
+                    'index_log': sanitize_list(dataset.index_log) if hasattr(dataset, 'index_log') else [],
+                    'well_logs': logs,
+                    'constants': constants
+                })
         
-        return jsonify({
-            'success': True,
-            'datasets': datasets
-        }), 200
+            return with_etag(jsonify({
+                'success': True,
+                'datasets': datasets
+            }), etag), 200
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
 @api.route('/wells/dataset-details', methods=['GET'])
@@ -757,59 +739,68 @@ def get_dataset_details():
         if not os.path.exists(resolved_path):
             return jsonify({'error': 'Well file not found'}), 404
         
+        # Unchanged well: answer from the client's copy without deserializing
+        etag = well_etag(resolved_path, dataset_name)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
         # Load well using Well.deserialize
-        well = Well.deserialize(filepath=resolved_path)
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=resolved_path)
         
         # Find the requested dataset
         target_dataset = None
-        for dataset in well.datasets:
-            if dataset.name == dataset_name:
-                target_dataset = dataset
-                break
+        with phase('search'):
+            for dataset in well.datasets:
+                if dataset.name == dataset_name:
+                    target_dataset = dataset
+                    break
         
         if not target_dataset:
             return jsonify({'error': f'Dataset "{dataset_name}" not found'}), 404
         
-        # Format well logs with complete data
-        logs = []
-        for log in target_dataset.well_logs:
-            logs.append({
-                'name': log.name,
-                'date': str(log.date) if hasattr(log, 'date') else '',
-                'description': log.description if hasattr(log, 'description') else '',
-                'dtst': log.dtst if hasattr(log, 'dtst') else target_dataset.name,
-                'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
-                'log_type': log.log_type if hasattr(log, 'log_type') else '',
-                'log': sanitize_list(log.log) if hasattr(log, 'log') else []
-            })
-        
-        # Format constants
-        constants = []
-        if hasattr(target_dataset, 'constants') and target_dataset.constants:
-            for const in target_dataset.constants:
-                constants.append({
-                    'name': const.name if hasattr(const, 'name') else '',
-                    'value': const.value if hasattr(const, 'value') else '',
-                    'tag': const.tag if hasattr(const, 'tag') else ''
+        with phase('encode'):
+            # Format well logs with complete data
+            logs = []
+            for log in target_dataset.well_logs:
+                logs.append({
+                    'name': log.name,
+                    'date': str(log.date) if hasattr(log, 'date') else '',
+                    'description': log.description if hasattr(log, 'description') else '',
+                    'dtst': log.dtst if hasattr(log, 'dtst') else target_dataset.name,
+                    'interpolation': log.interpolation if hasattr(log, 'interpolation') else '',
+                    'log_type': log.log_type if hasattr(log, 'log_type') else '',
+                    'log': sanitize_list(log.log) if hasattr(log, 'log') else []
                 })
         
-        dataset_details = {
-            'name': target_dataset.name,
-            'type': target_dataset.type,
-            'wellname': target_dataset.wellname,
-            'index_name': target_dataset.index_name if hasattr(target_dataset, 'index_name') else 'DEPTH',
-            'index_log': sanitize_list(target_dataset.index_log) if hasattr(target_dataset, 'index_log') else [],
-            'well_logs': logs,
-            'constants': constants
-        }
+            # Format constants
+            constants = []
+            if hasattr(target_dataset, 'constants') and target_dataset.constants:
+                for const in target_dataset.constants:
+                    constants.append({
+                        'name': const.name if hasattr(const, 'name') else '',
+                        'value': const.value if hasattr(const, 'value') else '',
+                        'tag': const.tag if hasattr(const, 'tag') else ''
+                    })
         
-        return jsonify({
-            'success': True,
-            'dataset': dataset_details
-        }), 200
+            dataset_details = {
+                'name': target_dataset.name,
+                'type': target_dataset.type,
+                'wellname': target_dataset.wellname,
+                'index_name': target_dataset.index_name if hasattr(target_dataset, 'index_name') else 'DEPTH',
+                'index_log': sanitize_list(target_dataset.index_log) if hasattr(target_dataset, 'index_log') else [],
+                'well_logs': logs,
+                'constants': constants
+            }
+        
+            return with_etag(jsonify({
+                'success': True,
+                'dataset': dataset_details
+            }), etag), 200
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
 @api.route('/wells/list', methods=['GET'])
@@ -835,7 +826,8 @@ def list_wells():
             if filename.endswith('.ptrc'):
                 file_path = os.path.join(wells_folder, filename)
                 try:
-                    well = Well.deserialize(filepath=file_path)
+                    with phase('deserialize'):
+                        well = Well.deserialize(filepath=file_path)
                     wells.append({
                         'id': well.well_name,
                         'name': well.well_name,
@@ -845,15 +837,172 @@ def list_wells():
                         'datasets': len(well.datasets)
                     })
                 except Exception as e:
-                    print(f"Error loading well {filename}: {e}")
+                    logger.warning('Error loading well %s: %s', filename, e)
                     continue
         
         wells.sort(key=lambda x: x['name'])
         return jsonify({'wells': wells})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Batch Import Job Routes
+@api.route('/wells/import-jobs', methods=['POST'])
+def start_import_job():
+    """Start a background job importing new LAS files into a project"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+
+        project_path = data.get('projectPath')
+        paths = data.get('paths')
+
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+
+        resolved_project_path = os.path.abspath(project_path)
+        if not validate_path(resolved_project_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+
+        if not os.path.isdir(resolved_project_path):
+            return jsonify({'error': 'Project path does not exist'}), 404
+
+        resolved_paths = None
+        if paths is not None:
+            if not isinstance(paths, list):
+                return jsonify({'error': 'paths must be a list of LAS file paths'}), 400
+            resolved_paths = []
+            for path in paths:
+                resolved = os.path.abspath(path)
+                if not validate_path(resolved):
+                    return jsonify({'error': f'Access denied: {path} is outside petrophysics-workplace'}), 403
+                if not os.path.isfile(resolved) or not allowed_file(resolved):
+                    return jsonify({'error': f'Not a LAS file: {path}'}), 400
+                resolved_paths.append(resolved)
+
+        job = import_jobs.start_job(resolved_project_path, resolved_paths)
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
+
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/import-jobs', methods=['GET'])
+def list_import_jobs():
+    """List batch import jobs started by any server worker"""
+    try:
+        jobs = sorted(import_jobs.list(), key=lambda j: j.created_at, reverse=True)
+        return jsonify({'jobs': [job.to_dict() for job in jobs]})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/import-jobs/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    """Get status and throughput of a batch import job"""
+    job = import_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': f'Import job {job_id} not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@api.route('/wells/import-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_import_job(job_id):
+    """Cancel a running batch import job after its current file"""
+    job = import_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': f'Import job {job_id} not found'}), 404
+    job.cancel()
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@api.route('/wells/batch-jobs', methods=['POST'])
+def start_batch_job():
+    """Start a background job applying an operation to every (or selected) well of a project"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        operation = data.get('operation')
+        
+        if not project_path or not operation:
+            return jsonify({'error': 'Project path and operation are required'}), 400
+        
+        resolved_project_path = os.path.abspath(project_path)
+        if not validate_path(resolved_project_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        try:
+            job = batch_jobs.start_job(
+                resolved_project_path,
+                operation,
+                wells=data.get('wells'),
+                options=data.get('options'),
+                max_workers=int(data['workers']) if data.get('workers') else None,
+                retries=int(data.get('retries', 1))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
         
     except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
+@api.route('/wells/batch-jobs', methods=['GET'])
+def list_batch_jobs():
+    """List batch jobs started by any server worker, with the available operations"""
+    try:
+        jobs = sorted(batch_jobs.list(), key=lambda j: j.created_at, reverse=True)
+        return jsonify({
+            'operations': sorted(BATCH_OPERATIONS),
+            'jobs': [job.to_dict(include_results=False) for job in jobs]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/batch-jobs/<job_id>', methods=['GET'])
+def get_batch_job(job_id):
+    """Get status, progress and per-well results of a batch job"""
+    job = batch_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': f'Batch job {job_id} not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@api.route('/wells/batch-jobs/<job_id>/stream', methods=['GET'])
+def stream_batch_job(job_id):
+    """Stream per-well results of a batch job as newline-delimited JSON"""
+    job = batch_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': f'Batch job {job_id} not found'}), 404
+    
+    # The job may run in another worker, in which case its stored state is polled
+    total_wells = job.to_dict(include_results=False)['totalWells']
+    
+    def generate():
+        seen = 0
+        while True:
+            for result in job.wait_for_results(seen):
+                seen += 1
+                yield json.dumps({'type': 'result', **result}, default=str) + '\n'
+            if job.done and seen >= len(job.results):
+                yield json.dumps({'type': 'status', **job.to_dict(include_results=False)}, default=str) + '\n'
+                break
+            yield json.dumps({'type': 'progress', 'completedWells': len(job.results),
+                              'failedWells': len(job.errors), 'totalWells': total_wells}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api.route('/wells/batch-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_batch_job(job_id):
+    """Cancel a batch job; wells already running are finished first"""
+    job = batch_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': f'Batch job {job_id} not found'}), 404
+    job.cancel()
+    return jsonify({'success': True, 'job': job.to_dict(include_results=False)})
+
 # Session Management Routes
 @api.route('/session/project', methods=['POST'])
 def save_project_session():
@@ -952,7 +1101,8 @@ def get_well_datasets():
         if not os.path.exists(well_file):
             return jsonify({'error': f'Well {well_name} not found'}), 404
         
-        well = Well.deserialize(filepath=well_file)
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=well_file)
         
         # Collect all unique log names from datasets
         datasets = []
@@ -983,7 +1133,7 @@ def get_well_datasets():
         }), 200
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
 # Well Log Plotting Routes
@@ -991,53 +1141,64 @@ def get_well_datasets():
 def generate_log_plot(well_id):
     """Generate a well log plot for specified logs"""
     try:
-        print(f"[LOG PLOT] Starting log plot generation for well: {well_id}")
+        logger.debug('Log plot requested for well %s', well_id)
         data = request.get_json()
         project_path = data.get('projectPath')
         log_names = data.get('logNames', [])
+        depth_type = str(data.get('depthType', 'MD')).upper()
         
         if not project_path:
-            print("[LOG PLOT] Error: Project path is required")
+            logger.warning('Log plot rejected: project path is required')
             return jsonify({'error': 'Project path is required'}), 400
         
         if not log_names or len(log_names) == 0:
-            print("[LOG PLOT] Error: No log names provided")
+            logger.warning('Log plot rejected: no log names provided')
             return jsonify({'error': 'At least one log name is required'}), 400
         
-        print(f"[LOG PLOT] Plotting logs: {', '.join(log_names)}")
+        logger.debug('Log plot logs: %s', log_names)
         
         # Validate path
         resolved_path = os.path.abspath(project_path)
         if not validate_path(resolved_path):
-            print("[LOG PLOT] Error: Path validation failed")
+            logger.warning('Log plot rejected: path outside workspace: %s', resolved_path)
             return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
         
         # Load the well
         wells_folder = os.path.join(resolved_path, "10-WELLS")
         well_file = os.path.join(wells_folder, f"{well_id}.ptrc")
         
-        print(f"[LOG PLOT] Loading well from: {well_file}")
+        logger.debug('Loading well from %s', well_file)
         if not os.path.exists(well_file):
-            print(f"[LOG PLOT] Error: Well file not found")
+            logger.warning('Log plot: well file not found: %s', well_file)
             return jsonify({'error': f'Well {well_id} not found'}), 404
         
-        well = Well.deserialize(filepath=well_file)
-        print(f"[LOG PLOT] Well loaded successfully: {well.well_name}")
-        print(f"[LOG PLOT] Number of datasets: {len(well.datasets)}")
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=well_file)
+        logger.debug('Well %s loaded with %d datasets', well.well_name, len(well.datasets))
         
         # Generate the plot using GitHub repo classes
-        print("[LOG PLOT] Initializing LogPlotManager...")
+        from utils.LogPlot import LogPlotManager
+        
         plot_manager = LogPlotManager()
         
-        print("[LOG PLOT] Creating log plot with matplotlib...")
-        plot_image = plot_manager.create_log_plot(well, log_names)
+        depth_transform = None
+        if depth_type != 'MD':
+            if depth_type not in ('TVD', 'TVDSS'):
+                return jsonify({'error': f'Unknown depth type {depth_type}. Use MD, TVD or TVDSS'}), 400
+            try:
+                converter = get_depth_converter(well_file)
+            except ValueError as e:
+                return jsonify({'error': f'Cannot plot in {depth_type}: {str(e)}'}), 400
+            depth_transform = converter.to_tvd if depth_type == 'TVD' else converter.to_tvdss
+        
+        plot_image = plot_manager.create_log_plot(well, log_names, depth_transform=depth_transform,
+                                                  depth_label=depth_type if depth_transform else None)
         
         if not plot_image:
-            print("[LOG PLOT] Error: Plot generation failed")
+            logger.warning('Log plot generation failed for well %s', well_id)
             return jsonify({'error': 'Failed to generate plot'}), 500
         
-        print("[LOG PLOT] Plot generated successfully!")
-        print(f"[LOG PLOT] Image size: {len(plot_image)} characters (base64)")
+        logger.info('Log plot for well %s: %d logs, %d base64 chars', well_id, len(log_names), len(plot_image))
         
         return jsonify({
             'success': True,
@@ -1054,61 +1215,56 @@ def generate_log_plot(well_id):
         }), 200
         
     except Exception as e:
-        print(f"[LOG PLOT] Error: {str(e)}")
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
 
 @api.route('/wells/<well_id>/cross-plot', methods=['POST'])
 def generate_cross_plot(well_id):
     """Generate a cross plot of two logs"""
     try:
-        print(f"[CROSS PLOT] Starting cross plot generation for well: {well_id}")
+        logger.debug('Cross plot requested for well %s', well_id)
         data = request.get_json()
         project_path = data.get('projectPath')
         x_log_name = data.get('xLog')
         y_log_name = data.get('yLog')
         
         if not project_path or not x_log_name or not y_log_name:
-            print("[CROSS PLOT] Error: Missing required parameters")
+            logger.warning('Cross plot rejected: missing required parameters')
             return jsonify({'error': 'Project path, x log, and y log are required'}), 400
         
-        print(f"[CROSS PLOT] X-axis log: {x_log_name}")
-        print(f"[CROSS PLOT] Y-axis log: {y_log_name}")
+        logger.debug('Cross plot logs: x=%s y=%s', x_log_name, y_log_name)
         
         # Validate path
         resolved_path = os.path.abspath(project_path)
         if not validate_path(resolved_path):
-            print("[CROSS PLOT] Error: Path validation failed")
+            logger.warning('Cross plot rejected: path outside workspace: %s', resolved_path)
             return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
         
         # Load the well
         wells_folder = os.path.join(resolved_path, "10-WELLS")
         well_file = os.path.join(wells_folder, f"{well_id}.ptrc")
         
-        print(f"[CROSS PLOT] Loading well from: {well_file}")
+        logger.debug('Loading well from %s', well_file)
         if not os.path.exists(well_file):
-            print("[CROSS PLOT] Error: Well file not found")
+            logger.warning('Cross plot: well file not found: %s', well_file)
             return jsonify({'error': f'Well {well_id} not found'}), 404
         
-        well = Well.deserialize(filepath=well_file)
-        print(f"[CROSS PLOT] Well loaded successfully: {well.well_name}")
-        print(f"[CROSS PLOT] Number of datasets: {len(well.datasets)}")
+        with phase('deserialize'):
+            well = Well.deserialize(filepath=well_file)
+        logger.debug('Well %s loaded with %d datasets', well.well_name, len(well.datasets))
         
         # Use CPI.py CrossPlotManager (GitHub repo pattern)
         from utils.CPI import CrossPlotManager
         
-        print("[CROSS PLOT] Initializing CrossPlotManager...")
         manager = CrossPlotManager()
         
-        print("[CROSS PLOT] Creating cross plot with matplotlib...")
         plot_image = manager.create_cross_plot(well, x_log_name, y_log_name)
         
         if plot_image is None:
-            print("[CROSS PLOT] Error: Failed to generate plot")
+            logger.warning('Cross plot generation failed for well %s', well_id)
             return jsonify({'error': 'Failed to generate cross plot - logs not found or no valid data'}), 404
         
-        print("[CROSS PLOT] Cross plot generated successfully!")
-        print(f"[CROSS PLOT] Image size: {len(plot_image)} characters (base64)")
+        logger.info('Cross plot for well %s: %s vs %s, %d base64 chars', well_id, y_log_name, x_log_name, len(plot_image))
         
         return jsonify({
             'success': True,
@@ -1126,5 +1282,504 @@ def generate_cross_plot(well_id):
         }), 200
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/trajectories', methods=['GET'])
+def get_project_trajectories():
+    """Compute minimum curvature trajectories for all wells of a project"""
+    try:
+        project_path = request.args.get('projectPath')
+        dataset_name = request.args.get('datasetName', DIRECTIONAL_DATASET)
+        include_stations = request.args.get('includeStations', 'false').lower() == 'true'
+        
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        results = project_trajectories(resolved_path, dataset_name)
+        
+        wells = []
+        for well_name, result in sorted(results.items()):
+            if 'error' in result:
+                wells.append({'name': well_name, 'error': result['error']})
+                continue
+            traj = result['trajectory']
+            entry = {'name': well_name, 'summary': trajectory_summary(traj)}
+            if include_stations:
+                entry['stations'] = {k: sanitize_list(v) for k, v in traj.to_dict().items()}
+            wells.append(entry)
+        
+        return jsonify({'success': True, 'wells': wells}), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/<well_id>/depth-convert', methods=['POST'])
+def convert_well_depths(well_id):
+    """Convert MD values to TVD/TVDSS (or TVD values to MD) using the well's survey"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        dataset_name = data.get('datasetName', DIRECTIONAL_DATASET)
+        
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_file = os.path.join(resolved_path, "10-WELLS", f"{well_id}.ptrc")
+        if not os.path.exists(well_file):
+            return jsonify({'error': f'Well {well_id} not found'}), 404
+        
+        try:
+            converter = get_depth_converter(well_file, dataset_name)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = {'success': True, 'elevation': converter.elevation}
+        if data.get('md') is not None:
+            md = [float('nan') if v is None else float(v) for v in data['md']]
+            result['md'] = sanitize_list(md)
+            result['tvd'] = sanitize_list(converter.to_tvd(md).tolist())
+            result['tvdss'] = sanitize_list(converter.to_tvdss(md).tolist())
+        elif data.get('tvd') is not None:
+            tvd = [float('nan') if v is None else float(v) for v in data['tvd']]
+            result['tvd'] = sanitize_list(tvd)
+            result['md'] = sanitize_list(converter.to_md(tvd).tolist())
+        else:
+            return jsonify({'error': 'Either md or tvd values are required'}), 400
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/<well_id>/export', methods=['POST'])
+def export_well_logs(well_id):
+    """Export logs from one or more datasets on a common depth axis to LAS or CSV"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        dataset_names = data.get('datasetNames')
+        log_names = data.get('logNames')
+        export_format = str(data.get('format', 'las')).lower()
+        step = data.get('step')
+        method = data.get('method')
+        
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        if export_format not in ('las', 'csv'):
+            return jsonify({'error': f'Unknown export format {export_format}. Use las or csv'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_file = os.path.join(resolved_path, "10-WELLS", f"{well_id}.ptrc")
+        if not os.path.exists(well_file):
+            return jsonify({'error': f'Well {well_id} not found'}), 404
+        
+        # Only the selected dataset segments are read
+        try:
+            if dataset_names:
+                datasets = [Well.load_dataset_from_file(well_file, name) for name in dataset_names]
+            else:
+                datasets = [ds for ds in Well.deserialize(filepath=well_file).datasets
+                            if ds.type not in ('REFERENCE', 'WELL_HEADER')]
+            view = MergedView(datasets, step=float(step) if step else None, method=method)
+            if log_names:
+                for name in log_names:
+                    view.resolve(name)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        export_folder = os.path.join(resolved_path, "07-DATA_EXPORTS")
+        os.makedirs(export_folder, exist_ok=True)
+        set_name = '_'.join(ds.name for ds in view.datasets) or 'MERGED'
+        export_path = os.path.join(export_folder, secure_filename(f"{well_id}_{set_name}.{export_format}"))
+        
+        if export_format == 'las':
+            view.to_las(export_path, well_name=well_id, names=log_names, set_name=set_name)
+        else:
+            view.to_csv(export_path, names=log_names)
+        
+        return jsonify({
+            'success': True,
+            'filePath': export_path,
+            'format': export_format,
+            'samples': int(view.index.size),
+            'columns': log_names or view.log_names
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/zonal-summary', methods=['POST'])
+def get_zonal_summary():
+    """Compute RESSUM rows and per-zone curve statistics for one or more wells"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        try:
+            cutoffs = {key: float(value) for key, value in (data.get('cutoffs') or {}).items()}
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Cutoffs must be numeric'}), 400
+        
+        well_files = project_well_files(resolved_path, data.get('wells'))
+        if not well_files:
+            return jsonify({'error': 'No wells found'}), 404
+        
+        zonations, errors = load_zonations(
+            well_files,
+            dataset_name=data.get('datasetName', 'MAIN'),
+            zones_dataset=data.get('zonesDataset', TOPS_DATASET),
+            curves=data.get('curves'),
+            log_names=data.get('logNames')
+        )
+        
+        rows = [
+            {key: sanitize_value(value) for key, value in ressum_to_dict(row).items()}
+            for row in ressum_table(zonations, cutoffs)
+        ]
+        statistics = zone_statistics_table(zonations) if data.get('logNames') else []
+        for entry in statistics:
+            for curve in entry['curves'].values():
+                for key, value in curve.items():
+                    curve[key] = sanitize_value(value)
+        
+        return jsonify({
+            'success': True,
+            'ressum': rows,
+            'statistics': statistics,
+            'errors': errors
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/ressum-sensitivity', methods=['POST'])
+def get_ressum_sensitivity():
+    """Compute RESSUM rows for every zone over a grid of PHIE/SW/VSH cutoffs"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        grid = data.get('cutoffGrid') or {}
+        try:
+            cutoff_lists = {
+                key: [float(v) for v in (grid.get(key) or [DEFAULT_CUTOFFS[key]])]
+                for key in ('phie', 'sw', 'vsh')
+            }
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Cutoff grid values must be numeric lists'}), 400
+        
+        well_files = project_well_files(resolved_path, data.get('wells'))
+        if not well_files:
+            return jsonify({'error': 'No wells found'}), 404
+        
+        zonations, errors = load_zonations(
+            well_files,
+            dataset_name=data.get('datasetName', 'MAIN'),
+            zones_dataset=data.get('zonesDataset', TOPS_DATASET),
+            curves=data.get('curves')
+        )
+        table = sensitivity_table(zonations, cutoff_lists['phie'], cutoff_lists['sw'], cutoff_lists['vsh'])
+        columns = list(table)
+        
+        result = {'success': True, 'columns': columns, 'errors': errors}
+        if data.get('saveCsv'):
+            output_folder = os.path.join(resolved_path, "01-OUTPUT")
+            os.makedirs(output_folder, exist_ok=True)
+            output_path = os.path.join(output_folder, 'RESSUM_sensitivity.csv')
+            import pandas as pd
+            pd.DataFrame(table).to_csv(output_path, index=False)
+            result['filePath'] = output_path
+        result['rows'] = [
+            [sanitize_value(value) for value in row]
+            for row in zip(*(table[name].tolist() for name in columns))
+        ]
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/compute-petrophysics', methods=['POST'])
+def compute_petrophysics():
+    """Compute Vsh, porosity, Sw and permeability for one or more wells into a new dataset"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        parameters = dict(data.get('parameters') or {})
+        model_name = data.get('model')
+        if model_name:
+            try:
+                parameters = {**load_vol_model(resolved_path, secure_filename(model_name)), **parameters}
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 404
+        
+        well_files = project_well_files(resolved_path, data.get('wells'))
+        if not well_files:
+            return jsonify({'error': 'No wells found'}), 404
+        
+        results = compute_wells(
+            well_files,
+            dataset_name=data.get('datasetName', 'MAIN'),
+            parameters=parameters,
+            curves=data.get('curves'),
+            output_name=data.get('outputDataset', COMPUTED_DATASET)
+        )
+        
+        if data.get('saveModel') and model_name:
+            save_vol_model(resolved_path, secure_filename(model_name), parameters)
+        
+        return jsonify({
+            'success': True,
+            'wells': results,
+            'computed': sum(1 for r in results.values() if 'error' not in r),
+            'failed': sum(1 for r in results.values() if 'error' in r)
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/<well_id>/expression-curves', methods=['POST'])
+def evaluate_expression_curves(well_id):
+    """Evaluate 'NAME = expression' curve definitions on a dataset and save the results"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        dataset_name = data.get('datasetName')
+        if not project_path or not dataset_name:
+            return jsonify({'error': 'Project path and dataset name are required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_file = os.path.join(resolved_path, "10-WELLS", f"{well_id}.ptrc")
+        if not os.path.exists(well_file):
+            return jsonify({'error': f'Well {well_id} not found'}), 404
+        
+        # The write lock is held from reading the dataset to writing it back,
+        # so curves added by another worker in between are not overwritten
+        try:
+            with well_lock(well_file, exclusive=True):
+                try:
+                    dataset = Well.load_dataset_from_file(well_file, dataset_name)
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 404
+                try:
+                    header_constants = Well.load_dataset_from_file(well_file, 'WELL_HEADER').constants
+                except ValueError:
+                    header_constants = []
+                
+                # Without new definitions, the stored ones are re-evaluated
+                definitions = data.get('expressions') or stored_definitions(dataset)
+                if not definitions:
+                    return jsonify({'error': 'No expressions provided or stored on the dataset'}), 400
+                
+                try:
+                    results = evaluate_curves(
+                        dataset, definitions,
+                        parameters=data.get('parameters'),
+                        header_constants=header_constants,
+                        chunk_size=int(data.get('chunkSize', DEFAULT_CHUNK_SIZE))
+                    )
+                except (ExpressionError, TypeError) as e:
+                    return jsonify({'error': str(e)}), 400
+                
+                if any(result['changed'] for result in results):
+                    Well.replace_dataset_in_file(well_file, dataset)
+        except WellLockTimeout:
+            return jsonify({'error': f'Well {well_id} is busy with another write, try again'}), 503
+        
+        return jsonify({
+            'success': True,
+            'curves': results,
+            'definitions': stored_definitions(dataset)
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/recompute', methods=['POST'])
+def recompute_stale_curves():
+    """Recompute computed curves whose inputs or parameters changed"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_files = project_well_files(resolved_path, data.get('wells'))
+        if not well_files:
+            return jsonify({'error': 'No wells found'}), 404
+        
+        results = recompute_wells(well_files, dry_run=bool(data.get('dryRun', False)))
+        
+        return jsonify({
+            'success': True,
+            'dryRun': bool(data.get('dryRun', False)),
+            'wells': results,
+            'recomputed': sum(len(r.get('recomputed', [])) for r in results.values())
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/<well_id>/provenance', methods=['GET'])
+def get_well_provenance(well_id):
+    """Dependency graph of a well's computed curves, with stale flags"""
+    try:
+        project_path = request.args.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_file = os.path.join(resolved_path, "10-WELLS", f"{well_id}.ptrc")
+        if not os.path.exists(well_file):
+            return jsonify({'error': f'Well {well_id} not found'}), 404
+        
+        try:
+            graph = provenance_graph(well_file)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({'success': True, **graph}), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/qc', methods=['POST'])
+def run_log_qc():
+    """Run log QC across wells of a project and store the reports per dataset"""
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({'error': 'Invalid or missing JSON payload'}), 400
+        
+        project_path = data.get('projectPath')
+        if not project_path:
+            return jsonify({'error': 'Project path is required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_files = project_well_files(resolved_path, data.get('wells'))
+        if not well_files:
+            return jsonify({'error': 'No wells found'}), 404
+        
+        results = qc_wells(
+            well_files,
+            dataset_names=data.get('datasetNames'),
+            options=data.get('options'),
+            ranges=data.get('ranges')
+        )
+        
+        return jsonify({
+            'success': True,
+            'wells': results,
+            'issues': sum(len(r.get('issues', [])) for ds in results.values() for r in ds.values() if isinstance(r, dict))
+        }), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/wells/<well_id>/qc', methods=['GET'])
+def get_log_qc(well_id):
+    """Stored QC report of a well's dataset"""
+    try:
+        project_path = request.args.get('projectPath')
+        dataset_name = request.args.get('datasetName')
+        if not project_path or not dataset_name:
+            return jsonify({'error': 'Project path and dataset name are required'}), 400
+        
+        resolved_path = os.path.abspath(project_path)
+        if not validate_path(resolved_path):
+            return jsonify({'error': 'Access denied: path outside petrophysics-workplace'}), 403
+        
+        well_file = os.path.join(resolved_path, "10-WELLS", f"{well_id}.ptrc")
+        if not os.path.exists(well_file):
+            return jsonify({'error': f'Well {well_id} not found'}), 404
+        
+        try:
+            dataset = Well.load_dataset_from_file(well_file, dataset_name)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 404
+        
+        report = dataset.metadata.get(QC_KEY)
+        if report is None:
+            return jsonify({'error': f'No QC report for dataset {dataset_name}. Run QC first'}), 404
+        
+        return jsonify({'success': True, 'well': well_id, 'dataset': dataset_name, 'report': report}), 200
+        
+    except Exception as e:
+        logger.exception('%s %s failed', request.method, request.path)
         return jsonify({'error': str(e)}), 500
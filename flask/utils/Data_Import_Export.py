@@ -1,12 +1,60 @@
-import sys, datetime, os, pathlib
+import sys, datetime, os, pathlib, logging
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QMainWindow, QTextEdit,QAction, QListWidget, QWidget, QVBoxLayout,QFileDialog, QInputDialog
 )
 from PyQt5.QtCore import Qt, QSettings
+import lasio
+import pandas as pd
 from fe_data_objects import *
 from alias import *
 from log_info import *
 from Utility import *
+from excel_ingest import read_sheet, split_by_well
+
+logger = logging.getLogger(__name__)
+
+class WellUnitOfWork:
+    """Collects wells modified by the loaders and writes each one exactly once on flush."""
+    def __init__(self, wells_folder, max_workers=1):
+        self.wells_folder = wells_folder
+        self.max_workers = max_workers
+        self.dirty = {}
+
+    def mark_dirty(self, well):
+        """Register a modified well; marking the same well again is free."""
+        self.dirty[well.well_name] = well
+
+    def _write(self, well):
+        filepath = os.path.join(self.wells_folder, well.well_name+'.ptrc')
+        return well.well_name, well.serialize(filename=filepath)
+
+    def flush(self):
+        """Serialize every dirty well once (in parallel threads if max_workers > 1).
+
+        Returns a dict with the number of wells written and the bytes written,
+        in total and per well.
+        """
+        wells = list(self.dirty.values())
+        if self.max_workers > 1 and len(wells) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(self._write, wells))
+        else:
+            results = [self._write(w) for w in wells]
+        self.dirty = {}
+        per_well = dict(results)
+        logger.info('Saved %d wells to %s', len(per_well), self.wells_folder)
+        return {'wells': len(per_well), 'bytes_written': sum(per_well.values()), 'per_well': per_well}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only commit the batch when the loaders completed without error
+        if exc_type is None:
+            self.flush()
+        return False
+
 class DataIMPEX:
     def __init__(self,wells):
         self.title = 'Data_IMPEX'
@@ -18,8 +66,12 @@ class DataIMPEX:
         self.alias_file_path = os.path.join(self.specs_Folder,'alias.alias')
         self.log_info_file_path = os.path.join(self.specs_Folder,'logs.info')
         self.wells=wells
+        self.flush_workers = 1
+    def unit_of_work(self):
+        """Start a batch: loaders given this object defer their writes to its flush()."""
+        return WellUnitOfWork(self.wells_Folder, max_workers=self.flush_workers)
     def Load_Wells(self):
-        print('Loading wells from previously used wells folder')
+        logger.info('Loading wells from previously used wells folder')
 
         self.current_well=  self.settings.value("current_well", "", type=str)
         self.current_dataset = self.settings.value("current_dataset", "", type=str)
@@ -41,11 +93,11 @@ class DataIMPEX:
             # Filter files by extension
         las_files = [f for f in files if f.endswith('las')]    
        
-        print(las_files)
+        logger.debug('LAS files: %s', las_files)
         filepath =las_files[0]
         # Check if the path points to a valid file
         if os.path.isfile(filepath):
-            print(filepath)
+            logger.debug('Reading %s', filepath)
         else:
             raise FileNotFoundError(f"The file at '{filepath}' does not exist.")
         
@@ -56,17 +108,17 @@ class DataIMPEX:
         bottom = las.well.STOP.value
         dataset = Dataset.from_las(filepath,dataset_name=datasetname, dataset_type='Cont', well_name=wellname)
         
-        print(wellname)
+        logger.debug('Well name: %s', wellname)
         #print(self.mainwindow.wells)
         existing_wells = self.mainwindow.wells
         if wellname in [w.well_name for w in existing_wells]:
             thewell =   next((w for w in existing_wells if w.well_name == wellname), None)
-            print('Well name exists:', thewell.well_name)
+            logger.info('Well name exists: %s', thewell.well_name)
             thewell.datasets.append(thewell)
             self.text_edit.append("Dataset appended: " + datasetname)
         else:
             #create a new well (WELL_HEADER and REFERENCE folders must be created)
-            print('Creating a new well')
+            logger.info('Creating a new well')
             thewell=Well(date_created=datetime.now(), well_name=wellname, well_type='Dev')
             ref = Dataset.reference(0, bottom=bottom, dataset_name='REFERENCE', dataset_type='REFERENCE', well_name=wellname)
             wh = Dataset.well_header(dataset_name='WELL_HEADER', dataset_type='WELL_HEADER', well_name=wellname)
@@ -96,15 +148,15 @@ class DataIMPEX:
             #print(unit)
             outlas.append_curve(mnemonic=mnem, data = df[mnem], unit=unit, descr=descr)
         outlas.write(las_file_path, version=2.0)
-        print('LAS file saved to file : ',las_file_path)
+        logger.info('LAS file saved to %s', las_file_path)
         
-    def import_Single_LAS_File(self, las_file_path):
+    def import_Single_LAS_File(self, las_file_path, uow=None):
         
         # Code to execute when button 2 is clicked
         filepath =las_file_path
         # Check if the path points to a valid file
         if os.path.isfile(filepath):
-            print(filepath)
+            logger.debug('Reading %s', filepath)
         else:
             raise FileNotFoundError(f"The file at '{filepath}' does not exist.")
         
@@ -115,16 +167,16 @@ class DataIMPEX:
         bottom = las.well.STOP.value
         dataset = Dataset.from_las(filepath,dataset_name=datasetname, dataset_type='Cont', well_name=wellname)
         
-        print(wellname)
+        logger.debug('Well name: %s', wellname)
         #print(self.mainwindow.wells)
-        print('Loaded Wells:', [w.well_name for w in self.wells])
+        logger.debug('Loaded wells: %s', [w.well_name for w in self.wells])
         existing_wells = self.wells
         if wellname in [w.well_name for w in existing_wells]:
             thewell =   next((w for w in existing_wells if w.well_name == wellname), None)
-            print('Well name exists:', thewell.well_name)
+            logger.info('Well name exists: %s', thewell.well_name)
             existing_dataset_names = [dtst.name for dtst in thewell.datasets]
             new_name = generate_unique_name(existing_names=existing_dataset_names, base_name=dataset.name)
-            print('The dataset named',dataset.name, 'already exists. imported dataset name will be:',new_name)
+            logger.info('The dataset named %s already exists. Imported dataset name will be: %s', dataset.name, new_name)
             dataset.name = new_name
             thewell.datasets.append(dataset)
         else:
@@ -137,35 +189,44 @@ class DataIMPEX:
             thewell.datasets.append(ref)
             thewell.datasets.append(wh)
             thewell.datasets.append(dataset)
+            self.wells.append(thewell)
             
 
+        if uow is not None:
+            uow.mark_dirty(thewell)
+            return
         filepath = os.path.join(self.wells_Folder,thewell.well_name+'.ptrc')
         thewell.serialize(filename=filepath)
-        print('Saved Wells to :', thewell.well_name, self.wells_Folder)
+        logger.info('Saved well %s to %s', thewell.well_name, self.wells_Folder)
         
     def load_multi_well_las_files_from_folder(self, las_Folder):
         files = os.listdir(las_Folder)
         las_files = [f for f in files if f.endswith('las')]  
        
+        # Several LAS runs of the same well are written in a single save
+        uow = self.unit_of_work()
         for f in las_files:
             #print(f)
             # base_name = os.path.splitext(f)[0]
-            print(f)
+            logger.debug('Importing %s', f)
             las_file_path=os.path.join(las_Folder,f)
-            self.import_Single_LAS_File(las_file_path)
+            self.import_Single_LAS_File(las_file_path, uow=uow)
+        return uow.flush()
     
     def load_single_well_deviation_data_from_excel(self, excel_file_path, sheet_name, well_name):
-        print("Loading directional data from excel file Well Data Acquistion Summary")
+        logger.info("Loading directional data from excel file Well Data Acquistion Summary")
    
-        # Read the data from the specified sheet
-        dev_df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+        # Read the data from the specified sheet (parsed once per workbook)
+        dev_df = read_sheet(excel_file_path, sheet_name)
         dev_df= dev_df.dropna()
         # Display the entire DataFrame
-        print(dev_df.head(100).to_string(index=False))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Sheet preview:\n%s', dev_df.head(100).to_string(index=False))
         
         dev_df_well = dev_df[dev_df['WELL']==well_name]
         
-        print('Single well dataframe:', well_name, dev_df_well)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Single well dataframe: %s\n%s', well_name, dev_df_well)
         
         datasetname = 'DIRECTIONAL'
         dataset = Dataset(date_created=datetime.now(),name='DIRECTIONAL', type='Point', wellname=well_name, index_name='DEPTH' )
@@ -178,10 +239,10 @@ class DataIMPEX:
         existing_wells = self.wells
         if well_name in [w.well_name for w in existing_wells]:
             thewell =   next((w for w in self.wells if w.well_name == well_name), None)
-            print('Well name exists:', thewell.well_name)
+            logger.info('Well name exists: %s', thewell.well_name)
             existing_dataset_names = [dtst.name for dtst in thewell.datasets]
             new_name = generate_unique_name(existing_names=existing_dataset_names, base_name=dataset.name)
-            print('The dataset named',dataset.name, 'already exists. imported dataset name will be:',new_name)
+            logger.info('The dataset named %s already exists. Imported dataset name will be: %s', dataset.name, new_name)
             dataset.name = new_name
             thewell.datasets.append(dataset)
             #self.text_edit.append("Dataset appended: " + datasetname)
@@ -192,31 +253,24 @@ class DataIMPEX:
             #self.text_edit.append("Dataset appended: "+ datasetname)
             self.wells.append(thewell)
             
-        print('Saving wells')
+        logger.info('Saving wells')
         
         for dtst in thewell.datasets:
             #print('dataset:', dtst.name)
             for wl in dtst.well_logs:
-                print(dtst.name, 'log:', wl.name)
+                logger.debug('%s log: %s', dtst.name, wl.name, extra={'sample': 100})
                 #print(wl.log)
                 
         filepath = os.path.join(self.wells_Folder,thewell.well_name+'.ptrc')
         thewell.serialize(filename=filepath)
-        print('Saved Wells to :', thewell.well_name, self.wells_Folder)
+        logger.info('Saved well %s to %s', thewell.well_name, self.wells_Folder)
 
                 
-    def load_multi_well_deviation_data_from_excel(self, excel_file_path, sheet_name, allowed_headers, dev_mnemonics):
-        
-        # Load the Excel file
-        df1 = pd.read_excel(excel_file_path, sheet_name=sheet_name, header=None)
-        pos = self.find_first_occurrence(df1, 'WELL')
-        print(pos)
+    def load_multi_well_deviation_data_from_excel(self, excel_file_path, sheet_name, allowed_headers, dev_mnemonics, uow=None):
         
-        # Reload the Excel file with header row identified
-        df = pd.read_excel(excel_file_path, sheet_name=sheet_name, header=pos[0])
-         # Extract column names from the first row
-        # Exclude columns before the found column
-        df = df.iloc[:, pos[1]:].dropna(how='all')
+        # Read the sheet once, with the header row located by the 'WELL' cell
+        # and the columns before it excluded
+        df = read_sheet(excel_file_path, sheet_name, header_word='WELL').dropna(how='all')
         
         # Create a pattern that matches any of the allowed headers as substrings, case-insensitive
         pattern = '|'.join(allowed_headers)  # Join allowed headers with '|' for regex OR
@@ -230,18 +284,20 @@ class DataIMPEX:
         
         # Capitalize the column names
         dev_df.columns = dev_df.columns.str.upper()
-        print(dev_df)
 
         # Display the entire DataFrame
-        print(dev_df.head(100).to_string(index=False))
-        well_names = dev_df['WELL'].unique()
-        print('Unique well names', well_names)
-        for well_name in well_names:
-            dev_df_well = dev_df[dev_df['WELL']==well_name]
-            print('Single well dataframe:', well_name, dev_df_well)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Sheet preview:\n%s', dev_df.head(100).to_string(index=False))
+        wells_df = split_by_well(dev_df)
+        logger.info('Unique well names %s', list(wells_df))
+        own_uow = uow is None
+        if own_uow:
+            uow = self.unit_of_work()
+        for well_name, dev_df_well in wells_df.items():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Single well dataframe: %s\n%s', well_name, dev_df_well)
             datasetname = 'DIRECTIONAL'
             dataset = Dataset(date_created=datetime.now(),name='DIRECTIONAL', type='Point', wellname=well_name, index_name='DEPTH' )
-            dev_df_well = dev_df_well.drop('WELL', axis=1)
             for col in dev_df_well.columns:
                 #print(dev_df_well[col])
                 log = WellLog(date = datetime.now(),name=col.upper(), description='Loaded from csv',  log=dev_df_well[col].to_list(), dtst = dataset.name)
@@ -249,7 +305,7 @@ class DataIMPEX:
             # if well exists
             if well_name in [w.well_name for w in self.wells]:
                 thewell =   next((w for w in self.wells if w.well_name == well_name), None)
-                print('Well name exists:', thewell.well_name)
+                logger.info('Well name exists: %s', thewell.well_name)
                 thewell.datasets.append(dataset)
                 #self.text_edit.append("Dataset appended: " + datasetname)
             #create a new well
@@ -259,16 +315,16 @@ class DataIMPEX:
                 #self.text_edit.append("Dataset appended: "+ datasetname)
                 self.wells.append(thewell)
                 
-            print(thewell.well_name)
+            logger.debug('Well %s', thewell.well_name)
             for dtst in thewell.datasets:
                 #print('dataset:', dtst.name)
                 for wl in dtst.well_logs:
-                    print('log:', wl.name)
+                    logger.debug('%s log: %s', dtst.name, wl.name, extra={'sample': 100})
                     #print(wl.log)
                     
-            filepath = os.path.join(self.wells_Folder,thewell.well_name+'.ptrc')
-            thewell.serialize(filename=filepath)
-            print('Saved Wells to :', thewell.well_name, self.wells_Folder)
+            uow.mark_dirty(thewell)
+        if own_uow:
+            return uow.flush()
     def keep_and_rename_columns(self, filtered_df, new_column_names):
         """Keep only specified columns and rename them."""
         # Keep only the first three columns
@@ -283,25 +339,30 @@ class DataIMPEX:
         files = os.listdir(las_Folder)
         las_files = [f for f in files if f.endswith('las')]  
        
+        # Several LAS runs of the same well are written in a single save
+        uow = self.unit_of_work()
         for f in las_files:
             #print(f)
             # base_name = os.path.splitext(f)[0]
-            print(f)
+            logger.debug('Importing %s', f)
             las_file_path=os.path.join(las_Folder,f)
-            self.import_Single_LAS_File(las_file_path)
+            self.import_Single_LAS_File(las_file_path, uow=uow)
+        return uow.flush()
     
     def load_single_well_tops_data_from_excel(self, excel_file_path, sheet_name, well_name):
-        print("Loading tops data from excel file Well Data Acquistion Summary")
+        logger.info("Loading tops data from excel file Well Data Acquistion Summary")
    
-        # Read the data from the specified sheet
-        top_df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+        # Read the data from the specified sheet (parsed once per workbook)
+        top_df = read_sheet(excel_file_path, sheet_name)
         top_df= top_df.dropna()
         # Display the entire DataFrame
-        print(top_df.head(100).to_string(index=False))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Sheet preview:\n%s', top_df.head(100).to_string(index=False))
         
         top_df_well = top_df[top_df['WELL']==well_name]
         
-        print('Single well dataframe:', well_name, top_df_well)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Single well dataframe: %s\n%s', well_name, top_df_well)
         
         datasetname = 'TOPS'
         dataset = Dataset(date_created=datetime.now(),name=datasetname, type='Tops', wellname=well_name, index_name='DEPTH' )
@@ -319,10 +380,10 @@ class DataIMPEX:
         existing_wells = self.wells
         if well_name in [w.well_name for w in existing_wells]:
             thewell =   next((w for w in self.wells if w.well_name == well_name), None)
-            print('Well name exists:', thewell.well_name)
+            logger.info('Well name exists: %s', thewell.well_name)
             existing_dataset_names = [dtst.name for dtst in thewell.datasets]
             new_name = generate_unique_name(existing_names=existing_dataset_names, base_name=dataset.name)
-            print('The dataset named',dataset.name, 'already exists. imported dataset name will be:',new_name)
+            logger.info('The dataset named %s already exists. Imported dataset name will be: %s', dataset.name, new_name)
             dataset.name = new_name
             thewell.datasets.append(dataset)
             #self.text_edit.append("Dataset appended: " + datasetname)
@@ -333,35 +394,38 @@ class DataIMPEX:
             #self.text_edit.append("Dataset appended: "+ datasetname)
             self.wells.append(thewell)
             
-        print('Saving wells')
+        logger.info('Saving wells')
         
         for dtst in thewell.datasets:
             #print('dataset:', dtst.name)
             for wl in dtst.well_logs:
-                print(dtst.name, 'log:', wl.name)
+                logger.debug('%s log: %s', dtst.name, wl.name, extra={'sample': 100})
                 #print(wl.log)
                 
         filepath = os.path.join(self.wells_Folder,thewell.well_name+'.ptrc')
         thewell.serialize(filename=filepath)
-        print('Saved Wells to :', thewell.well_name, self.wells_Folder)
+        logger.info('Saved well %s to %s', thewell.well_name, self.wells_Folder)
 
-    def load_multi_well_zone_data_from_excel(self, excel_file_path, sheet_name):
+    def load_multi_well_zone_data_from_excel(self, excel_file_path, sheet_name, uow=None):
         # Code to execute when button 2 is clicked
         
         
-        # Read the data from the specified sheet
-        dev_df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+        # Read the data from the specified sheet (parsed once per workbook)
+        dev_df = read_sheet(excel_file_path, sheet_name)
         dev_df= dev_df.dropna()
         # Display the entire DataFrame
-        print(dev_df.head(100).to_string(index=False))
-        well_names = dev_df['WELL'].unique()
-        print('Unique well names', well_names)
-        for well_name in well_names:
-            dev_df_well = dev_df[dev_df['WELL']==well_name]
-            print('Single well dataframe:', well_name, dev_df_well)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Sheet preview:\n%s', dev_df.head(100).to_string(index=False))
+        wells_df = split_by_well(dev_df)
+        logger.info('Unique well names %s', list(wells_df))
+        own_uow = uow is None
+        if own_uow:
+            uow = self.unit_of_work()
+        for well_name, dev_df_well in wells_df.items():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Single well dataframe: %s\n%s', well_name, dev_df_well)
             datasetname = 'DIRECTIONAL'
             dataset = Dataset(date_created=datetime.now(),name='ZONES', type='Zones', wellname=well_name, index_name='DEPTH' )
-            dev_df_well = dev_df_well.drop('WELL', axis=1)
             for col in dev_df_well.columns:
                 #print(dev_df_well[col])
                 log = WellLog(date = datetime.now(),name=col.upper(), description='Loaded from csv',  log=dev_df_well[col].to_list(), dtst = dataset.name)
@@ -369,7 +433,7 @@ class DataIMPEX:
             # if well exists
             if well_name in [w.well_name for w in self.wells]:
                 thewell =   next((w for w in self.wells if w.well_name == well_name), None)
-                print('Well name exists:', thewell.well_name)
+                logger.info('Well name exists: %s', thewell.well_name)
                 thewell.datasets.append(dataset)
                 #self.text_edit.append("Dataset appended: " + datasetname)
             #create a new well
@@ -379,16 +443,16 @@ class DataIMPEX:
                 #self.text_edit.append("Dataset appended: "+ datasetname)
                 self.wells.append(thewell)
                 
-            print(thewell.well_name)
+            logger.debug('Well %s', thewell.well_name)
             for dtst in thewell.datasets:
                 #print('dataset:', dtst.name)
                 for wl in dtst.well_logs:
-                    print('log:', wl.name)
+                    logger.debug('%s log: %s', dtst.name, wl.name, extra={'sample': 100})
                     #print(wl.log)
                     
-            filepath = os.path.join(self.wells_Folder,thewell.well_name+'.ptrc')
-            thewell.serialize(filename=filepath)
-            print('Saved Wells to :', thewell.well_name, self.wells_Folder)
+            uow.mark_dirty(thewell)
+        if own_uow:
+            return uow.flush()
     
       
     def parse_row_to_constants(self, row: List[Union[str, float, int]],   column_names: List[str], 
@@ -431,28 +495,25 @@ class DataIMPEX:
         return constants
         
         return constants
-    def insert_Constants_From_Well_Information(self,file_path, sheet_name):
+    def insert_Constants_From_Well_Information(self,file_path, sheet_name, uow=None):
         # Read the Excel file
         #file_path = 'your_file.xlsx'  # Replace with your actual file path
         #sheet_name = 'Sheet1'          # Replace with your sheet name
 
-        # Load the Excel file
-        df1 = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-        pos = self.find_first_occurrence(df1, 'WELL')
-        print(pos)
-        
-        # Reload the Excel file with header row identified
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=pos[0])
-         # Extract column names from the first row
-        # Exclude columns before the found column
-        df = df.iloc[:, pos[1]:].dropna(how='all')
+        # Read the sheet once, with the header row located by the 'WELL' cell
+        # and the columns before it excluded
+        df = read_sheet(file_path, sheet_name, header_word='WELL').dropna(how='all')
         # Capitalize the column names
         df.columns = df.columns.str.upper()
         column_names = df.columns.tolist()
         
-        print(df)
-        print("Column Names:", column_names)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Well information sheet:\n%s', df)
+        logger.debug('Column names: %s', column_names)
 
+        own_uow = uow is None
+        if own_uow:
+            uow = self.unit_of_work()
         # Loop through each data row
         for index in range(0, len(df)):  # Start from 1 to skip header row
             data_row = df.iloc[index].tolist()  # Extract the row as a list
@@ -462,35 +523,35 @@ class DataIMPEX:
             excluded_indices = []
             # Parse the row into Constant objects
             constants = self.parse_row_to_constants(data_row, column_names, tag, excluded_indices)
-            print('Number of constants read:',len(constants))
+            logger.debug('Number of constants read: %d', len(constants))
             for const in constants:
-                print(const.name, const.tag)
+                logger.debug('Constant %s for %s', const.name, const.tag, extra={'sample': 100})
             #print(self.wells)
             # Output the constants
             for const in constants:
                 w  =find_well_by_name(self.wells,const.tag)
                 if w:
-                    print(w.well_name)
+                    logger.debug('Updating well %s', w.well_name, extra={'sample': 100})
                     wh_dataset = find_dataset_by_name(w,'WELL_HEADER')
 
                     if const.name in [c.name for c in wh_dataset.constants]:
                         #update constant value
-                        print(const.name)
-                        const = find_constant_by_name(wh_dataset,const.name)
-                        if const:
+                        existing = find_constant_by_name(wh_dataset,const.name)
+                        if existing:
                             #replace
-                            const.value = const.value
-                            print (const.name, 'value replace to:', const.value)
+                            existing.value = const.value
+                            logger.debug('%s value replaced with: %s', existing.name, existing.value, extra={'sample': 100})
                         else:
-                            print('Constant:', const.name, ' does not exist')
+                            logger.warning('Constant %s does not exist', const.name)
                     else:
                         #append constant
                         wh_dataset.constants.append(const)
-                        print (const.name, 'inserted with value:', const.value)
+                        logger.debug('%s inserted with value: %s', const.name, const.value, extra={'sample': 100})
                     
-                    filepath = os.path.join(self.wells_Folder,w.well_name+'.ptrc')
-                    w.serialize(filename=filepath)
-                    print('Saved Wells to :', w.well_name, self.wells_Folder)
+                    # The well is written once after all rows, not once per constant
+                    uow.mark_dirty(w)
+        if own_uow:
+            return uow.flush()
         
     def find_first_occurrence(self, df, search_word):
         # Limit the DataFrame to the first three rows and first three columns
@@ -499,7 +560,6 @@ class DataIMPEX:
         # Find the first occurrence of the search word
         for row_index in limited_df.index:
             for col_index in limited_df.columns:
-                print(limited_df.at[row_index, col_index])
                 if limited_df.at[row_index, col_index] == search_word:
                     return row_index, col_index  # Return row and column index
         return None  # Return None if not found
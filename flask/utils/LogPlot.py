@@ -9,8 +9,13 @@ import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 import io
 import base64
+import logging
 import numpy as np
 
+from utils.metrics import phase
+
+logger = logging.getLogger(__name__)
+
 
 class LogPlotManager:
     """
@@ -23,7 +28,7 @@ class LogPlotManager:
         self.shared_axis = None
         self.main_figure = None
     
-    def create_log_plot(self, well_data, log_names, index_name='DEPTH'):
+    def create_log_plot(self, well_data, log_names, index_name='DEPTH', depth_transform=None, depth_label=None):
         """
         Create a well log plot with multiple tracks
         Based on GitHub repo logplotclass.py matplotlib implementation
@@ -32,14 +37,17 @@ class LogPlotManager:
             well_data: Well object with datasets
             log_names: List of log names to plot
             index_name: Name of the index (typically 'DEPTH')
+            depth_transform: Optional vectorised function mapping MD arrays
+                to the plotted depth (e.g. DepthConverter.to_tvd)
+            depth_label: Y-axis label to use with depth_transform
             
         Returns:
             Base64 encoded PNG image
         """
-        print(f"[LogPlot] Creating log plot for {len(log_names)} logs: {log_names}")
+        logger.debug('Creating log plot for %d logs: %s', len(log_names), log_names)
         
         if not log_names:
-            print("[LogPlot] No log names provided")
+            logger.warning('No log names provided')
             return None
         
         # Number of tracks (one per log)
@@ -48,91 +56,99 @@ class LogPlotManager:
         # Create figure with horizontal layout (tracks side by side)
         # Similar to GitHub repo's MainFigureWidget and MatplotlibDockWidget
         fig = Figure(figsize=(4 * num_tracks, 12))
-        print(f"[LogPlot] Created figure with {num_tracks} tracks")
+        logger.debug('Created figure with %d tracks', num_tracks)
+        
+        # Collect log data on a common depth axis: the datasets holding the
+        # requested logs are merged into one lazy view and every track is
+        # resampled in a single pass per dataset
+        with phase('search'):
+            found = [name for name in log_names
+                     if any(well_log.name == name for dataset in well_data.datasets for well_log in dataset.well_logs)]
+            for log_name in log_names:
+                if log_name not in found:
+                    logger.info('Log not found: %s', log_name)
         
-        # Collect log data
-        tracks_data = []
-        shared_index = None
+            if not found:
+                logger.warning('No track data found for %s', log_names)
+                return None
         
-        for log_name in log_names:
-            print(f"[LogPlot] Searching for log: {log_name}")
-            # Search through all datasets
+            source_datasets = []
             for dataset in well_data.datasets:
-                # Look for the log in dataset's well_logs
-                for well_log in dataset.well_logs:
-                    if well_log.name == log_name:
-                        tracks_data.append({
-                            'name': log_name,
-                            'log': well_log.log,
-                            'index': dataset.index_log,
-                            'index_name': dataset.index_name or index_name
-                        })
-                        if shared_index is None and dataset.index_log:
-                            shared_index = dataset.index_log
-                        print(f"[LogPlot] Found {log_name} with {len(well_log.log)} points")
-                        break
-                if tracks_data and tracks_data[-1]['name'] == log_name:
-                    break
+                names = {well_log.name for well_log in dataset.well_logs}
+                if names.intersection(found) and len(dataset.index_log) > 0:
+                    source_datasets.append(dataset)
+            view = well_data.merged_view([dataset.name for dataset in source_datasets])
+        
+            if view.index.size == 0:
+                logger.warning('No shared index (DEPTH) found')
+                return None
+        
+            columns = view.materialize([name for name in found if name in view.columns])
+            shared_index = view.index
+            if depth_transform is not None:
+                shared_index = depth_transform(shared_index)
+            index_label = source_datasets[0].index_name or index_name
+            tracks_data = [
+                {'name': name, 'log': values, 'index': shared_index, 'index_name': index_label}
+                for name, values in columns.items() if values.dtype != object
+            ]
         
         if not tracks_data:
-            print("[LogPlot] ERROR: No track data found")
-            return None
-            
-        if shared_index is None:
-            print("[LogPlot] ERROR: No shared index (DEPTH) found")
+            logger.warning('No numeric track data found for %s', log_names)
             return None
         
-        print(f"[LogPlot] Successfully collected {len(tracks_data)} tracks")
+        logger.debug('Collected %d tracks', len(tracks_data))
         
-        # Create subplots with shared y-axis
-        axes = []
-        for i, track in enumerate(tracks_data):
-            if i == 0:
-                ax = fig.add_subplot(1, num_tracks, i + 1)
-                self.shared_axis = ax
-            else:
-                ax = fig.add_subplot(1, num_tracks, i + 1, sharey=axes[0])
+        with phase('render'):
+            # Create subplots with shared y-axis
+            axes = []
+            for i, track in enumerate(tracks_data):
+                if i == 0:
+                    ax = fig.add_subplot(1, num_tracks, i + 1)
+                    self.shared_axis = ax
+                else:
+                    ax = fig.add_subplot(1, num_tracks, i + 1, sharey=axes[0])
             
-            axes.append(ax)
+                axes.append(ax)
             
-            # Plot the log curve
-            log_values = track['log']
-            index_values = track['index'] or shared_index
+                # Plot the log curve
+                log_values = np.asarray(track['log'], dtype=float)
+                index_values = track['index']
             
-            # Filter valid data
-            valid_data = [(idx, val) for idx, val in zip(index_values, log_values) 
-                         if val is not None and not np.isnan(val)]
+                # Filter valid data
+                valid = np.isfinite(log_values) & np.isfinite(index_values)
             
-            if valid_data:
-                valid_idx, valid_vals = zip(*valid_data)
+                if valid.any():
+                    valid_idx, valid_vals = index_values[valid], log_values[valid]
                 
-                # Plot with data on x-axis and depth on y-axis
-                ax.plot(valid_vals, valid_idx, linewidth=1, color='blue')
+                    # Plot with data on x-axis and depth on y-axis
+                    ax.plot(valid_vals, valid_idx, linewidth=1, color='blue')
                 
-                # Configure axes
-                ax.set_xlabel(track['name'], fontsize=10, fontweight='bold')
-                ax.xaxis.set_label_position('top')
-                ax.xaxis.tick_top()
+                    # Configure axes
+                    ax.set_xlabel(track['name'], fontsize=10, fontweight='bold')
+                    ax.xaxis.set_label_position('top')
+                    ax.xaxis.tick_top()
                 
-                # Invert y-axis (depth increases downward)
-                if i == 0:
-                    ax.invert_yaxis()
-                    ax.set_ylabel(track['index_name'], fontsize=10, fontweight='bold')
-                else:
-                    ax.tick_params(axis='y', labelleft=False)
+                    # Invert y-axis (depth increases downward)
+                    if i == 0:
+                        ax.invert_yaxis()
+                        ax.set_ylabel(depth_label or track['index_name'], fontsize=10, fontweight='bold')
+                    else:
+                        ax.tick_params(axis='y', labelleft=False)
                 
-                # Grid
-                ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
-                ax.set_axisbelow(True)
+                    # Grid
+                    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+                    ax.set_axisbelow(True)
         
-        # Adjust layout
-        fig.tight_layout()
+            # Adjust layout
+            fig.tight_layout()
         
-        # Convert to base64 PNG
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+            # Convert to base64 PNG
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
         buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        with phase('encode'):
+            img_base64 = base64.b64encode(buf.read()).decode('utf-8')
         buf.close()
         plt.close(fig)
         
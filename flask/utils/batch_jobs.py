@@ -0,0 +1,399 @@
+"""
+Multi-Well Batch Jobs
+Background jobs applying a registered per-well operation (resample,
+compute, export, summary, ...) to every well of a project on a process
+pool, with per-well retries, streamed progress and atomic outputs. Job
+status is shared with the other server workers through job_state.
+"""
+
+import os
+import json
+import logging
+import time
+import uuid
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.fe_data_objects import Well, project_well_files, well_lock
+from utils.job_state import (
+    StoredJob, cancel_requested, clear_cancel, list_states, load_state, prune_states, save_state
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORTS_FOLDER = '07-DATA_EXPORTS'
+BATCH_OUTPUT_FOLDER = os.path.join('01-OUTPUT', 'batch')
+JOB_KIND = 'batch'
+
+# Registered operations: name -> function(well_file, options) -> result dict.
+# Functions run inside pool workers, so they must be module-level.
+OPERATIONS: Dict[str, Callable[[str, Dict], Dict]] = {}
+
+
+def register_operation(name: str):
+    """Decorator registering a per-well batch operation"""
+    def decorator(func):
+        OPERATIONS[name] = func
+        return func
+    return decorator
+
+
+@contextmanager
+def atomic_output(path: str):
+    """Yield a temporary path next to path and move it into place on success"""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    root, ext = os.path.splitext(os.path.basename(path))
+    tmp_path = os.path.join(folder, f'.{root}.{uuid.uuid4().hex[:8]}.tmp{ext}')
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _project_of(well_file: str) -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(well_file)))
+
+
+@register_operation('resample')
+def resample_operation(well_file: str, options: Dict) -> Dict:
+    """Resample a dataset to a regular step and store it as a new dataset.
+
+    The step is in the dataset's depth units and defaults to the median
+    sampling step of the dataset itself.
+    """
+    # Locked from read to write so a concurrent write of the output dataset is not lost
+    with well_lock(well_file, exclusive=True):
+        source = Well.load_dataset_from_file(well_file, options.get('datasetName', 'MAIN'))
+        depth = np.array([np.nan if v is None else v for v in source.index_log], dtype=float)
+        if not np.isfinite(depth).any():
+            raise ValueError(f"Dataset '{source.name}' has no depth index")
+        if options.get('step') is not None:
+            step = float(options['step'])
+        else:
+            steps = np.diff(np.sort(depth[np.isfinite(depth)]))
+            steps = steps[steps > 0]
+            if not steps.size:
+                raise ValueError(f"Dataset '{source.name}' has no sampling step; pass options.step")
+            step = float(np.median(steps))
+        if step <= 0:
+            raise ValueError('step must be positive')
+        top, bottom = np.nanmin(depth), np.nanmax(depth)
+        target = top + np.arange(int(np.floor((bottom - top) / step + 1e-9)) + 1) * step
+        output_name = options.get('outputDataset', f'{source.name}_RS')
+        resampled = source.resample(target, method=options.get('method'), dataset_name=output_name)
+        Well.replace_dataset_in_file(well_file, resampled)
+    return {'dataset': output_name, 'step': step, 'samples': int(target.size), 'curves': len(resampled.well_logs)}
+
+
+@register_operation('compute')
+def compute_operation(well_file: str, options: Dict) -> Dict:
+    """Run the petrophysics engine on the well"""
+    from utils.petrophysics import COMPUTED_DATASET, compute_well
+    return compute_well(
+        well_file,
+        dataset_name=options.get('datasetName', 'MAIN'),
+        parameters=options.get('parameters'),
+        curves=options.get('curves'),
+        output_name=options.get('outputDataset', COMPUTED_DATASET)
+    )
+
+
+@register_operation('export')
+def export_operation(well_file: str, options: Dict) -> Dict:
+    """Export datasets on a common depth axis to LAS or CSV in 07-DATA_EXPORTS"""
+    well = Well.deserialize(filepath=well_file)
+    names = options.get('datasetNames')
+    if not names:
+        names = [ds.name for ds in well.datasets if ds.type not in ('REFERENCE', 'WELL_HEADER')]
+    view = well.merged_view(names, step=options.get('step'), method=options.get('method'))
+    export_format = str(options.get('format', 'las')).lower()
+    if export_format not in ('las', 'csv'):
+        raise ValueError(f'Unknown export format {export_format}. Use las or csv')
+    set_name = '_'.join(names) or 'MERGED'
+    export_path = os.path.join(_project_of(well_file), EXPORTS_FOLDER, f'{well.well_name}_{set_name}.{export_format}')
+    with atomic_output(export_path) as tmp_path:
+        if export_format == 'las':
+            view.to_las(tmp_path, well_name=well.well_name, names=options.get('logNames'), set_name=set_name)
+        else:
+            view.to_csv(tmp_path, names=options.get('logNames'))
+    return {'filePath': export_path, 'samples': int(view.index.size)}
+
+
+@register_operation('summary')
+def summary_operation(well_file: str, options: Dict) -> Dict:
+    """RESSUM rows for the well's zones"""
+    from utils.zonation import TOPS_DATASET, well_zonation, ressum_table, ressum_to_dict
+    zonation = well_zonation(
+        well_file,
+        dataset_name=options.get('datasetName', 'MAIN'),
+        zones_dataset=options.get('zonesDataset', TOPS_DATASET),
+        curves=options.get('curves')
+    )
+    rows = ressum_table([zonation], options.get('cutoffs'))
+    return {'ressum': [ressum_to_dict(row) for row in rows]}
+
+
+@register_operation('recompute')
+def recompute_operation(well_file: str, options: Dict) -> Dict:
+    """Recompute stale computed curves"""
+    from utils.provenance import recompute_well
+    return recompute_well(well_file, dry_run=bool(options.get('dryRun', False)))
+
+
+@register_operation('qc')
+def qc_operation(well_file: str, options: Dict) -> Dict:
+    """Log QC of the well's datasets, stored as per-dataset reports"""
+    from utils.log_qc import qc_well
+    return qc_well(
+        well_file,
+        dataset_names=options.get('datasetNames'),
+        options=options.get('options'),
+        ranges=options.get('ranges')
+    )
+
+
+def _run_operation(operation: str, well_file: str, options: Dict) -> Dict:
+    """Pool entry point: run one registered operation on one well"""
+    started = time.monotonic()
+    result = OPERATIONS[operation](well_file, options)
+    return {'result': result, 'seconds': round(time.monotonic() - started, 3)}
+
+
+class BatchJob:
+    """
+    One operation applied to a list of wells
+
+    Wells are submitted to a process pool one task each; results are
+    appended as they complete so clients can poll or stream them. Failed
+    wells are resubmitted up to `retries` times, and a broken pool is
+    replaced before the retry round.
+    """
+
+    def __init__(self, project_path: str, operation: str, well_files: List[str], options: Dict = None,
+                 max_workers: Optional[int] = None, retries: int = 1):
+        self.id = uuid.uuid4().hex
+        self.project_path = project_path
+        self.operation = operation
+        self.well_files = well_files
+        self.options = options or {}
+        self.max_workers = max_workers or min(len(well_files), os.cpu_count() or 1) or 1
+        self.retries = retries
+        self.status = 'queued'
+        self.created_at = datetime.now()
+        self.started = None
+        self.finished = None
+        self.results: List[Dict] = []
+        self.errors: Dict[str, Dict] = {}
+        self.attempts: Dict[str, int] = {}
+        self.output_path = None
+        self._cancel_event = threading.Event()
+        self._changed = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the job in a daemon thread"""
+        self._thread = threading.Thread(target=self._run, name=f'batch-{self.operation}-{self.id[:8]}', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Request cancellation; wells already running are finished first"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        # Another worker may have received the cancel request
+        return self._cancel_event.is_set() or cancel_requested(JOB_KIND, self.id)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('completed', 'cancelled', 'failed')
+
+    def save(self):
+        """Publish the job's status and results to the other workers"""
+        try:
+            save_state(JOB_KIND, self.id, self.to_dict())
+        except OSError:
+            logger.warning('Could not save the state of batch job %s', self.id, exc_info=True)
+
+    def _notify(self):
+        self.save()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run_round(self, well_files: List[str]) -> List[str]:
+        """Run one pass over well_files; returns the wells that failed"""
+        failed = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(_run_operation, self.operation, well_file, self.options): well_file
+                for well_file in well_files
+            }
+            for future in as_completed(futures):
+                if self.cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                well_file = futures[future]
+                well_name = os.path.splitext(os.path.basename(well_file))[0]
+                self.attempts[well_name] = self.attempts.get(well_name, 0) + 1
+                try:
+                    outcome = future.result()
+                except BrokenProcessPool as e:
+                    self.errors[well_name] = {'well': well_name, 'error': f'worker crashed: {e}'}
+                    failed.append(well_file)
+                except Exception as e:
+                    self.errors[well_name] = {'well': well_name, 'error': str(e)}
+                    failed.append(well_file)
+                else:
+                    self.errors.pop(well_name, None)
+                    self.results.append({'well': well_name, 'attempts': self.attempts[well_name], **outcome})
+                self._notify()
+        return failed
+
+    def _run(self):
+        self.status = 'running'
+        self.started = time.monotonic()
+        try:
+            pending = list(self.well_files)
+            for attempt in range(self.retries + 1):
+                if not pending or self.cancelled:
+                    break
+                pending = self._run_round(pending)
+            if self.cancelled:
+                self.status = 'cancelled'
+            else:
+                self.status = 'completed'
+            self._write_output()
+        except Exception as e:
+            logger.exception('Batch job %s failed', self.id)
+            self.errors['*'] = {'well': None, 'error': str(e)}
+            self.status = 'failed'
+        finally:
+            self.finished = time.monotonic()
+            self._notify()
+            clear_cancel(JOB_KIND, self.id)
+
+    def _write_output(self):
+        """Write all per-well results to 01-OUTPUT/batch/<operation>_<id>.json atomically"""
+        path = os.path.join(self.project_path, BATCH_OUTPUT_FOLDER, f'{self.operation}_{self.id[:8]}.json')
+        with atomic_output(path) as tmp_path:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'operation': self.operation,
+                    'options': self.options,
+                    'status': self.status,
+                    'results': self.results,
+                    'errors': list(self.errors.values())
+                }, f, indent=2, default=str)
+        self.output_path = path
+
+    def elapsed_seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def wait_for_results(self, seen: int, timeout: float = 15.0) -> List[Dict]:
+        """Block until results beyond index seen are available (or the job ends)"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.results) > seen or self.done, timeout=timeout)
+        return self.results[seen:]
+
+    def to_dict(self, include_results: bool = True) -> Dict:
+        """Job status and progress for the API"""
+        elapsed = self.elapsed_seconds()
+        processed = len(self.results) + len(self.errors)
+        data = {
+            'id': self.id,
+            'operation': self.operation,
+            'status': self.status,
+            'projectPath': self.project_path,
+            'createdAt': self.created_at.isoformat(),
+            'totalWells': len(self.well_files),
+            'completedWells': len(self.results),
+            'failedWells': len(self.errors),
+            'workers': self.max_workers,
+            'elapsedSeconds': round(elapsed, 3),
+            'wellsPerSecond': round(processed / elapsed, 3) if elapsed > 0 else 0.0,
+            'outputPath': self.output_path,
+            'errors': list(self.errors.values())
+        }
+        if include_results:
+            data['results'] = self.results
+        return data
+
+
+class BatchJobManager:
+    """Registry of batch jobs: those of this process, and the stored state of
+    those started by other workers"""
+
+    def __init__(self, max_finished_jobs: int = 50):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.max_finished_jobs = max_finished_jobs
+
+    def start_job(self, project_path: str, operation: str, wells: Optional[List[str]] = None,
+                  options: Dict = None, max_workers: Optional[int] = None, retries: int = 1) -> BatchJob:
+        """
+        Create and start a batch job
+
+        Args:
+            project_path: Root folder of the project
+            operation: Registered operation name
+            wells: Well names to process; defaults to every well of the project
+            options: Operation options
+            max_workers: Worker processes (defaults to the CPU count)
+            retries: Extra attempts for wells that fail
+
+        Raises:
+            ValueError: If the operation is unknown or no wells match
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'. Use one of: {', '.join(sorted(OPERATIONS))}")
+        well_files = project_well_files(project_path, wells)
+        if not well_files:
+            raise ValueError('No wells found')
+        job = BatchJob(project_path, operation, well_files, options, max_workers, retries)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.save()
+        job.start()
+        return job
+
+    def get(self, job_id: str):
+        """The BatchJob if it runs in this process, else its StoredJob (or None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        state = load_state(JOB_KIND, job_id)
+        return StoredJob(JOB_KIND, state) if state is not None else None
+
+    def list(self) -> List:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        local = {job.id for job in jobs}
+        jobs.extend(StoredJob(JOB_KIND, state) for state in list_states(JOB_KIND) if state.get('id') not in local)
+        return jobs
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond max_finished_jobs"""
+        finished = [j for j in self._jobs.values() if j.done]
+        finished.sort(key=lambda j: j.created_at)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job.id]
+        prune_states(JOB_KIND, self.max_finished_jobs)
+
+
+batch_jobs = BatchJobManager()
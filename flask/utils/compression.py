@@ -0,0 +1,177 @@
+"""
+Response Compression Module
+Negotiated gzip / brotli / zstd compression of API responses.
+
+The encoding is chosen from the request's Accept-Encoding header, preferring
+zstd, then brotli, then gzip when the client weights them equally. brotli and
+zstd are optional: they are offered only when the `brotli` and `zstandard`
+packages are installed. Bodies below the minimum size are sent as they are;
+bodies above the streaming threshold are compressed chunk by chunk as they
+are sent, with a faster level, instead of being compressed whole up front.
+
+Environment:
+    PETRO_COMPRESS_MIN_BYTES      smallest body compressed (default 1024)
+    PETRO_COMPRESS_STREAM_BYTES   bodies compressed while streaming (default 1 MiB)
+"""
+
+import os
+import zlib
+from typing import Callable, Dict, Iterable, Iterator
+
+from flask import request
+
+from utils.metrics import phase
+
+try:
+    import brotli
+except ImportError:  # optional encoder
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional encoder
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/plain', 'text/csv', 'text/html', 'image/svg+xml')
+# Event streams must reach the client message by message
+UNCOMPRESSED_TYPES = ('text/event-stream',)
+CHUNK_SIZE = 256 * 1024
+
+# (level for whole bodies, level for streamed bodies)
+LEVELS = {
+    'zstd': (6, 3),
+    'br': (5, 3),
+    'gzip': (6, 4),
+}
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+        # brotli names the method `process`, brotlicffi names it `compress`
+        self._process = getattr(self._compressor, 'process', None) or self._compressor.compress
+
+    def compress(self, data: bytes) -> bytes:
+        return self._process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> Dict[str, Callable]:
+    """Encoding name -> encoder class, in server preference order"""
+    encoders = {}
+    if zstandard is not None:
+        encoders['zstd'] = _Zstd
+    if brotli is not None:
+        encoders['br'] = _Brotli
+    encoders['gzip'] = _Gzip
+    return encoders
+
+
+def negotiate(encoders: Dict[str, Callable]) -> str:
+    """Best encoding accepted by the client, or None for identity"""
+    return request.accept_encodings.best_match(list(encoders), default=None)
+
+
+def _compressible(response) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype in COMPRESSIBLE_TYPES and mimetype not in UNCOMPRESSED_TYPES
+
+
+def _stream(chunks: Iterable[bytes], encoder) -> Iterator[bytes]:
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    view = memoryview(body)
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[start:start + CHUNK_SIZE])
+
+
+def _mark_encoded(response, encoding: str):
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # A strong validator must differ between encodings of the same body
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+
+
+def compress_response(response, min_size: int, stream_size: int):
+    """Compress a response in place for the negotiated encoding"""
+    if not _compressible(response):
+        return response
+    encoders = available_encoders()
+    encoding = negotiate(encoders)
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        encoder = encoders[encoding](LEVELS[encoding][1])
+        response.response = _stream(response.response, encoder)
+        response.headers.pop('Content-Length', None)
+        _mark_encoded(response, encoding)
+        return response
+
+    size = response.content_length
+    if size is None or size < min_size:
+        return response
+    body = response.get_data()
+    if size >= stream_size:
+        encoder = encoders[encoding](LEVELS[encoding][1])
+        response.response = _stream(_chunks(body), encoder)
+        response.headers.pop('Content-Length', None)
+    else:
+        with phase('compress'):
+            encoder = encoders[encoding](LEVELS[encoding][0])
+            response.set_data(encoder.compress(body) + encoder.finish())
+    _mark_encoded(response, encoding)
+    return response
+
+
+def init_app(app, prefix: str = '/api'):
+    """Compress responses for requests under prefix"""
+    min_size = int(os.environ.get('PETRO_COMPRESS_MIN_BYTES', 1024))
+    stream_size = int(os.environ.get('PETRO_COMPRESS_STREAM_BYTES', 1024 * 1024))
+
+    @app.after_request
+    def compress(response):
+        if not request.path.startswith(prefix):
+            return response
+        return compress_response(response, min_size, stream_size)
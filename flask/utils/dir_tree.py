@@ -0,0 +1,230 @@
+"""
+Directory Tree Module
+Cached scandir listings of workspace folders for the data explorer, and
+change notifications for the folders a client is showing.
+
+Each folder is read with a single os.scandir call and kept as a snapshot
+keyed by the folder's mtime, which changes whenever an entry is added,
+removed or renamed. Listing a subtree again costs one stat per folder
+instead of reading every folder and probing every entry.
+
+TreeWatcher notifies subscribers when a folder under their root changes.
+With the optional `watchdog` package it uses OS file events (inotify on
+Linux); otherwise it polls the mtimes of the cached folders under each root.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional, polling is used instead
+    Observer = None
+    FileSystemEventHandler = object
+
+MAX_SNAPSHOTS = 4096
+MAX_DEPTH = 8
+POLL_INTERVAL = 2.0
+# Snapshots taken within this long of the folder's mtime are re-read, since a
+# change in the same mtime tick would not change the mtime again
+RACY_WINDOW_NS = 1_000_000_000
+
+
+class DirectorySnapshot:
+    """Entries of one folder as (name, is_dir, is_link), directories first"""
+
+    __slots__ = ('path', 'mtime_ns', 'scanned_ns', 'entries', 'has_files')
+
+    def __init__(self, path: str, mtime_ns: int, entries: List[Tuple[str, bool, bool]]):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.scanned_ns = time.time_ns()
+        self.entries = entries
+        self.has_files = any(not is_dir for _, is_dir, _ in entries)
+
+    def is_current(self, mtime_ns: int) -> bool:
+        return mtime_ns == self.mtime_ns and self.scanned_ns - mtime_ns > RACY_WINDOW_NS
+
+
+def scan_directory(path: str) -> DirectorySnapshot:
+    """Read a folder with one scandir pass"""
+    mtime_ns = os.stat(path).st_mtime_ns
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                is_link = entry.is_symlink()
+            except OSError:
+                is_dir, is_link = False, False
+            entries.append((entry.name, is_dir, is_link))
+    entries.sort(key=lambda e: (not e[1], e[0]))
+    return DirectorySnapshot(path, mtime_ns, entries)
+
+
+class SnapshotCache:
+    """LRU cache of folder snapshots, revalidated against the folder mtime"""
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: 'OrderedDict[str, DirectorySnapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> DirectorySnapshot:
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            snapshot = self._snapshots.get(path)
+            if snapshot is not None and snapshot.is_current(mtime_ns):
+                self._snapshots.move_to_end(path)
+                return snapshot
+        snapshot = scan_directory(path)
+        with self._lock:
+            self._snapshots[path] = snapshot
+            self._snapshots.move_to_end(path)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._snapshots.pop(path, None)
+
+    def cached(self, root: str) -> Dict[str, int]:
+        """Cached folders at or below root, with the mtime they were read at"""
+        prefix = os.path.join(root, '')
+        with self._lock:
+            return {p: s.mtime_ns for p, s in self._snapshots.items() if p == root or p.startswith(prefix)}
+
+
+def list_tree(path: str, depth: int = 1, cache: Optional[SnapshotCache] = None) -> List[Dict]:
+    """Items of a folder, with the items of sub-folders nested to depth levels.
+
+    Args:
+        path: Absolute folder path
+        depth: 1 lists the folder only; each extra level adds 'children' to
+            the directory items. Symlinked folders are listed but not expanded.
+        cache: Snapshot cache (defaults to the shared one)
+
+    Returns:
+        Items with name, path, type and hasFiles, directories first
+    """
+    cache = cache or dir_snapshots
+    items = []
+    for name, is_dir, is_link in cache.get(path).entries:
+        if name.startswith('.'):
+            continue
+        item_path = os.path.join(path, name)
+        item = {
+            'name': name,
+            'path': item_path,
+            'type': 'directory' if is_dir else 'file',
+            'hasFiles': False
+        }
+        if is_dir:
+            try:
+                item['hasFiles'] = cache.get(item_path).has_files
+                if depth > 1 and not is_link:
+                    item['children'] = list_tree(item_path, depth - 1, cache)
+            except OSError:
+                pass
+        items.append(item)
+    return items
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher: 'TreeWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        # Listings change when entries appear, disappear or move, not when a file is written
+        if event.event_type not in ('created', 'deleted', 'moved'):
+            return
+        self.watcher.notify(os.path.dirname(event.src_path))
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(os.path.dirname(dest_path))
+
+
+class TreeWatcher:
+    """Pushes the paths of changed folders to subscribers of a root folder"""
+
+    def __init__(self, cache: SnapshotCache, poll_interval: float = POLL_INTERVAL):
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.mode = 'inotify' if Observer is not None else 'polling'
+        self._subscribers: Dict[int, Tuple[str, queue.Queue]] = {}
+        self._watches: Dict[str, list] = {}  # root -> [watch, subscriber count]
+        self._lock = threading.Lock()
+        self._observer = None
+        self._poller = None
+
+    def subscribe(self, root: str) -> queue.Queue:
+        """Queue receiving the paths of changed folders under root"""
+        changes = queue.Queue()
+        with self._lock:
+            self._subscribers[id(changes)] = (root, changes)
+            if self.mode == 'inotify':
+                self._watch(root)
+            elif self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='tree-watcher', daemon=True)
+                self._poller.start()
+        return changes
+
+    def unsubscribe(self, changes: queue.Queue):
+        with self._lock:
+            subscriber = self._subscribers.pop(id(changes), None)
+            if subscriber is None or self.mode != 'inotify':
+                return
+            watch = self._watches.get(subscriber[0])
+            if watch is not None:
+                watch[1] -= 1
+                if watch[1] <= 0:
+                    self._observer.unschedule(watch[0])
+                    del self._watches[subscriber[0]]
+
+    def notify(self, folder: str):
+        """Drop the folder's snapshot and tell the subscribers whose root contains it"""
+        self.cache.invalidate(folder)
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for root, changes in subscribers:
+            if folder == root or folder.startswith(os.path.join(root, '')):
+                changes.put(folder)
+
+    def _watch(self, root: str):
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        watch = self._watches.get(root)
+        if watch is None:
+            self._watches[root] = [self._observer.schedule(_EventHandler(self), root, recursive=True), 1]
+        else:
+            watch[1] += 1
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                roots = {root for root, _ in self._subscribers.values()}
+                if not roots:
+                    self._poller = None
+                    return
+            for root in roots:
+                for folder, mtime_ns in self.cache.cached(root).items():
+                    try:
+                        changed = os.stat(folder).st_mtime_ns != mtime_ns
+                    except OSError:
+                        changed = True
+                    if changed:
+                        self.notify(folder)
+
+
+dir_snapshots = SnapshotCache()
+tree_watcher = TreeWatcher(dir_snapshots)
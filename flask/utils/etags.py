@@ -0,0 +1,63 @@
+"""
+Conditional GET Module
+Strong ETags for responses built from a well file, so clients can revalidate
+without the server deserializing the well.
+
+Every write to a well file (whole-file save or a segment manifest update) is
+an atomic rename, which changes the file's inode, mtime or size. The ETag
+hashes those together with the route and its parameters, so it changes
+whenever the well or the requested representation does.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from flask import Response, request
+
+from utils.compression import LEVELS
+
+# Responses must be revalidated before reuse; wells change while the app runs
+CACHE_CONTROL = 'private, no-cache'
+
+
+def well_etag(well_file: str, *parts) -> Optional[str]:
+    """ETag for a representation of a well file, or None if it cannot be stat'ed"""
+    try:
+        stat = os.stat(well_file)
+    except OSError:
+        return None
+    key = '|'.join(str(p) for p in (stat.st_ino, stat.st_mtime_ns, stat.st_size, request.path, *parts))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _base_tag(tag: str) -> str:
+    """Strip the content-coding suffix added by the compression middleware"""
+    head, _, coding = tag.rpartition('-')
+    return head if head and coding in LEVELS else tag
+
+
+def not_modified(etag: Optional[str]) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match matches etag, else None"""
+    if etag is None or not request.if_none_match:
+        return None
+    if request.if_none_match.star_tag:
+        matched = etag
+    else:
+        matched = next((t for t in request.if_none_match.as_set(include_weak=True) if _base_tag(t) == etag), None)
+        if matched is None:
+            return None
+    # Echo the client's tag, which carries the encoding it was served with
+    response = Response(status=304)
+    response.set_etag(matched)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def with_etag(response, etag: Optional[str]):
+    """Attach the validator and revalidation policy to a response"""
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,124 @@
+"""
+Excel Ingest Helpers
+Single-read, cached parsing of well data acquisition workbooks used by the
+deviation, tops, zones and well information loaders
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# Parsed workbooks keyed by file content hash; several loaders run against
+# the same acquisition summary, so each workbook is parsed only once
+_WORKBOOK_CACHE_SIZE = 8
+_workbook_cache: 'OrderedDict[str, Dict[str, pd.DataFrame]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_workbook(file_path: str) -> Dict[str, pd.DataFrame]:
+    """
+    Parse every sheet of a workbook once, without header inference
+
+    Args:
+        file_path: Path to the Excel workbook
+
+    Returns:
+        Dictionary mapping sheet name to the raw (header=None) DataFrame
+    """
+    key = file_hash(file_path)
+    with _cache_lock:
+        sheets = _workbook_cache.get(key)
+        if sheets is not None:
+            _workbook_cache.move_to_end(key)
+            return sheets
+
+    sheets = pd.read_excel(file_path, sheet_name=None, header=None)
+
+    with _cache_lock:
+        _workbook_cache[key] = sheets
+        while len(_workbook_cache) > _WORKBOOK_CACHE_SIZE:
+            _workbook_cache.popitem(last=False)
+    return sheets
+
+
+def clear_workbook_cache():
+    """Drop every cached workbook"""
+    with _cache_lock:
+        _workbook_cache.clear()
+
+
+def find_first_occurrence(df: pd.DataFrame, search_word: str, rows: int = 3, cols: int = 3) -> Optional[Tuple[int, int]]:
+    """Position (row, column) of search_word in the top-left corner of a raw sheet"""
+    corner = df.iloc[0:rows, 0:cols]
+    hits = (corner == search_word).to_numpy().nonzero()
+    if len(hits[0]) == 0:
+        return None
+    # Row-major order, matching a row-by-row scan
+    first = min(zip(hits[0], hits[1]))
+    return int(corner.index[first[0]]), int(corner.columns[first[1]])
+
+
+def read_sheet(file_path: str, sheet_name, header_word: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read one sheet from the cached workbook with its header row applied
+
+    Args:
+        file_path: Path to the Excel workbook
+        sheet_name: Sheet to read
+        header_word: If given, the header row and first column are located
+            by searching for this word (e.g. 'WELL') in the top-left corner
+            of the sheet; otherwise the first row is the header
+
+    Returns:
+        DataFrame equivalent to pd.read_excel(..., header=<row>) restricted
+        to the columns starting at the located one
+    """
+    raw = read_workbook(file_path)[sheet_name]
+
+    header_row, first_col = 0, 0
+    if header_word is not None:
+        pos = find_first_occurrence(raw, header_word)
+        if pos is None:
+            raise ValueError(f"'{header_word}' not found in the header of sheet '{sheet_name}'")
+        header_row, first_col = pos
+
+    header = raw.iloc[header_row]
+    df = raw.iloc[header_row + 1:, first_col:].copy()
+    df.columns = _column_names(header.iloc[first_col:].tolist(), first_col)
+    df.reset_index(drop=True, inplace=True)
+    return df.infer_objects()
+
+
+def split_by_well(df: pd.DataFrame, well_column: str = 'WELL') -> Dict[str, pd.DataFrame]:
+    """Split a multi-well table into per-well frames in a single groupby pass"""
+    return {
+        well_name: group.drop(columns=well_column)
+        for well_name, group in df.groupby(well_column, sort=False)
+    }
+
+
+def _column_names(values, offset: int):
+    """Header labels named the way pd.read_excel names them"""
+    names = []
+    seen = {}
+    for i, value in enumerate(values):
+        name = f'Unnamed: {i + offset}' if pd.isna(value) else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
@@ -0,0 +1,326 @@
+"""
+Expression Curves Module
+Computed curves defined as arithmetic expressions over curve names and
+constants (e.g. "PHIE = (RHOMA-RHOB)/(RHOMA-RHOF) * (1-VSH)"), parsed once
+into a validated AST, evaluated in chunks with NumPy (or numexpr when it is
+installed) and memoised by the fingerprints of their inputs
+"""
+
+import ast
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.fe_data_objects import Dataset, WellLog
+
+try:
+    import numexpr
+except ImportError:  # optional accelerator
+    numexpr = None
+
+# Samples evaluated per chunk, bounding temporary arrays to a few MB
+DEFAULT_CHUNK_SIZE = 65536
+# Key under Dataset.metadata holding the expression definitions
+METADATA_KEY = 'expressions'
+
+FUNCTIONS = {
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log10,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'min': np.minimum,
+    'max': np.maximum,
+    'clip': np.clip,
+    'where': np.where,
+}
+# Functions numexpr evaluates natively; expressions using others fall back to NumPy
+NUMEXPR_FUNCTIONS = {'abs', 'sqrt', 'exp', 'log', 'log10', 'sin', 'cos', 'tan', 'where'}
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_UNARY_OPS = (ast.UAdd, ast.USub, ast.Not)
+_COMPARE_OPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+
+class ExpressionError(ValueError):
+    """Invalid expression text or unresolved names"""
+
+
+class _Rewriter(ast.NodeTransformer):
+    """Turn 'and'/'or'/'not' into element-wise operations and literals into floats"""
+
+    def visit_Constant(self, node):
+        # Python integers have unbounded precision, so 9**9**9 would compute
+        # for minutes; as floats it overflows to inf at once
+        return ast.Constant(value=float(node.value))
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+
+def _validate(node: ast.AST, names: set, calls: set):
+    """Reject anything but arithmetic, comparisons, names, numbers and whitelisted calls"""
+    if isinstance(node, ast.Expression):
+        _validate(node.body, names, calls)
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _BIN_OPS):
+            raise ExpressionError(f'Operator {type(node.op).__name__} is not allowed')
+        _validate(node.left, names, calls)
+        _validate(node.right, names, calls)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _UNARY_OPS):
+            raise ExpressionError(f'Operator {type(node.op).__name__} is not allowed')
+        _validate(node.operand, names, calls)
+    elif isinstance(node, ast.BoolOp):
+        for value in node.values:
+            _validate(value, names, calls)
+    elif isinstance(node, ast.Compare):
+        if not all(isinstance(op, _COMPARE_OPS) for op in node.ops) or len(node.ops) != 1:
+            raise ExpressionError('Only single comparisons (<, <=, >, >=, ==, !=) are allowed')
+        _validate(node.left, names, calls)
+        _validate(node.comparators[0], names, calls)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise ExpressionError(f'Function {ast.unparse(node.func)} is not allowed. '
+                                  f'Use one of: {", ".join(sorted(FUNCTIONS))}')
+        calls.add(node.func.id)
+        for arg in node.args:
+            _validate(arg, names, calls)
+    elif isinstance(node, ast.Name):
+        names.add(node.id)
+    elif isinstance(node, ast.Constant):
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            raise ExpressionError('Only numeric literals are allowed')
+        if isinstance(node.value, int) and node.value.bit_length() > 1023:
+            raise ExpressionError('Numeric literal is too large')
+    else:
+        raise ExpressionError(f'{type(node).__name__} is not allowed in expressions')
+
+
+class CompiledExpression:
+    """A parsed, validated and compiled curve expression"""
+
+    def __init__(self, text: str, name: Optional[str] = None):
+        if name is None:
+            name, text = split_definition(text)
+        self.name = name
+        self.text = text.strip()
+        try:
+            tree = ast.parse(self.text, mode='eval')
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{self.text}': {e.msg}")
+        names, calls = set(), set()
+        _validate(tree, names, calls)
+        self.inputs = sorted(names)
+        self.functions = sorted(calls)
+        # Canonical form: identical up to whitespace/parentheses gives the same key
+        self.canonical = ast.dump(tree)
+        tree = ast.fix_missing_locations(_Rewriter().visit(tree))
+        self._code = compile(tree, f'<expression {self.name}>', 'eval')
+        self._numexpr_text = ast.unparse(tree) if numexpr is not None and set(calls) <= NUMEXPR_FUNCTIONS else None
+
+    def evaluate(self, variables: Dict[str, object], size: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Evaluate over arrays of length size, chunk by chunk
+
+        Args:
+            variables: Name to array (length size) or scalar
+            size: Number of samples
+            chunk_size: Samples per chunk
+        """
+        arrays = {k: v for k, v in variables.items() if isinstance(v, np.ndarray)}
+        scalars = {k: v for k, v in variables.items() if not isinstance(v, np.ndarray)}
+        out = np.empty(size, dtype=float)
+        with np.errstate(all='ignore'):
+            for start in range(0, size, max(1, chunk_size)):
+                stop = min(size, start + chunk_size)
+                local = dict(scalars)
+                local.update((k, v[start:stop]) for k, v in arrays.items())
+                if self._numexpr_text is not None:
+                    value = numexpr.evaluate(self._numexpr_text, local_dict=local)
+                else:
+                    namespace = dict(FUNCTIONS)
+                    namespace.update(local)
+                    try:
+                        value = eval(self._code, {'__builtins__': {}}, namespace)
+                    except (OverflowError, ZeroDivisionError) as e:
+                        # Only arithmetic on literals alone raises; arrays give inf/nan
+                        raise ExpressionError(f'Cannot evaluate {self.name}: {e}')
+                out[start:stop] = value
+        return out
+
+
+def split_definition(text: str) -> Tuple[str, str]:
+    """Split 'NAME = expression' into its parts"""
+    match = re.match(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=(?!=)\s*(.+)$', text, re.S)
+    if not match:
+        raise ExpressionError(f"Expected 'NAME = expression', got '{text}'")
+    return match.group(1), match.group(2)
+
+
+def curve_fingerprint(values) -> str:
+    """Content fingerprint of a curve (missing values hash as NaN)"""
+    array = values if isinstance(values, np.ndarray) else np.array(
+        [np.nan if v is None else v for v in values], dtype=float)
+    return hashlib.blake2b(np.ascontiguousarray(array, dtype=float).tobytes(), digest_size=16).hexdigest()
+
+
+def _scalar_constants(constants) -> Dict[str, float]:
+    found = {}
+    for const in constants or []:
+        try:
+            found[str(const.name)] = float(const.value)
+        except (TypeError, ValueError):
+            continue
+    return found
+
+
+def resolve_scalars(dataset: Dataset, parameters: Dict[str, float] = None, header_constants=None) -> Dict[str, float]:
+    """Scalar names available to expressions: WELL_HEADER, then dataset constants, then parameters"""
+    scalars = {}
+    scalars.update(_scalar_constants(header_constants))
+    scalars.update(_scalar_constants(dataset.constants))
+    scalars.update({k: float(v) for k, v in (parameters or {}).items()})
+    return scalars
+
+
+_PARSE_CACHE_SIZE = 256
+_RESULT_CACHE_SIZE = 64
+_parse_cache: 'OrderedDict[Tuple[str, str], CompiledExpression]' = OrderedDict()
+_result_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_expression(text: str, name: Optional[str] = None) -> CompiledExpression:
+    """Parse and compile an expression once per (name, text)"""
+    key = (name or '', text)
+    with _cache_lock:
+        compiled = _parse_cache.get(key)
+        if compiled is not None:
+            _parse_cache.move_to_end(key)
+            return compiled
+    compiled = CompiledExpression(text, name)
+    with _cache_lock:
+        _parse_cache[key] = compiled
+        while len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return compiled
+
+
+def evaluate_curve(dataset: Dataset, definition: str, parameters: Dict[str, float] = None,
+                   header_constants=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Evaluate 'NAME = expression' over a dataset and store it as a curve
+
+    Names resolve to dataset curves first, then parameters, dataset
+    constants and WELL_HEADER constants. The definition and the input
+    fingerprints are kept in dataset.metadata['expressions'], and the
+    evaluation is skipped when the stored curve is already up to date.
+
+    Returns:
+        {'name', 'expression', 'inputs', 'cached', 'changed'} describing the
+        result. cached is True when no evaluation ran (the stored curve was
+        current, or the values came from the result cache); changed is False
+        only when the dataset was left untouched and needs no saving.
+
+    Raises:
+        ExpressionError: If the expression is invalid or a name is unknown
+    """
+    compiled = compile_expression(definition)
+    size = len(dataset.index_log)
+    logs = {log.name: log for log in dataset.well_logs}
+    scalars = resolve_scalars(dataset, parameters, header_constants)
+
+    variables, fingerprints, used_scalars = {}, {}, {}
+    for name in compiled.inputs:
+        if name == compiled.name:
+            raise ExpressionError(f'{name} cannot depend on itself')
+        if name in logs and logs[name].log_type != 'str':
+            values = np.array([np.nan if v is None else v for v in logs[name].log], dtype=float)
+            if values.size < size:
+                values = np.concatenate((values, np.full(size - values.size, np.nan)))
+            values = values[:size]
+            variables[name] = values
+            fingerprints[name] = curve_fingerprint(values)
+        elif name in scalars:
+            variables[name] = used_scalars[name] = scalars[name]
+        else:
+            raise ExpressionError(f"Unknown name '{name}' in expression for {compiled.name}")
+
+    definitions = dataset.metadata.setdefault(METADATA_KEY, {})
+    previous = definitions.get(compiled.name)
+    record = {
+        'expression': compiled.text,
+        'inputs': fingerprints,
+        'parameters': used_scalars,
+        # Caller-supplied values, replayed when the curve is recomputed
+        'overrides': {k: v for k, v in used_scalars.items() if k in (parameters or {})},
+    }
+    if (previous and compiled.name in logs and previous.get('expression') == compiled.text
+            and previous.get('inputs') == fingerprints and previous.get('parameters') == used_scalars):
+        return {'name': compiled.name, 'expression': compiled.text, 'inputs': compiled.inputs,
+                'cached': True, 'changed': False}
+
+    key = (compiled.canonical, tuple(sorted(fingerprints.items())), tuple(sorted(used_scalars.items())), size)
+    with _cache_lock:
+        values = _result_cache.get(key)
+        if values is not None:
+            _result_cache.move_to_end(key)
+    cached = values is not None
+    if not cached:
+        values = compiled.evaluate(variables, size, chunk_size)
+        with _cache_lock:
+            _result_cache[key] = values
+            while len(_result_cache) > _RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+
+    log = WellLog(
+        name=compiled.name,
+        date=datetime.now().isoformat(),
+        description=f'= {compiled.text}',
+        interpolation='CONTINUOUS',
+        log_type='float',
+        log=[None if not np.isfinite(v) else float(v) for v in values],
+        dtst=dataset.name
+    )
+    if compiled.name in logs:
+        dataset.well_logs = [log if wl.name == compiled.name else wl for wl in dataset.well_logs]
+    else:
+        dataset.well_logs.append(log)
+    record['evaluated_at'] = datetime.now().isoformat()
+    definitions[compiled.name] = record
+    return {'name': compiled.name, 'expression': compiled.text, 'inputs': compiled.inputs,
+            'cached': cached, 'changed': True}
+
+
+def evaluate_curves(dataset: Dataset, definitions: List[str], parameters: Dict[str, float] = None,
+                    header_constants=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+    """Evaluate several definitions in order (later ones may use earlier results)"""
+    return [
+        evaluate_curve(dataset, definition, parameters, header_constants, chunk_size)
+        for definition in definitions
+    ]
+
+
+def stored_definitions(dataset: Dataset) -> List[str]:
+    """Expression definitions attached to a dataset, as 'NAME = expression'"""
+    return [f"{name} = {record['expression']}" for name, record in dataset.metadata.get(METADATA_KEY, {}).items()]
@@ -1,25 +1,65 @@
-import pandas as pd
 import csv
 import pickle
 import json
-import matplotlib.pyplot as plt
-import lasio
+import os
+import hashlib
+import uuid
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from scipy.interpolate import interp1d
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 import logging
 import numpy as np
 import math
+# pandas, lasio, scipy and matplotlib are imported where they are used, so
+# importing this module (and every route module built on it) stays cheap
 from typing import Union
 from typing import Literal
+try:
+    import fcntl
+except ImportError:  # Windows: msvcrt byte-range locks (exclusive only)
+    fcntl = None
+    import msvcrt
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 # Define the custom type for interp attribute
 interpolation_type = Literal["POINT", "TOP", "CONTINUOUS"]
 # Define the custom type for value type
 value_type = Literal["str", "float"]
+# Resampling method used for each log interpolation kind
+RESAMPLE_METHODS = {"CONTINUOUS": "linear", "POINT": "nearest", "TOP": "previous", "TOPS": "previous"}
+# Segmented well file layout: the .ptrc file is a small manifest and every
+# dataset lives in its own segment file under a sibling folder
+WELL_FILE_FORMAT = "ptrc-segmented"
+# Version 2 adds the manifest checksum; version 1 manifests are read unchecked
+WELL_FILE_FORMAT_VERSION = 2
+# Longest wait for a well's reader/writer lock before giving up
+WELL_LOCK_TIMEOUT = 30.0
+# Folder of a project holding its well files
+WELLS_FOLDER = '10-WELLS'
+
+
+class WellFileError(ValueError):
+    """A well file or one of its segments failed its integrity check."""
+
+
+class WellLockTimeout(TimeoutError):
+    """A well file stayed locked by other readers or writers for too long."""
+
+
+class WellConflictError(Exception):
+    """A dataset was changed both in memory and on disk since the Well was loaded."""
+
+
+class DatasetExistsError(ValueError):
+    """A dataset name is already taken in the well."""
+
+
 @dataclass
 class Constant:
     name: str
@@ -51,7 +91,8 @@ class RESSUM:
     dataset: str
     reference: str
 
-def item_data_list_to_dataframe(constant_list: Constants) -> pd.DataFrame:
+def item_data_list_to_dataframe(constant_list: Constants) -> 'pd.DataFrame':
+    import pandas as pd
     # Create a list of dictionaries from the ItemData instances
     data = [
         {
@@ -66,86 +107,103 @@ def item_data_list_to_dataframe(constant_list: Constants) -> pd.DataFrame:
     # Convert the list of dictionaries into a DataFrame
     return pd.DataFrame(data)
 
-class LogFrame(pd.DataFrame):
-    # Define the static log types
-    class LogType:
-        INDEX = "Index"
-        VARIABLE = "Variable"
-        TOP = "Top"
-
-    def __init__(self, data=None, index=None, columns=None, **kwargs):
-        # Initialize the DataFrame with provided data
-        super().__init__(data=data, index=index, columns=columns, **kwargs)
-        # Ensure the DataFrame has the 'DEPT' column
-        required_column = 'DEPT'
-        if required_column not in self.columns:
-            raise ValueError(f"DataFrame must contain the column: {required_column}")
-
-    def get_log_summary(self):
-        # Example method to get a summary of the DataFrame
-        return self.describe()
+def _define_log_frame():
+    """Build the LogFrame class on first use (it subclasses pandas.DataFrame)"""
+    import pandas as pd
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert WellLog DataFrame to dictionary."""
-        return {
-            'columns': self.columns.tolist(),
-            'index': self.index.tolist(),
-            'data': self.values.tolist()
-        }
+    class LogFrame(pd.DataFrame):
+        # Define the static log types
+        class LogType:
+            INDEX = "Index"
+            VARIABLE = "Variable"
+            TOP = "Top"
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> 'LogFrame':
-        """Create a LogFrame DataFrame from a dictionary."""
-        df = pd.DataFrame(data['data'], columns=data['columns'])
-        df.index = data['index']
-        return LogFrame(df)
+        def __init__(self, data=None, index=None, columns=None, **kwargs):
+            # Initialize the DataFrame with provided data
+            super().__init__(data=data, index=index, columns=columns, **kwargs)
+            # Ensure the DataFrame has the 'DEPT' column
+            required_column = 'DEPT'
+            if required_column not in self.columns:
+                raise ValueError(f"DataFrame must contain the column: {required_column}")
 
-    def serialize(self, filename: str):
-        """Serialize LogFrame to a file."""
-        with open(filename, 'wb') as file:
-            pickle.dump(self, file)
+        def get_log_summary(self):
+            # Example method to get a summary of the DataFrame
+            return self.describe()
+
+        def to_dict(self) -> Dict[str, Any]:
+            """Convert WellLog DataFrame to dictionary."""
+            return {
+                'columns': self.columns.tolist(),
+                'index': self.index.tolist(),
+                'data': self.values.tolist()
+            }
+
+        @staticmethod
+        def from_dict(data: Dict[str, Any]) -> 'LogFrame':
+            """Create a LogFrame DataFrame from a dictionary."""
+            df = pd.DataFrame(data['data'], columns=data['columns'])
+            df.index = data['index']
+            return LogFrame(df)
+
+        def serialize(self, filename: str):
+            """Serialize LogFrame to a file."""
+            with open(filename, 'wb') as file:
+                pickle.dump(self, file)
+
+        @staticmethod
+        def deserialize(filename: str) -> 'LogFrame':
+            """Deserialize WellLog from a file."""
+            with open(filename, 'rb') as file:
+                return pickle.load(file)
+
+        def filter_by_depth(self, min_depth: float, max_depth: float) -> 'LogFrame':
+            """Filter WellLog data by depth range."""
+            if min_depth >= max_depth:
+                raise ValueError("Minimum depth must be less than maximum depth.")
+            filtered_data = self[(self['DEPT'] >= min_depth) & (self['DEPT'] <= max_depth)]
+            return LogFrame(filtered_data)
+
+        def add_log(self, name: str, data: List[float]) -> None:
+            """Add a new log to the WellLog."""
+            if name in self.columns:
+                raise ValueError(f"Log '{name}' already exists.")
+            self[name] = data
+
+        def plot(self, logs: List[str] = None, depth_column: str = 'DEPT', title: str = 'Well Log', xlabel: str = 'Value', ylabel: str = 'Depth'):
+            """Plot WellLog data using matplotlib."""
+            if logs is None:
+                logs = self.columns.tolist()
+            if depth_column not in self.columns:
+                raise ValueError(f"Depth column '{depth_column}' not found in WellLog.")
+            if not logs:
+                logs = [col for col in self.columns if col != depth_column]
+
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(12, 8))
+            for log in logs:
+                if log == depth_column:
+                    continue
+                plt.plot(self[log], self[depth_column], label=log)
+
+            plt.ylabel(ylabel)
+            plt.xlabel(xlabel)
+            plt.title(title)
+            plt.legend()
+            plt.grid(True)
+            plt.show()
+
+    # Picklable under its module-level name
+    LogFrame.__qualname__ = 'LogFrame'
+    LogFrame.LogType.__qualname__ = 'LogFrame.LogType'
+    return LogFrame
+
+
+def __getattr__(name):
+    if name == 'LogFrame':
+        globals()['LogFrame'] = _define_log_frame()
+        return globals()['LogFrame']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    @staticmethod
-    def deserialize(filename: str) -> 'LogFrame':
-        """Deserialize WellLog from a file."""
-        with open(filename, 'rb') as file:
-            return pickle.load(file)
-
-    def filter_by_depth(self, min_depth: float, max_depth: float) -> 'LogFrame':
-        """Filter WellLog data by depth range."""
-        if min_depth >= max_depth:
-            raise ValueError("Minimum depth must be less than maximum depth.")
-        filtered_data = self[(self['DEPT'] >= min_depth) & (self['DEPT'] <= max_depth)]
-        return LogFrame(filtered_data)
-
-    def add_log(self, name: str, data: List[float]) -> None:
-        """Add a new log to the WellLog."""
-        if name in self.columns:
-            raise ValueError(f"Log '{name}' already exists.")
-        self[name] = data
-
-    def plot(self, logs: List[str] = None, depth_column: str = 'DEPT', title: str = 'Well Log', xlabel: str = 'Value', ylabel: str = 'Depth'):
-        """Plot WellLog data using matplotlib."""
-        if logs is None:
-            logs = self.columns.tolist()
-        if depth_column not in self.columns:
-            raise ValueError(f"Depth column '{depth_column}' not found in WellLog.")
-        if not logs:
-            logs = [col for col in self.columns if col != depth_column]
-
-        plt.figure(figsize=(12, 8))
-        for log in logs:
-            if log == depth_column:
-                continue
-            plt.plot(self[log], self[depth_column], label=log)
-        
-        plt.ylabel(ylabel)
-        plt.xlabel(xlabel)
-        plt.title(title)
-        plt.legend()
-        plt.grid(True)
-        plt.show()
-        
 @dataclass
 class WellLog:
     """Data class representing a well log."""
@@ -282,6 +340,7 @@ class Dataset:
     @staticmethod
     def from_csv(filename: str, dataset_name: str, dataset_type: str, well_name: str) -> 'Dataset':
         """Create a Dataset from a CSV file."""
+        import pandas as pd
         df = pd.read_csv(filename)
         index_name = 'DEPT'
         if index_name not in df.columns:
@@ -312,16 +371,20 @@ class Dataset:
     @staticmethod
     def from_las(filename: str, dataset_name: str, dataset_type: str, well_name: str) -> 'Dataset':
         """Create a Dataset from a LAS file using lasio."""
-        las = lasio.read(filename)
+        import lasio
+        return Dataset.from_lasio(lasio.read(filename), dataset_name, dataset_type, well_name)
+
+    @staticmethod
+    def from_lasio(las, dataset_name: str, dataset_type: str, well_name: str) -> 'Dataset':
+        """Create a Dataset from an already parsed lasio.LASFile."""
         df = las.df()
         df.reset_index(inplace=True)
         
         # find which of the possilbe mnemonic for Depth index is used in the LAS file
         possible_index = ['DEPT','DEPTH']
-        print(possible_index)
         #found_index = any(item in possible_index for item in df.columns)
         found_index = list(filter(lambda x: x in possible_index, df.columns))
-        print('******',found_index)
+        logger.debug('Depth index candidates %s, found %s', possible_index, found_index)
         
         index_name = found_index[0]
         if index_name not in df.columns:
@@ -364,6 +427,7 @@ class Dataset:
     def from_las_attachement(las_file_content, dataset_name: str, dataset_type: str, well_name: str) -> 'Dataset':
         """Create a Dataset from a LAS file using lasio."""
         import io
+        import lasio
         las_file_like = io.StringIO(las_file_content)
         las = lasio.read(las_file_like)
         df = las.df()
@@ -371,10 +435,9 @@ class Dataset:
         
         # find which of the possilbe mnemonic for Depth index is used in the LAS file
         possible_index = ['DEPT','DEPTH']
-        print(possible_index)
         #found_index = any(item in possible_index for item in df.columns)
         found_index = list(filter(lambda x: x in possible_index, df.columns))
-        print('******',found_index)
+        logger.debug('Depth index candidates %s, found %s', possible_index, found_index)
         
         index_name = found_index[0]
         if index_name not in df.columns:
@@ -466,6 +529,330 @@ class Dataset:
             metadata={'source': 'Created with new well creation'}
         )
 
+    def resample_arrays(self, target_index, log_names: List[str] = None, method: str = None) -> Dict[str, np.ndarray]:
+        """Resample logs onto target_index and return them as arrays keyed by log name.
+
+        method is one of 'linear', 'nearest', 'previous' or 'block' (block
+        average); by default it follows each log's interpolation kind
+        (CONTINUOUS -> linear, POINT -> nearest, TOP -> previous). The index
+        lookup is computed once per method and shared by all logs, and is
+        cached per (source index, target index) pair.
+        """
+        logs = self.well_logs if log_names is None else [self.get_log(name) for name in log_names]
+        return resample_logs(self.index_log, logs, target_index, method)
+
+    def resample(self, target_index, log_names: List[str] = None, method: str = None,
+                 dataset_name: str = None, index_name: str = None) -> 'Dataset':
+        """Create a new Dataset with the selected logs resampled onto target_index."""
+        arrays = self.resample_arrays(target_index, log_names, method)
+        logs = self.well_logs if log_names is None else [self.get_log(name) for name in log_names]
+        target = np.asarray(target_index, dtype=float)
+        well_logs = []
+        for log in logs:
+            values = arrays[log.name]
+            if values.dtype == object:
+                values = values.tolist()
+            else:
+                values = [None if math.isnan(v) else v for v in values.tolist()]
+            well_logs.append(WellLog(
+                name=log.name,
+                date=datetime.now().isoformat(),
+                description=log.description,
+                interpolation=log.interpolation,
+                log_type=log.log_type,
+                log=values,
+                dtst=dataset_name or self.name
+            ))
+        return Dataset(
+            date_created=datetime.now(),
+            name=dataset_name or self.name,
+            type=self.type,
+            wellname=self.wellname,
+            constants=list(self.constants),
+            index_log=target.tolist(),
+            index_name=index_name or self.index_name,
+            well_logs=well_logs,
+            metadata={'source': f'Resampled from {self.name}', 'method': method or 'by interpolation'}
+        )
+
+    def get_log(self, log_name: str) -> WellLog:
+        """Retrieve a WellLog by its name."""
+        for log in self.well_logs:
+            if log.name == log_name:
+                return log
+        raise ValueError(f"No log found with name: {log_name}")
+
+
+def _as_float_array(values) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return values
+    return np.array(values, dtype=float)
+
+
+def _fingerprint(array: np.ndarray) -> str:
+    return hashlib.blake2b(np.ascontiguousarray(array).view(np.uint8), digest_size=16).hexdigest()
+
+
+def _resample_plan(source: np.ndarray, target: np.ndarray, method: str) -> Dict[str, np.ndarray]:
+    """Index arrays mapping source samples onto target samples for one method."""
+    n = source.size
+    if method == 'block':
+        # Bin edges halfway between target samples; cumulative sums over the
+        # source samples inside each bin give the averages
+        mid = (target[1:] + target[:-1]) / 2.0
+        first_half = (target[1] - target[0]) / 2.0 if target.size > 1 else 0.0
+        last_half = (target[-1] - target[-2]) / 2.0 if target.size > 1 else 0.0
+        edges = np.concatenate(([target[0] - first_half], mid, [target[-1] + last_half]))
+        lo = np.searchsorted(source, edges[:-1], side='left')
+        hi = np.searchsorted(source, edges[1:], side='left')
+        hi[-1] = np.searchsorted(source, edges[-1], side='right')
+        return {'lo': lo, 'hi': hi}
+
+    if method == 'previous':
+        idx = np.searchsorted(source, target, side='right') - 1
+        return {'idx': idx, 'valid': idx >= 0}
+
+    right = np.clip(np.searchsorted(source, target, side='left'), 0, n - 1)
+    left = np.clip(right - 1, 0, n - 1)
+    inside = (target >= source[0]) & (target <= source[-1])
+
+    if method == 'linear':
+        span = source[right] - source[left]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(span > 0, (target - source[left]) / span, 0.0)
+        return {'left': left, 'right': right, 'weight': weight, 'valid': inside}
+
+    if method == 'nearest':
+        nearest = np.where(np.abs(source[left] - target) <= np.abs(source[right] - target), left, right)
+        # A point only lands on the target sample closest to it
+        half_step = np.median(np.diff(target)) / 2.0 if target.size > 1 else np.inf
+        valid = np.abs(source[nearest] - target) <= half_step
+        return {'idx': nearest, 'valid': valid}
+
+    raise ValueError(f"Unknown resampling method '{method}'. Use linear, nearest, previous or block")
+
+
+def _apply_plan(plan: Dict[str, np.ndarray], values: np.ndarray, method: str) -> np.ndarray:
+    """Apply a resampling plan to a (curves x samples) block of values."""
+    if values.dtype == object:
+        # String logs are always planned with nearest or previous (see _string_method)
+        out = np.full((values.shape[0], plan['idx'].size), None, dtype=object)
+        out[:, plan['valid']] = values[:, plan['idx'][plan['valid']]]
+        return out
+
+    if method == 'linear':
+        out = values[:, plan['left']] * (1.0 - plan['weight']) + values[:, plan['right']] * plan['weight']
+        # Exact hits keep their value even when the other neighbour is missing
+        exact = plan['weight'] == 0.0
+        out[:, exact] = values[:, plan['left'][exact]]
+        out[:, ~plan['valid']] = np.nan
+        return out
+
+    if method == 'block':
+        finite = np.isfinite(values)
+        sums = np.concatenate((np.zeros((values.shape[0], 1)), np.cumsum(np.where(finite, values, 0.0), axis=1)), axis=1)
+        counts = np.concatenate((np.zeros((values.shape[0], 1)), np.cumsum(finite, axis=1)), axis=1)
+        total = sums[:, plan['hi']] - sums[:, plan['lo']]
+        count = counts[:, plan['hi']] - counts[:, plan['lo']]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+    out = np.full((values.shape[0], plan['idx'].size), np.nan)
+    out[:, plan['valid']] = values[:, plan['idx'][plan['valid']]]
+    return out
+
+
+def _string_method(method: str) -> str:
+    """Method used for string logs, which cannot be averaged or interpolated."""
+    if method in ('nearest', 'previous'):
+        return method
+    return 'previous' if method == 'block' else 'nearest'
+
+
+# Resampling plans keyed by (source index, target index, method) fingerprints.
+# Plans are shared by every dataset on the same index (e.g. all runs of a well
+# resampled to the REFERENCE depth), while curve values are always re-read
+_PLAN_CACHE_SIZE = 64
+_plan_cache: 'OrderedDict[tuple, Dict[str, np.ndarray]]' = OrderedDict()
+_resample_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, key):
+    with _resample_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key, value, size: int):
+    with _resample_lock:
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+def resample_logs(source_index, logs: List['WellLog'], target_index, method: str = None) -> Dict[str, np.ndarray]:
+    """Resample many logs sharing source_index onto target_index.
+
+    Logs are grouped by method; each group uses a single cached
+    searchsorted plan and one (curves x samples) array operation.
+    """
+    source = _as_float_array(source_index)
+    target = _as_float_array(target_index)
+    if source.size == 0 or target.size == 0:
+        return {log.name: np.full(target.size, np.nan) for log in logs}
+
+    # Sort the source once (and drop missing depths) so searchsorted applies
+    keep = np.isfinite(source)
+    presorted = bool(keep.all()) and bool(np.all(source[1:] >= source[:-1]))
+    if presorted:
+        sorted_source = source
+    else:
+        order = np.argsort(source[keep], kind='stable')
+        sorted_source = source[keep][order]
+    source_fp = _fingerprint(source)
+    target_fp = _fingerprint(target)
+
+    groups: Dict[Tuple[str, bool], List['WellLog']] = {}
+    for log in logs:
+        log_method = method or RESAMPLE_METHODS.get(str(log.interpolation).upper(), 'linear')
+        is_str = log.log_type == 'str'
+        if is_str:
+            # Chosen before the plan (and its cache key) is built for the group
+            log_method = _string_method(log_method)
+        groups.setdefault((log_method, is_str), []).append(log)
+
+    results = {}
+    for (log_method, is_str), group in groups.items():
+        # Each log is padded/truncated to the index length before stacking,
+        # since logs of one group may differ in length
+        block = np.full((len(group), source.size), None if is_str else np.nan, dtype=object if is_str else float)
+        for row, log in enumerate(group):
+            values = list(log.log) if is_str else _as_float_array(log.log)
+            n = min(len(values), source.size)
+            block[row, :n] = values[:n]
+        if not presorted:
+            block = block[:, keep][:, order]
+        plan_key = (source_fp, target_fp, log_method)
+        plan = _cache_get(_plan_cache, plan_key)
+        if plan is None:
+            plan = _resample_plan(sorted_source, target, log_method)
+            _cache_put(_plan_cache, plan_key, plan, _PLAN_CACHE_SIZE)
+        out = _apply_plan(plan, block, log_method)
+        results.update((log.name, out[i]) for i, log in enumerate(group))
+    return {log.name: results[log.name] for log in logs}
+
+class MergedView:
+    """Virtual depth-aligned table over several datasets of a well.
+
+    Columns are resolved up front but only resampled when first read; all
+    requested columns of one dataset are materialised together through
+    Dataset.resample_arrays, so one index computation serves all of them.
+    A log name present in several datasets is exposed as "DATASET.LOG";
+    the bare name refers to its first occurrence.
+    """
+
+    def __init__(self, datasets: List[Dataset], index=None, step: float = None, method: str = None):
+        self.datasets = [ds for ds in datasets if len(ds.index_log) > 0]
+        self.method = method
+        self.index = _as_float_array(index) if index is not None else self._common_index(step)
+        self._columns: Dict[str, Tuple[Dataset, WellLog]] = {}
+        self._values: Dict[str, np.ndarray] = {}
+        self._log_names: List[str] = []
+        for ds in self.datasets:
+            for log in ds.well_logs:
+                if log.name not in self._columns:
+                    if log.name != ds.index_name:
+                        self._log_names.append(log.name)
+                    self._columns[log.name] = (ds, log)
+                self._columns[f'{ds.name}.{log.name}'] = (ds, log)
+
+    def _common_index(self, step: float = None) -> np.ndarray:
+        """Union depth range of the datasets at the finest sampling step.
+
+        When every dataset shares the same index (and no step is forced) that
+        index is used unchanged, so single-run views are not resampled.
+        """
+        if not self.datasets:
+            return np.array([], dtype=float)
+        indexes = [_as_float_array(ds.index_log) for ds in self.datasets]
+        first = indexes[0]
+        if step is None and all(ix.size == first.size and np.array_equal(ix, first, equal_nan=True) for ix in indexes):
+            return first
+        if step is None:
+            steps = [np.nanmedian(np.abs(np.diff(ix))) for ix in indexes if ix.size > 1]
+            steps = [st for st in steps if np.isfinite(st) and st > 0]
+            step = min(steps) if steps else 1.0
+        top = min(np.nanmin(ix) for ix in indexes)
+        bottom = max(np.nanmax(ix) for ix in indexes)
+        count = int(math.floor((bottom - top) / step + 1e-9)) + 1
+        return top + np.arange(count) * step
+
+    @property
+    def columns(self) -> List[str]:
+        """Available column names, including the qualified DATASET.LOG forms."""
+        return list(self._columns)
+
+    @property
+    def log_names(self) -> List[str]:
+        """Bare log names, each at its first occurrence, without index curves."""
+        return list(self._log_names)
+
+    def resolve(self, name: str) -> Tuple[Dataset, WellLog]:
+        """Dataset and log behind a column name."""
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise ValueError(f"No log found with name: {name}")
+
+    def materialize(self, names: List[str]) -> Dict[str, np.ndarray]:
+        """Resample the requested columns (one pass per source dataset)."""
+        pending: Dict[int, Tuple[Dataset, List[Tuple[str, WellLog]]]] = {}
+        for name in names:
+            if name in self._values:
+                continue
+            ds, log = self.resolve(name)
+            pending.setdefault(id(ds), (ds, []))[1].append((name, log))
+        for ds, items in pending.values():
+            logs = list({log.name: log for _, log in items}.values())
+            arrays = resample_logs(ds.index_log, logs, self.index, self.method)
+            for name, log in items:
+                self._values[name] = arrays[log.name]
+        return {name: self._values[name] for name in names}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.materialize([name])[name]
+
+    def to_frame(self, names: List[str] = None, index_name: str = 'DEPTH') -> 'pd.DataFrame':
+        """Materialise columns into a DataFrame with the common index as first column."""
+        import pandas as pd
+        names = names or self.log_names
+        data = {index_name: self.index}
+        data.update(self.materialize(names))
+        return pd.DataFrame(data)
+
+    def to_csv(self, filename: str, names: List[str] = None, index_name: str = 'DEPTH'):
+        """Write the selected columns to a CSV file."""
+        self.to_frame(names, index_name).to_csv(filename, index=False)
+
+    def to_las(self, filename: str, well_name: str, names: List[str] = None,
+               index_name: str = 'DEPT', set_name: str = 'MERGED'):
+        """Write the selected columns to a LAS 2.0 file."""
+        import lasio
+        names = names or self.log_names
+        las = lasio.LASFile()
+        las.well['WELL'] = lasio.HeaderItem('WELL', value=well_name)
+        las.params['SET'] = lasio.HeaderItem('SET', value=set_name)
+        las.append_curve(index_name, self.index)
+        for name, values in self.materialize(names).items():
+            _, log = self.resolve(name)
+            if values.dtype == object:
+                # LAS curves are numeric; string logs are skipped
+                continue
+            las.append_curve(name.replace('.', '_'), values, descr=log.description)
+        las.write(filename, version=2.0)
+
 @dataclass
 class Well:
     """Data class representing a well."""
@@ -473,6 +860,10 @@ class Well:
     well_name: str
     well_type: str
     datasets: List[Dataset] = field(default_factory=list)
+    # Manifest version and segment digests this Well was loaded from, used by
+    # serialize to merge in writes made by other workers since then
+    version: int = field(default=0, compare=False, repr=False)
+    base_segments: Union[Dict[str, str], None] = field(default=None, compare=False, repr=False)
 
     def add_dataset(self, dataset: Dataset):
         """Add a Dataset to the Well."""
@@ -489,6 +880,12 @@ class Well:
                 return ds
         raise ValueError(f"No Dataset found with name: {dataset_name}")
 
+    def merged_view(self, dataset_names: List[str] = None, index=None,
+                    step: float = None, method: str = None) -> MergedView:
+        """Lazy depth-aligned view over the selected datasets (all by default)."""
+        datasets = self.datasets if dataset_names is None else [self.get_dataset(name) for name in dataset_names]
+        return MergedView(datasets, index=index, step=step, method=method)
+
     def summary(self) -> Dict[str, Any]:
         """Generate a summary of the Well, including dataset names."""
         return {
@@ -507,16 +904,176 @@ class Well:
         }
 
     def serialize(self, filename: str):
-        """Serialize Well to a file."""
-        with open(filename, 'w') as file:
-            json.dump(self.to_dict(), file, default=str)
+        """Serialize Well to a manifest file plus one segment file per dataset.
+
+        Segments whose content is unchanged since the last write are reused,
+        so only modified datasets and the manifest hit the disk. Returns the
+        number of bytes written.
+
+        A Well loaded from this file that was written by someone else since is
+        merged first: datasets changed only on disk are taken from the disk,
+        and a dataset changed on both sides raises WellConflictError.
+        """
+        with well_lock(filename, exclusive=True):
+            return self._serialize(filename)
+
+    def _serialize(self, filename: str) -> int:
+        folder = well_segment_folder(filename)
+        os.makedirs(folder, exist_ok=True)
+        previous = Well.read_manifest(filename) if os.path.exists(filename) else None
+        previous_segments = {seg['name']: seg for seg in previous['segments']} if previous else {}
+        if previous and self.base_segments is not None and previous.get('version', 0) != self.version:
+            self._merge_concurrent_writes(folder, previous)
+
+        segments = []
+        bytes_written = 0
+        for dataset in self.datasets:
+            payload = _dataset_payload(dataset)
+            digest = hashlib.sha256(payload).hexdigest()
+            old = previous_segments.get(dataset.name)
+            if old and old.get('sha256') == digest and os.path.exists(os.path.join(folder, old['file'])):
+                segments.append(old)
+            else:
+                segments.append(_write_segment(folder, dataset, payload, digest))
+                bytes_written += len(payload)
+
+        manifest = _manifest(self.date_created, self.well_name, self.well_type, segments)
+        manifest['version'] = previous.get('version', 0) if previous else 0
+        manifest_payload = _manifest_payload(manifest)
+        _atomic_write(filename, manifest_payload)
+        if previous:
+            _remove_segments(folder, previous['segments'], keep=segments)
+        self.version = manifest['version']
+        self.base_segments = {seg['name']: seg['sha256'] for seg in segments}
+        return bytes_written + len(manifest_payload)
+
+    def _merge_concurrent_writes(self, folder: str, current: Dict[str, Any]):
+        """Three-way merge of the datasets against the loaded and the current manifest."""
+        base = self.base_segments
+        theirs = {seg['name']: seg for seg in current['segments']}
+        ours = {ds.name: ds for ds in self.datasets}
+        our_digests = {name: hashlib.sha256(_dataset_payload(ds)).hexdigest() for name, ds in ours.items()}
+        merged, conflicts = [], []
+        for name in list(theirs) + [name for name in ours if name not in theirs]:
+            our_digest = our_digests.get(name)
+            their_digest = theirs[name]['sha256'] if name in theirs else None
+            base_digest = base.get(name)
+            if our_digest != their_digest and our_digest != base_digest and their_digest != base_digest:
+                conflicts.append(name)
+            elif our_digest != base_digest or our_digest == their_digest:
+                # Changed, added or removed here (or identical on both sides)
+                if name in ours:
+                    merged.append(ours[name])
+            elif name in theirs:
+                # Changed or added by another writer
+                merged.append(_read_segment(folder, theirs[name]))
+        if conflicts:
+            raise WellConflictError(
+                f"Dataset(s) {', '.join(conflicts)} of well '{self.well_name}' were changed by another "
+                f"writer since the well was loaded (version {self.version}, now {current.get('version', 0)})")
+        logger.info('Merged concurrent writes into well %s (version %s -> %s)',
+                    self.well_name, self.version, current.get('version', 0))
+        self.datasets = merged
 
     @staticmethod
     def deserialize(filepath: str) -> 'Well':
-        """Deserialize Well from a file."""
-        with open(filepath, 'r') as file:
-            data = json.load(file)
-            return Well.from_dict(data)
+        """Deserialize Well from a file (segmented or single-file layout).
+
+        Raises WellFileError if the manifest or a segment fails its checksum.
+        """
+        with well_lock(filepath):
+            with open(filepath, 'rb') as file:
+                data = json.loads(file.read())
+            if data.get('format') != WELL_FILE_FORMAT:
+                return Well.from_dict(data)
+            _verify_manifest(filepath, data)
+            folder = well_segment_folder(filepath)
+            datasets = [_read_segment(folder, seg) for seg in data['segments']]
+        return Well(
+            date_created=datetime.fromisoformat(data['date_created']),
+            well_name=data['well_name'],
+            well_type=data['well_type'],
+            datasets=datasets,
+            version=data.get('version', 0),
+            base_segments={seg['name']: seg['sha256'] for seg in data['segments']}
+        )
+
+    @staticmethod
+    def read_manifest(filepath: str) -> Union[Dict[str, Any], None]:
+        """Read the manifest of a segmented well file, or None for a single-file well."""
+        with well_lock(filepath):
+            with open(filepath, 'rb') as file:
+                data = json.loads(file.read())
+        if data.get('format') != WELL_FILE_FORMAT:
+            return None
+        _verify_manifest(filepath, data)
+        return data
+
+    @staticmethod
+    def load_dataset_from_file(filepath: str, dataset_name: str) -> Dataset:
+        """Load a single Dataset from a well file without reading the other datasets."""
+        with well_lock(filepath):
+            manifest = Well.read_manifest(filepath)
+            if manifest is None:
+                return Well.deserialize(filepath).get_dataset(dataset_name)
+            for seg in manifest['segments']:
+                if seg['name'] == dataset_name:
+                    return _read_segment(well_segment_folder(filepath), seg)
+        raise ValueError(f"No Dataset found with name: {dataset_name}")
+
+    @staticmethod
+    def append_dataset_to_file(filepath: str, dataset: Dataset) -> Dict[str, Any]:
+        """Append a Dataset to a well file, writing only its segment and the manifest.
+
+        Single-file wells are converted to the segmented layout first.
+        Returns the updated manifest.
+        """
+        with well_lock(filepath, exclusive=True):
+            manifest = _ensure_segmented(filepath)
+            if dataset.name in [seg['name'] for seg in manifest['segments']]:
+                raise DatasetExistsError(f"Dataset '{dataset.name}' already exists in well '{manifest['well_name']}'")
+            folder = well_segment_folder(filepath)
+            os.makedirs(folder, exist_ok=True)
+            payload = _dataset_payload(dataset)
+            segment = _write_segment(folder, dataset, payload, hashlib.sha256(payload).hexdigest())
+            manifest['segments'].append(segment)
+            _atomic_write(filepath, _manifest_payload(manifest))
+            return manifest
+
+    @staticmethod
+    def replace_dataset_in_file(filepath: str, dataset: Dataset) -> Dict[str, Any]:
+        """Write a Dataset to a well file, replacing any dataset of the same name.
+
+        The new segment is written first and swapped in with a single manifest
+        write, so readers see either the old or the new dataset.
+        Returns the updated manifest.
+        """
+        with well_lock(filepath, exclusive=True):
+            manifest = _ensure_segmented(filepath)
+            folder = well_segment_folder(filepath)
+            os.makedirs(folder, exist_ok=True)
+            payload = _dataset_payload(dataset)
+            segment = _write_segment(folder, dataset, payload, hashlib.sha256(payload).hexdigest())
+            replaced = [seg for seg in manifest['segments'] if seg['name'] == dataset.name]
+            if replaced:
+                manifest['segments'] = [segment if seg['name'] == dataset.name else seg for seg in manifest['segments']]
+            else:
+                manifest['segments'].append(segment)
+            _atomic_write(filepath, _manifest_payload(manifest))
+            _remove_segments(folder, replaced, keep=[segment])
+            return manifest
+
+    @staticmethod
+    def remove_dataset_from_file(filepath: str, dataset_name: str):
+        """Remove a Dataset from a well file, rewriting only the manifest."""
+        with well_lock(filepath, exclusive=True):
+            manifest = _ensure_segmented(filepath)
+            removed = [seg for seg in manifest['segments'] if seg['name'] == dataset_name]
+            if not removed:
+                raise ValueError(f"No Dataset found with name: {dataset_name}")
+            manifest['segments'] = [seg for seg in manifest['segments'] if seg['name'] != dataset_name]
+            _atomic_write(filepath, _manifest_payload(manifest))
+            _remove_segments(well_segment_folder(filepath), removed, keep=[])
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Well':
@@ -528,6 +1085,267 @@ class Well:
             well_type=data['well_type'],
             datasets=datasets
         )
+def project_well_files(project_path: str, wells: List[str] = None) -> List[str]:
+    """Well files (10-WELLS/*.ptrc) of a project, sorted, optionally restricted to the named wells."""
+    wells_folder = os.path.join(project_path, WELLS_FOLDER)
+    if not os.path.isdir(wells_folder):
+        return []
+    files = sorted(
+        entry.path for entry in os.scandir(wells_folder)
+        if entry.is_file() and entry.name.endswith('.ptrc')
+    )
+    if wells:
+        wanted = set(wells)
+        files = [f for f in files if os.path.splitext(os.path.basename(f))[0] in wanted]
+    return files
+
+
+def well_segment_folder(filepath: str) -> str:
+    """Folder holding the dataset segments of a well file (e.g. 10-WELLS/.W1.ptrc.d)."""
+    head, tail = os.path.split(filepath)
+    return os.path.join(head, f'.{tail}.d')
+
+
+def well_lock_path(filepath: str) -> str:
+    """Lock file coordinating readers and writers of a well file (e.g. 10-WELLS/.W1.ptrc.lock)."""
+    head, tail = os.path.split(filepath)
+    return os.path.join(head, f'.{tail}.lock')
+
+
+_held_well_locks = threading.local()
+if hasattr(os, 'register_at_fork'):
+    # A forked child does not own the locks its parent thread was holding
+    os.register_at_fork(after_in_child=lambda: _held_well_locks.__dict__.clear())
+
+
+@contextmanager
+def well_lock(filepath: str, exclusive: bool = False, timeout: float = WELL_LOCK_TIMEOUT):
+    """Hold the reader/writer lock of a well file.
+
+    Readers share the lock and a writer holds it alone. It is an OS lock on
+    the well's lock file, so it coordinates threads and worker processes.
+    A thread already holding the lock of a well reuses it. Raises
+    WellLockTimeout after waiting timeout seconds.
+    """
+    key = os.path.abspath(filepath)
+    held = getattr(_held_well_locks, 'modes', None)
+    if held is None:
+        held = _held_well_locks.modes = {}
+    if key in held:
+        if exclusive and not held[key]:
+            raise RuntimeError(f"Cannot upgrade the read lock of {filepath} to a write lock")
+        yield
+        return
+    if not exclusive and not os.path.exists(key):
+        # Nothing to read; do not leave a lock file behind for a missing well
+        yield
+        return
+    fd = os.open(well_lock_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while not _try_lock(fd, exclusive):
+            if time.monotonic() >= deadline:
+                raise WellLockTimeout(f"Timed out after {timeout:.0f}s waiting for the lock of {filepath}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        held[key] = exclusive
+        try:
+            yield
+        finally:
+            del held[key]
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _try_lock(fd: int, exclusive: bool) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _dataset_payload(dataset: Dataset) -> bytes:
+    return json.dumps(dataset.to_dict(), default=str).encode('utf-8')
+
+
+def _manifest(date_created, well_name: str, well_type: str, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        'format': WELL_FILE_FORMAT,
+        'format_version': WELL_FILE_FORMAT_VERSION,
+        'date_created': date_created.isoformat() if isinstance(date_created, datetime) else date_created,
+        'well_name': well_name,
+        'well_type': well_type,
+        'segments': segments,
+    }
+
+
+def _manifest_checksum(manifest: Dict[str, Any]) -> str:
+    body = {key: value for key, value in manifest.items() if key != 'checksum'}
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _manifest_payload(manifest: Dict[str, Any]) -> bytes:
+    """Manifest bytes with its checksum, the current format version and the next write version."""
+    manifest['format_version'] = WELL_FILE_FORMAT_VERSION
+    manifest['version'] = manifest.get('version', 0) + 1
+    # Checksum the JSON round-tripped form, which is what readers recompute it from
+    manifest = json.loads(json.dumps({k: v for k, v in manifest.items() if k != 'checksum'}, default=str))
+    manifest['checksum'] = _manifest_checksum(manifest)
+    return json.dumps(manifest).encode('utf-8')
+
+
+def _verify_manifest(filepath: str, manifest: Dict[str, Any]):
+    checksum = manifest.get('checksum')
+    if checksum is not None and checksum != _manifest_checksum(manifest):
+        raise WellFileError(f"Manifest of {filepath} does not match its checksum")
+
+
+def _atomic_write(path: str, payload: bytes):
+    """Write to a temp file in the same folder, fsync, then rename over the target."""
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if os.name != 'nt':
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _write_segment(folder: str, dataset: Dataset, payload: bytes, digest: str) -> Dict[str, Any]:
+    # Segments are never overwritten in place: a new file is written and the
+    # manifest swap makes it visible, so a crash leaves the old state intact
+    segment_file = f'{uuid.uuid4().hex}.json'
+    _atomic_write(os.path.join(folder, segment_file), payload)
+    return {
+        'name': dataset.name,
+        'type': dataset.type,
+        'file': segment_file,
+        'size': len(payload),
+        'sha256': digest,
+    }
+
+
+def _read_segment(folder: str, segment: Dict[str, Any]) -> Dataset:
+    with open(os.path.join(folder, segment['file']), 'rb') as file:
+        payload = file.read()
+    if len(payload) != segment['size'] or hashlib.sha256(payload).hexdigest() != segment['sha256']:
+        raise WellFileError(f"Segment '{segment['name']}' of {folder} does not match its checksum")
+    return Dataset.from_dict(json.loads(payload))
+
+
+def _remove_segments(folder: str, segments: List[Dict[str, Any]], keep: List[Dict[str, Any]]):
+    kept_files = {seg['file'] for seg in keep}
+    for seg in segments:
+        if seg['file'] not in kept_files:
+            try:
+                os.remove(os.path.join(folder, seg['file']))
+            except FileNotFoundError:
+                pass
+
+
+def _ensure_segmented(filepath: str) -> Dict[str, Any]:
+    """Return the manifest of a well file, converting a single-file well in place."""
+    manifest = Well.read_manifest(filepath)
+    if manifest is None:
+        Well.deserialize(filepath).serialize(filepath)
+        manifest = Well.read_manifest(filepath)
+    return manifest
+
+@dataclass
+class Trajectory:
+    """Well trajectory as column arrays, one entry per survey station."""
+    md: np.ndarray
+    inclination: np.ndarray
+    azimuth: np.ndarray
+    tvd: np.ndarray
+    north: np.ndarray
+    east: np.ndarray
+    dogleg: np.ndarray  # dogleg angle of the course ending at each station, degrees
+    dls: np.ndarray  # dogleg severity, degrees per dls_course_length
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name).tolist() for name in
+                ('md', 'inclination', 'azimuth', 'tvd', 'north', 'east', 'dogleg', 'dls')}
+
+
+def minimum_curvature(md, inclination, azimuth, tvd_start: float = None,
+                      dls_course_length: float = 100.0) -> Trajectory:
+    """Vectorised minimum curvature trajectory from survey stations.
+
+    Angles are in degrees. The first station is placed at TVD = tvd_start
+    (default: its MD, i.e. a vertical hole above the first station) with
+    zero North/East offsets.
+    """
+    md = np.asarray(md, dtype=float)
+    inc = np.radians(np.asarray(inclination, dtype=float))
+    azi = np.radians(np.asarray(azimuth, dtype=float))
+    n = md.size
+    if n == 0:
+        empty = np.empty(0)
+        return Trajectory(md, empty, empty, empty, empty, empty, empty, empty)
+
+    i1, i2 = inc[:-1], inc[1:]
+    a1, a2 = azi[:-1], azi[1:]
+    course = np.diff(md)
+    sin_i1, sin_i2 = np.sin(i1), np.sin(i2)
+
+    cos_dl = np.cos(i2 - i1) - sin_i1 * sin_i2 * (1.0 - np.cos(a2 - a1))
+    dogleg = np.arccos(np.clip(cos_dl, -1.0, 1.0))
+    # Ratio factor 2/DL * tan(DL/2) tends to 1 for straight courses
+    small = dogleg < 1e-9
+    ratio = np.ones_like(dogleg)
+    ratio[~small] = 2.0 / dogleg[~small] * np.tan(dogleg[~small] / 2.0)
+
+    half = 0.5 * course * ratio
+    d_north = half * (sin_i1 * np.cos(a1) + sin_i2 * np.cos(a2))
+    d_east = half * (sin_i1 * np.sin(a1) + sin_i2 * np.sin(a2))
+    d_tvd = half * (np.cos(i1) + np.cos(i2))
+
+    start = md[0] if tvd_start is None else tvd_start
+    tvd = np.concatenate(([start], start + np.cumsum(d_tvd)))
+    north = np.concatenate(([0.0], np.cumsum(d_north)))
+    east = np.concatenate(([0.0], np.cumsum(d_east)))
+
+    dogleg_deg = np.degrees(dogleg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dls = np.where(course > 0, dogleg_deg * dls_course_length / course, 0.0)
+
+    return Trajectory(
+        md=md,
+        inclination=np.degrees(inc),
+        azimuth=np.degrees(azi),
+        tvd=tvd,
+        north=north,
+        east=east,
+        dogleg=np.concatenate(([0.0], dogleg_deg)),
+        dls=np.concatenate(([0.0], dls)),
+    )
+
 @dataclass
 class SurveyData:
     depth: float
@@ -574,39 +1392,31 @@ class Survey:
                 depth, deviation, azimuth = map(float, row)
                 self.add_data(SurveyData(depth, deviation, azimuth))
                 
-    def compute_tvd_minimum_curvature(depths, deviations, azimuths):
-        """Compute Total Vertical Depth (TVD) using the Minimum Curvature method."""
-        tvds = [depths[0]]  # TVD at the first depth point
-        norths = [0]  # TVD at the first depth point
-        souths = [0]  # TVD at the first depth point
-        cumulative_tvd = [depths[0]]  # Cumulative TVD starts with the first depth point
-        pi = 3.141592653589793
-        for i in range(1, len(depths)):
-            D = depths[i] - depths[i - 1]  # Calculate vertical distance
-            deviation_radians = np.radians(0.5*(deviations[i - 1]+deviations[i]))  # Convert deviation to radians
-            azimuth_radians = np.radians(0.5*(azimuths[i - 1]+azimuths[i]))  # Convert deviation to radians
-
-            # Calculate vertical depth change using the deviation
-            vertical_distance = D * np.cos(deviation_radians)
-            
-            # Calculate vertical depth change using the deviation
-            horizontl_distance = D * np.sin(deviation_radians)
-            north = horizontl_distance*np.cos(azimuth_radians)
-            south = horizontl_distance*np.sin(azimuth_radians)
-            # Update TVD without constraints
-            new_tvd = tvds[i - 1] + vertical_distance
-            new_north = norths[i-1] + north
-            new_south = souths[i-1] + south
-            
-            tvds.append(new_tvd)
-            norths.append(new_north)
-            souths.append(new_south)
-        return tvds, norths, souths
+    def to_arrays(self):
+        """Return the survey as (depth, deviation, azimuth) column arrays."""
+        depths = np.fromiter((d.depth for d in self.data), dtype=float, count=len(self.data))
+        deviations = np.fromiter((d.deviation for d in self.data), dtype=float, count=len(self.data))
+        azimuths = np.fromiter((d.azimuth for d in self.data), dtype=float, count=len(self.data))
+        return depths, deviations, azimuths
 
-    def interpolate(self, step: float = 0.5) -> List[SurveyData]:
-        depths = np.array([d.depth for d in self.data])
-        deviations = np.array([d.deviation for d in self.data])
-        azimuths = np.array([d.azimuth for d in self.data])
+    @classmethod
+    def from_arrays(cls, depths, deviations, azimuths) -> 'Survey':
+        return cls(data=[SurveyData(float(d), float(i), float(a)) for d, i, a in zip(depths, deviations, azimuths)])
+
+    def trajectory(self, tvd_start: float = None) -> 'Trajectory':
+        """Compute the well trajectory with the minimum curvature method."""
+        depths, deviations, azimuths = self.to_arrays()
+        return minimum_curvature(depths, deviations, azimuths, tvd_start=tvd_start)
+
+    def compute_tvd_minimum_curvature(self):
+        """Compute TVD, North and East offsets using the Minimum Curvature method."""
+        traj = self.trajectory()
+        return traj.tvd, traj.north, traj.east
+
+    def interpolate_arrays(self, step: float = 0.5):
+        """Interpolate deviation and azimuth at a regular depth step, as column arrays."""
+        from scipy.interpolate import interp1d
+        depths, deviations, azimuths = self.to_arrays()
 
         # Create interpolators
         deviation_interp = interp1d(depths, deviations, kind='linear', fill_value="extrapolate")
@@ -615,17 +1425,19 @@ class Survey:
         # Generate new depth values at specified intervals
         new_depths = np.arange(depths.min(), depths.max() + step, step)
 
-        # Interpolate to find corresponding values
-        new_deviations = deviation_interp(new_depths)
-        new_azimuths = azimuth_interp(new_depths)
+        return new_depths, deviation_interp(new_depths), azimuth_interp(new_depths)
+
+    def interpolate(self, step: float = 0.5) -> List[SurveyData]:
+        new_depths, new_deviations, new_azimuths = self.interpolate_arrays(step)
 
         # Combine interpolated data into new list of SurveyData instances
         interpolated_data = [
             SurveyData(depth, deviation, azimuth) 
-            for depth, deviation, azimuth in zip(new_depths, new_deviations, new_azimuths)
+            for depth, deviation, azimuth in zip(new_depths.tolist(), new_deviations.tolist(), new_azimuths.tolist())
         ]
 
         return interpolated_data
+
 class Interpolation:
     # Define the allowed constant values
     ALLOWED_VALUES = {"POINT", "TOPS", "CONTINUOUS"}
@@ -0,0 +1,144 @@
+"""
+File Reads Module
+Bounded reads of workspace files for the data explorer: byte ranges, line
+ranges and head/tail previews that never load more than the requested part
+of a file, plus content types for streaming whole files.
+
+Environment:
+    PETRO_FILE_INLINE_MAX   largest file returned whole inside JSON; larger
+                            files are streamed raw (default 8 MiB)
+"""
+
+import mimetypes
+import os
+from typing import Dict
+
+INLINE_MAX_BYTES = int(os.environ.get('PETRO_FILE_INLINE_MAX', 8 * 1024 * 1024))
+# Upper bounds for a single ranged or preview read returned in JSON
+MAX_RANGE_BYTES = 8 * 1024 * 1024
+MAX_LINES = 10000
+TAIL_BLOCK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    '.las': 'text/plain',
+    '.ptrc': 'application/json',
+    '.json': 'application/json',
+    '.csv': 'text/csv',
+    '.txt': 'text/plain',
+    '.alias': 'text/plain',
+    '.info': 'text/plain',
+}
+
+
+def content_type(path: str) -> str:
+    """MIME type of a workspace file, defaulting to octet-stream"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CONTENT_TYPES:
+        return CONTENT_TYPES[ext]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def _decode(data: bytes) -> str:
+    # Ranges may cut through a multi-byte character
+    return data.decode('utf-8', errors='replace')
+
+
+def read_byte_range(path: str, offset: int, length: int) -> Dict:
+    """Bytes [offset, offset + length) of a file as text.
+
+    Returns:
+        Dictionary with content, offset, length (bytes read), size and eof
+    """
+    size = os.path.getsize(path)
+    offset = min(max(offset, 0), size)
+    length = min(max(length, 0), MAX_RANGE_BYTES)
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        data = file.read(length)
+    return {
+        'content': _decode(data),
+        'offset': offset,
+        'length': len(data),
+        'size': size,
+        'eof': offset + len(data) >= size
+    }
+
+
+def _skip_lines(file, count: int):
+    # Reads in bounded pieces so a skipped line of any length is never held whole
+    skipped = 0
+    while skipped < count:
+        piece = file.readline(TAIL_BLOCK_SIZE)
+        if not piece:
+            return
+        if piece.endswith(b'\n'):
+            skipped += 1
+
+
+def read_line_range(path: str, start: int, count: int) -> Dict:
+    """Lines [start, start + count) of a file, read line by line from the top.
+
+    At most MAX_RANGE_BYTES are returned; when the limit cuts the range
+    short, possibly in the middle of a line, truncated is set.
+
+    Returns:
+        Dictionary with content, startLine, lineCount, size, eof and truncated
+    """
+    start = max(start, 0)
+    count = min(max(count, 0), MAX_LINES)
+    lines, read_bytes = [], 0
+    with open(path, 'rb') as file:
+        _skip_lines(file, start)
+        while len(lines) < count and read_bytes < MAX_RANGE_BYTES:
+            line = file.readline(MAX_RANGE_BYTES - read_bytes)
+            if not line:
+                break
+            lines.append(line)
+            read_bytes += len(line)
+        eof = file.read(1) == b''
+    partial = bool(lines) and not lines[-1].endswith(b'\n') and not eof
+    return {
+        'content': _decode(b''.join(lines)),
+        'startLine': start,
+        'lineCount': len(lines),
+        'size': os.path.getsize(path),
+        'eof': eof,
+        'truncated': partial or (len(lines) < count and not eof)
+    }
+
+
+def head_lines(path: str, count: int) -> Dict:
+    """First count lines of a file"""
+    return read_line_range(path, 0, count)
+
+
+def tail_lines(path: str, count: int) -> Dict:
+    """Last count lines of a file, read backwards in blocks from the end.
+
+    Returns:
+        Dictionary with content, lineCount, size and offset of the first
+        returned byte
+    """
+    count = min(max(count, 0), MAX_LINES)
+    size = os.path.getsize(path)
+    if count == 0 or size == 0:
+        return {'content': '', 'lineCount': 0, 'size': size, 'offset': size}
+    with open(path, 'rb') as file:
+        position, data = size, b''
+        # One extra newline marks the start of the first wanted line; a
+        # trailing newline ends the last line rather than starting a new one
+        wanted = count + 1
+        while position > 0 and data.count(b'\n') <= wanted and len(data) < MAX_RANGE_BYTES:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            file.seek(position)
+            data = file.read(step) + data
+    body = data[:-1] if data.endswith(b'\n') else data
+    lines = body.split(b'\n')[-count:]
+    content = b'\n'.join(lines) + (b'\n' if data.endswith(b'\n') else b'')
+    return {
+        'content': _decode(content),
+        'lineCount': len(lines),
+        'size': size,
+        'offset': size - len(content)
+    }
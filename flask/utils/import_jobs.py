@@ -0,0 +1,217 @@
+"""
+Batch LAS Import Jobs
+Background jobs that ingest every new LAS file of a project (or an explicit
+list of paths), skipping files whose content hash was already imported.
+Job status is shared with the other server workers through job_state.
+"""
+
+import os
+import logging
+import time
+import uuid
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils.fe_data_objects import DatasetExistsError
+from utils.las_import import (
+    INPUT_LAS_FOLDER, file_sha256, load_ingest_index, import_las_file
+)
+from utils.job_state import (
+    StoredJob, cancel_requested, clear_cancel, list_states, load_state, prune_states, save_state
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = 'import'
+
+
+class ImportJob:
+    """
+    A single batch import run over a list of LAS files
+
+    The job runs in a background thread; progress counters are updated as
+    each file completes and cancellation is checked between files.
+    """
+
+    def __init__(self, project_path: str, paths: List[str]):
+        self.id = uuid.uuid4().hex
+        self.project_path = project_path
+        self.paths = paths
+        self.status = 'queued'
+        self.created_at = datetime.now()
+        self.started = None
+        self.finished = None
+        self.current_file = None
+        self.total_bytes = sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+        self.processed_files = 0
+        self.processed_bytes = 0
+        self.imported = []
+        self.skipped = []
+        self.errors = []
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the job in a daemon thread"""
+        self._thread = threading.Thread(target=self._run, name=f'las-import-{self.id[:8]}', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Request cancellation; the file currently being imported is finished first"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        # Another worker may have received the cancel request
+        return self._cancel_event.is_set() or cancel_requested(JOB_KIND, self.id)
+
+    def save(self):
+        """Publish the job's status to the other workers"""
+        try:
+            save_state(JOB_KIND, self.id, self.to_dict())
+        except OSError:
+            logger.warning('Could not save the state of import job %s', self.id, exc_info=True)
+
+    def _run(self):
+        self.status = 'running'
+        self.started = time.monotonic()
+        try:
+            ingested = load_ingest_index(self.project_path)
+            for path in self.paths:
+                if self.cancelled:
+                    self.status = 'cancelled'
+                    break
+
+                self.current_file = os.path.basename(path)
+                size = os.path.getsize(path) if os.path.isfile(path) else 0
+                try:
+                    content_hash = file_sha256(path)
+                    if content_hash in ingested:
+                        self.skipped.append({
+                            'file': path,
+                            'reason': 'already ingested',
+                            'well': ingested[content_hash].get('well'),
+                            'dataset': ingested[content_hash].get('dataset')
+                        })
+                    else:
+                        result = import_las_file(path, self.project_path, content_hash=content_hash)
+                        ingested[content_hash] = result
+                        self.imported.append(result)
+                except DatasetExistsError as e:
+                    self.skipped.append({'file': path, 'reason': str(e)})
+                except Exception as e:
+                    logger.exception('Import job %s failed on %s', self.id, path)
+                    self.errors.append({'file': path, 'error': str(e)})
+
+                self.processed_files += 1
+                self.processed_bytes += size
+                self.save()
+
+            if self.status == 'running':
+                self.status = 'completed'
+        except Exception as e:
+            logger.exception('Import job %s failed', self.id)
+            self.errors.append({'file': self.current_file, 'error': str(e)})
+            self.status = 'failed'
+        finally:
+            self.current_file = None
+            self.finished = time.monotonic()
+            self.save()
+            clear_cancel(JOB_KIND, self.id)
+
+    def elapsed_seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def to_dict(self) -> Dict:
+        """Job status and throughput for the API"""
+        elapsed = self.elapsed_seconds()
+        return {
+            'id': self.id,
+            'status': self.status,
+            'projectPath': self.project_path,
+            'createdAt': self.created_at.isoformat(),
+            'currentFile': self.current_file,
+            'totalFiles': len(self.paths),
+            'processedFiles': self.processed_files,
+            'totalBytes': self.total_bytes,
+            'processedBytes': self.processed_bytes,
+            'elapsedSeconds': round(elapsed, 3),
+            'filesPerSecond': round(self.processed_files / elapsed, 3) if elapsed > 0 else 0.0,
+            'mbPerSecond': round(self.processed_bytes / (1024 * 1024) / elapsed, 3) if elapsed > 0 else 0.0,
+            'imported': self.imported,
+            'skipped': self.skipped,
+            'errors': self.errors
+        }
+
+
+class ImportJobManager:
+    """Registry of batch import jobs: those of this process, and the stored
+    state of those started by other workers"""
+
+    def __init__(self, max_finished_jobs: int = 50):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.max_finished_jobs = max_finished_jobs
+
+    def start_job(self, project_path: str, paths: Optional[List[str]] = None) -> ImportJob:
+        """
+        Create and start an import job
+
+        Args:
+            project_path: Root folder of the project
+            paths: Explicit LAS file paths; defaults to every .las file in
+                the project's 02-INPUT_LAS_FOLDER
+
+        Returns:
+            The started ImportJob
+        """
+        if paths is None:
+            paths = find_las_files(os.path.join(project_path, INPUT_LAS_FOLDER))
+        job = ImportJob(project_path, paths)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.save()
+        job.start()
+        return job
+
+    def get(self, job_id: str):
+        """The ImportJob if it runs in this process, else its StoredJob (or None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        state = load_state(JOB_KIND, job_id)
+        return StoredJob(JOB_KIND, state) if state is not None else None
+
+    def list(self) -> List:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        local = {job.id for job in jobs}
+        jobs.extend(StoredJob(JOB_KIND, state) for state in list_states(JOB_KIND) if state.get('id') not in local)
+        return jobs
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond max_finished_jobs"""
+        finished = [j for j in self._jobs.values() if j.status in ('completed', 'cancelled', 'failed')]
+        finished.sort(key=lambda j: j.created_at)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job.id]
+        prune_states(JOB_KIND, self.max_finished_jobs)
+
+
+def find_las_files(folder: str) -> List[str]:
+    """List the .las files of a folder, sorted by name"""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        entry.path for entry in os.scandir(folder)
+        if entry.is_file() and entry.name.lower().endswith('.las')
+    )
+
+
+import_jobs = ImportJobManager()
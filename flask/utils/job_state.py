@@ -0,0 +1,175 @@
+"""
+Job State Module
+Status of import and batch jobs shared between server worker processes.
+
+A job runs in the worker that started it and writes a JSON snapshot of its
+status to <state folder>/<kind>/<job id>.json whenever its progress changes.
+Status, list and stream requests that reach another worker are answered
+from that snapshot, and a cancel request received by another worker leaves
+a marker file that the owning job checks between files or wells.
+
+Environment:
+    PETRO_JOB_STATE_DIR   folder for the snapshots (default
+                          petrophysics-workplace/.jobs under the working directory)
+"""
+
+import json
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+JOB_STATE_DIR = os.environ.get('PETRO_JOB_STATE_DIR',
+                               os.path.join(os.getcwd(), 'petrophysics-workplace', '.jobs'))
+FINISHED_STATUSES = ('completed', 'cancelled', 'failed', 'interrupted')
+POLL_INTERVAL = 0.5
+
+# Job ids are uuid4 hex strings; anything else is not looked up on disk
+_JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+
+def _state_path(kind: str, job_id: str, suffix: str = '.json') -> Optional[str]:
+    if not _JOB_ID.fullmatch(job_id or ''):
+        return None
+    return os.path.join(JOB_STATE_DIR, kind, job_id + suffix)
+
+
+def save_state(kind: str, job_id: str, state: Dict):
+    """Replace the job's snapshot atomically, so readers never see a partial file"""
+    path = _state_path(kind, job_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({**state, 'pid': os.getpid(), 'savedAt': time.time()}, f, default=str)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_state(kind: str, job_id: str) -> Optional[Dict]:
+    """The job's snapshot, or None if no worker has written one"""
+    path = _state_path(kind, job_id)
+    if path is None:
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_states(kind: str) -> List[Dict]:
+    """Snapshots of every stored job of a kind"""
+    folder = os.path.join(JOB_STATE_DIR, kind)
+    if not os.path.isdir(folder):
+        return []
+    states = []
+    for entry in os.scandir(folder):
+        if entry.name.endswith('.json'):
+            state = load_state(kind, entry.name[:-len('.json')])
+            if state is not None:
+                states.append(state)
+    return states
+
+
+def request_cancel(kind: str, job_id: str):
+    """Leave a cancel marker for the worker running the job"""
+    path = _state_path(kind, job_id, '.cancel')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w'):
+        pass
+
+
+def cancel_requested(kind: str, job_id: str) -> bool:
+    path = _state_path(kind, job_id, '.cancel')
+    return path is not None and os.path.exists(path)
+
+
+def clear_cancel(kind: str, job_id: str):
+    path = _state_path(kind, job_id, '.cancel')
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+def prune_states(kind: str, keep: int):
+    """Remove the snapshots of the oldest finished jobs beyond keep"""
+    finished = [s for s in list_states(kind) if s.get('status') in FINISHED_STATUSES]
+    finished.sort(key=lambda s: s.get('createdAt', ''))
+    for state in finished[:max(0, len(finished) - keep)]:
+        for suffix in ('.json', '.cancel'):
+            path = _state_path(kind, state.get('id'), suffix)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+
+def _process_alive(pid) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, TypeError, ValueError, OSError):
+        return True
+    return True
+
+
+class StoredJob:
+    """
+    Read-only view of a job running in (or finished by) another worker
+
+    Offers the parts of the ImportJob / BatchJob interface the routes use.
+    A job whose worker exited before it finished is reported as interrupted.
+    """
+
+    def __init__(self, kind: str, state: Dict):
+        self.kind = kind
+        self.id = state['id']
+        self.created_at = datetime.fromisoformat(state['createdAt'])
+        self._set(state)
+
+    def _set(self, state: Dict):
+        if state.get('status') not in FINISHED_STATUSES and not _process_alive(state.get('pid')):
+            state = {**state, 'status': 'interrupted'}
+        self.state = state
+
+    def refresh(self):
+        state = load_state(self.kind, self.id)
+        if state is not None:
+            self._set(state)
+
+    @property
+    def status(self) -> str:
+        return self.state.get('status')
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def results(self) -> List[Dict]:
+        return self.state.get('results', [])
+
+    @property
+    def errors(self) -> List[Dict]:
+        return self.state.get('errors', [])
+
+    def cancel(self):
+        request_cancel(self.kind, self.id)
+
+    def wait_for_results(self, seen: int, timeout: float = 15.0) -> List[Dict]:
+        """Poll the snapshot until results beyond index seen appear (or the job ends)"""
+        deadline = time.monotonic() + timeout
+        self.refresh()
+        while len(self.results) <= seen and not self.done and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            self.refresh()
+        return self.results[seen:]
+
+    def to_dict(self, include_results: bool = True) -> Dict:
+        data = {k: v for k, v in self.state.items() if k not in ('pid', 'savedAt')}
+        if not include_results:
+            data.pop('results', None)
+        return data
@@ -0,0 +1,253 @@
+"""
+LAS Import Helpers
+Shared well/dataset creation logic used by the single-file upload route
+and the batch import jobs
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import uuid
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional
+
+from utils.fe_data_objects import Well, Dataset, Constant, DatasetExistsError, well_lock
+from utils.log_qc import attach_qc
+
+INPUT_LAS_FOLDER = '02-INPUT_LAS_FOLDER'
+WELLS_FOLDER = '10-WELLS'
+INGEST_INDEX_FILENAME = '.las_ingest_index.json'
+
+
+class LasParseError(ValueError):
+    """A LAS file could not be read or converted into a dataset"""
+
+
+def extract_well_name(las, filename: str = '') -> str:
+    """
+    Extract the well name from a parsed LAS file
+
+    Falls back to the file name (without extension) when the WELL
+    mnemonic is missing or empty.
+    """
+    well_name = None
+
+    # Try WELL mnemonic first
+    try:
+        if hasattr(las.well, 'WELL'):
+            well_obj = las.well.WELL
+            if well_obj and well_obj.value:
+                well_name = str(well_obj.value).strip()
+    except:
+        pass
+
+    # If not found, try accessing by iteration
+    if not well_name:
+        for item in las.well:
+            if item.mnemonic.upper() == 'WELL' and item.value:
+                well_name = str(item.value).strip()
+                break
+
+    # If still not found, use original filename without extension
+    if not well_name:
+        well_name = Path(filename).stem if filename else 'UNKNOWN'
+
+    return well_name
+
+
+def extract_dataset_name(las, default: str = 'MAIN') -> str:
+    """Extract the dataset name from params.SET if available"""
+    try:
+        if hasattr(las.params, 'SET') and las.params.SET.value:
+            return str(las.params.SET.value).strip()
+    except:
+        pass
+    return default
+
+
+def create_new_well(well_name: str, bottom: float) -> Well:
+    """
+    Create a new well with its REFERENCE and WELL_HEADER datasets
+
+    Args:
+        well_name: Name of the well
+        bottom: Bottom depth used to size the REFERENCE index
+
+    Returns:
+        Well object containing the REFERENCE and WELL_HEADER datasets
+    """
+    well = Well(
+        date_created=datetime.now(),
+        well_name=well_name,
+        well_type='Dev'
+    )
+
+    # Create REFERENCE dataset
+    ref = Dataset.reference(
+        top=0,
+        bottom=bottom,
+        dataset_name='REFERENCE',
+        dataset_type='REFERENCE',
+        well_name=well_name
+    )
+
+    # Create WELL_HEADER dataset
+    wh = Dataset.well_header(
+        dataset_name='WELL_HEADER',
+        dataset_type='WELL_HEADER',
+        well_name=well_name
+    )
+    const = Constant(name='WELL_NAME', value=well.well_name, tag=well.well_name)
+    wh.constants.append(const)
+
+    well.datasets.append(ref)
+    well.datasets.append(wh)
+    return well
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 content hash of a file, reading it in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ingest_index_path(project_path: str) -> str:
+    """Path of the project's ingest index (hidden, inside 10-WELLS)"""
+    return os.path.join(project_path, WELLS_FOLDER, INGEST_INDEX_FILENAME)
+
+
+def load_ingest_index(project_path: str) -> Dict[str, Dict]:
+    """
+    Load the content-hash index of LAS files already ingested in a project
+
+    Returns:
+        Dictionary mapping SHA-256 hash to ingest details
+    """
+    index_path = ingest_index_path(project_path)
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_ingest_index(project_path: str, index: Dict[str, Dict]):
+    """Write the ingest index atomically (unique temp file, fsync, rename)"""
+    index_path = ingest_index_path(project_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f'{index_path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def record_ingested(project_path: str, content_hash: str, details: Dict):
+    """Add a single LAS content hash to the project's ingest index"""
+    index_path = ingest_index_path(project_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    # The well file lock works for any file: it serialises the read-modify-write
+    # of the index across threads and workers so no import's entry is lost
+    with well_lock(index_path, exclusive=True):
+        index = load_ingest_index(project_path)
+        index[content_hash] = details
+        save_ingest_index(project_path, index)
+
+
+def import_las_file(las_path: str, project_path: str, filename: Optional[str] = None,
+                    content_hash: Optional[str] = None) -> Dict:
+    """
+    Import one LAS file into the project's 10-WELLS folder
+
+    Appends a new dataset to an existing well, or creates the well with
+    REFERENCE and WELL_HEADER datasets. The LAS file is copied into
+    02-INPUT_LAS_FOLDER unless it already lives there.
+
+    Args:
+        las_path: Path to the LAS file on disk
+        project_path: Root folder of the project
+        filename: Original file name (used as well name fallback)
+        content_hash: Precomputed SHA-256 of the file, if available
+
+    Returns:
+        Dictionary describing the imported well and dataset
+
+    Raises:
+        LasParseError: If the file cannot be parsed
+        DatasetExistsError: If the dataset already exists in the well
+        WellLockTimeout: If another write holds the well for too long
+    """
+    import lasio
+    filename = filename or os.path.basename(las_path)
+    try:
+        # Parsed once; the dataset is built from the same LASFile
+        las = lasio.read(las_path)
+        well_name = extract_well_name(las, filename)
+        dataset_name = extract_dataset_name(las)
+        bottom = las.well.STOP.value
+        dataset = Dataset.from_lasio(
+            las,
+            dataset_name=dataset_name,
+            dataset_type='Cont',
+            well_name=well_name
+        )
+    except Exception as e:
+        raise LasParseError(f'Could not parse {filename}: {e}') from e
+    # QC runs on the freshly parsed curves so the report is stored with them
+    qc_report = attach_qc(dataset)
+
+    wells_folder = os.path.join(project_path, WELLS_FOLDER)
+    os.makedirs(wells_folder, exist_ok=True)
+    well_file_path = os.path.join(wells_folder, f'{well_name}.ptrc')
+
+    created = False
+    # The existence check and the write happen under the well's write lock,
+    # so two imports creating the same well cannot overwrite each other
+    with well_lock(well_file_path, exclusive=True):
+        if os.path.exists(well_file_path):
+            # Raises DatasetExistsError when the dataset name is already taken
+            well_type = Well.append_dataset_to_file(well_file_path, dataset)['well_type']
+        else:
+            well = create_new_well(well_name, bottom)
+            well.datasets.append(dataset)
+            well.serialize(filename=well_file_path)
+            well_type = well.well_type
+            created = True
+
+    las_folder = os.path.join(project_path, INPUT_LAS_FOLDER)
+    os.makedirs(las_folder, exist_ok=True)
+    las_destination = os.path.join(las_folder, filename)
+    if os.path.abspath(las_path) != os.path.abspath(las_destination):
+        shutil.copy2(las_path, las_destination)
+
+    content_hash = content_hash or file_sha256(las_path)
+    record_ingested(project_path, content_hash, {
+        'file': filename,
+        'well': well_name,
+        'dataset': dataset_name,
+        'imported_at': datetime.now().isoformat()
+    })
+
+    return {
+        'well': well_name,
+        'dataset': dataset_name,
+        'wellType': well_type,
+        'created': created,
+        'curves': len(dataset.well_logs),
+        'qcIssues': qc_report['issues'],
+        'filePath': well_file_path,
+        'lasFilePath': las_destination,
+        'hash': content_hash
+    }
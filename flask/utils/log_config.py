@@ -0,0 +1,112 @@
+"""
+Logging Configuration Module
+Leveled, structured logging for the Flask backend: every record carries
+the id of the request that produced it, output is plain text or JSON
+lines, and verbose per-item debug messages can be sampled.
+
+Modules log through the standard library (`logging.getLogger(__name__)`)
+with lazy %-style arguments, so disabled levels cost a single check.
+A message logged with `extra={'sample': N}` is emitted once every N
+times per call site.
+
+Environment:
+    LOG_LEVEL    DEBUG | INFO | WARNING | ERROR (default INFO in
+                 production, DEBUG otherwise)
+    LOG_FORMAT   text | json (default text)
+"""
+
+import contextvars
+import json
+import logging
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, request
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+
+request_id_var: contextvars.ContextVar = contextvars.ContextVar('request_id', default='-')
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one of every N records logged with extra={'sample': N}, per call site"""
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, 'sample', None)
+        if not every or every <= 1:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % every:
+            return False
+        record.msg = f'{record.msg} [sampled 1/{every}]'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = 'INFO', fmt: str = 'text'):
+    """Replace the root handlers with one stdout handler using the filters above"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter())
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=getattr(logging, str(level).upper(), logging.INFO), handlers=[handler], force=True)
+
+
+def init_app(app):
+    """Assign a request id to every request and echo it in the response"""
+
+    @app.before_request
+    def assign_request_id():
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex[:12]
+        g.request_id = request_id
+        g.request_id_token = request_id_var.set(request_id)
+
+    @app.after_request
+    def echo_request_id(response):
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+    @app.teardown_request
+    def clear_request_id(exc):
+        token = g.pop('request_id_token', None)
+        if token is not None:
+            try:
+                request_id_var.reset(token)
+            except ValueError:
+                # Torn down from another context (e.g. after a streamed body)
+                request_id_var.set('-')
@@ -0,0 +1,288 @@
+"""
+Log Quality Control Module
+Vectorised QC of a dataset: null fractions, depth step irregularities,
+duplicate depths, spikes (rolling median/MAD), flat-lined segments and
+out-of-range values, computed over all curves at once and stored as a
+report in Dataset.metadata
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.fe_data_objects import Well, Dataset, well_lock
+
+# Key under Dataset.metadata holding the QC report
+METADATA_KEY = 'qc'
+
+# Plausible value range per mnemonic family (normalised names)
+DEFAULT_RANGES = {
+    'GR': (0.0, 400.0),
+    'RHOB': (1.0, 3.2),
+    'RHOZ': (1.0, 3.2),
+    'NPHI': (-0.15, 1.0),
+    'TNPH': (-0.15, 1.0),
+    'RT': (0.01, 100000.0),
+    'RD': (0.01, 100000.0),
+    'ILD': (0.01, 100000.0),
+    'LLD': (0.01, 100000.0),
+    'DT': (30.0, 250.0),
+    'DTC': (30.0, 250.0),
+    'CALI': (2.0, 30.0),
+    'PEF': (0.0, 15.0),
+    'SP': (-500.0, 500.0),
+    'PHIE': (0.0, 1.0),
+    'PHIT': (0.0, 1.0),
+    'SW': (0.0, 1.0),
+    'VSH': (0.0, 1.0),
+}
+
+DEFAULT_OPTIONS = {
+    'window': 11,
+    'spike_threshold': 5.0,
+    'flat_min_samples': 10,
+    'step_tolerance': 0.01,
+    'chunk_size': 65536,
+    'chunk_bytes': 32 * 1024 * 1024,
+    'max_examples': 5,
+}
+
+# Gaussian-consistent scale of the median absolute deviation
+MAD_SCALE = 1.4826
+
+
+def _normalise(name: str) -> str:
+    return re.sub(r'[^A-Z0-9]', '', str(name).upper())
+
+
+def index_qc(index, step_tolerance: float = 0.01, max_examples: int = 5) -> Dict:
+    """Depth index checks: nulls, duplicates, reversals and irregular steps"""
+    depth = np.array([np.nan if v is None else v for v in index], dtype=float)
+    report = {'samples': int(depth.size), 'null': int(np.count_nonzero(~np.isfinite(depth)))}
+    finite = depth[np.isfinite(depth)]
+    if finite.size < 2:
+        return {**report, 'step': None, 'duplicates': 0, 'reversals': 0, 'irregularSteps': 0}
+
+    diff = np.diff(finite)
+    forward = diff[diff > 0]
+    step = float(np.median(forward)) if forward.size else 0.0
+    duplicates = diff == 0
+    reversals = diff < 0
+    irregular = (diff > 0) & (np.abs(diff - step) > step_tolerance * step)
+    where = np.flatnonzero(irregular | duplicates | reversals)[:max_examples]
+    return {
+        **report,
+        'top': float(finite[0]),
+        'bottom': float(finite[-1]),
+        'step': step,
+        'duplicates': int(np.count_nonzero(duplicates)),
+        'reversals': int(np.count_nonzero(reversals)),
+        'irregularSteps': int(np.count_nonzero(irregular)),
+        'examples': [float(finite[i]) for i in where]
+    }
+
+
+def rolling_spikes(values: np.ndarray, window: int = 11, threshold: float = 5.0,
+                   chunk_size: int = 65536, chunk_bytes: int = 32 * 1024 * 1024) -> np.ndarray:
+    """
+    Spike mask for a (curves x samples) array
+
+    A sample is a spike when it lies more than threshold scaled MADs from
+    the median of the centred window. Windows are built as strided views
+    and processed in sample chunks to bound memory: each chunk's partition
+    and deviation temporaries (curves x chunk x window floats) stay within
+    chunk_bytes, and a chunk never exceeds chunk_size samples. Windows
+    containing a missing value are not tested.
+    """
+    curves, n = values.shape
+    half = window // 2
+    window = 2 * half + 1
+    mask = np.zeros(values.shape, dtype=bool)
+    if n < window:
+        return mask
+    # Number of missing values in each centred window, from a running count
+    missing = np.zeros((curves, n + 1))
+    np.cumsum(~np.isfinite(values), axis=1, out=missing[:, 1:])
+    chunk_size = max(1, min(chunk_size, chunk_bytes // (max(curves, 1) * window * values.itemsize)))
+    for start in range(half, n - half, chunk_size):
+        stop = min(n - half, start + chunk_size)
+        windows = sliding_window_view(values[:, start - half:stop + half], window, axis=1)
+        # Odd windows: partitioning around the middle element gives the median
+        median = np.partition(windows, half, axis=2)[:, :, half]
+        deviation = np.abs(windows - median[:, :, None])
+        mad = np.partition(deviation, half, axis=2)[:, :, half] * MAD_SCALE
+        complete = (missing[:, start + half + 1:stop + half + 1] - missing[:, start - half:stop - half]) == 0
+        with np.errstate(invalid='ignore'):
+            mask[:, start:stop] = complete & (mad > 0) & (np.abs(values[:, start:stop] - median) > threshold * mad)
+    return mask
+
+
+def flat_segments(values: np.ndarray, min_samples: int = 10) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs of at least min_samples identical consecutive values
+
+    Returns:
+        (curve row, first sample, sample count) arrays, one entry per run
+    """
+    with np.errstate(invalid='ignore'):
+        equal = (values[:, 1:] == values[:, :-1])
+    padded = np.zeros((values.shape[0], equal.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = equal
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    counts = ends - starts + 1
+    keep = counts >= min_samples
+    return rows[keep], starts[keep], counts[keep]
+
+
+def qc_dataset(dataset: Dataset, options: Dict = None, ranges: Dict[str, Tuple[float, float]] = None) -> Dict:
+    """
+    QC report for a dataset
+
+    All numeric curves are stacked into one (curves x samples) array, so
+    every check is a single array operation over the whole dataset.
+
+    Args:
+        dataset: Dataset to check
+        options: Overrides of DEFAULT_OPTIONS
+        ranges: Overrides/additions to DEFAULT_RANGES
+
+    Returns:
+        Report with an 'index' section, a 'curves' section keyed by curve
+        name and a list of human readable 'issues'
+    """
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    ranges = {**DEFAULT_RANGES, **{_normalise(k): tuple(v) for k, v in (ranges or {}).items()}}
+    index = index_qc(dataset.index_log, options['step_tolerance'], options['max_examples'])
+    size = len(dataset.index_log)
+    depth = np.array([np.nan if v is None else v for v in dataset.index_log], dtype=float)
+
+    logs = [log for log in dataset.well_logs if log.log_type != 'str' and log.name != dataset.index_name]
+    values = np.full((len(logs), size), np.nan)
+    for row, log in enumerate(logs):
+        column = np.array([np.nan if v is None else v for v in log.log[:size]], dtype=float)
+        values[row, :column.size] = column
+
+    finite = np.isfinite(values)
+    null_fraction = 1.0 - finite.sum(axis=1) / size if size else np.zeros(len(logs))
+    spikes = rolling_spikes(values, options['window'], options['spike_threshold'],
+                            options['chunk_size'], options['chunk_bytes'])
+    spike_counts = spikes.sum(axis=1)
+    flat_rows, flat_starts, flat_counts = flat_segments(values, options['flat_min_samples'])
+    flat_segment_counts = np.bincount(flat_rows, minlength=len(logs))
+    flat_sample_counts = np.bincount(flat_rows, weights=flat_counts, minlength=len(logs))
+
+    low = np.array([ranges.get(_normalise(log.name), (-np.inf, np.inf))[0] for log in logs])
+    high = np.array([ranges.get(_normalise(log.name), (-np.inf, np.inf))[1] for log in logs])
+    with np.errstate(invalid='ignore'):
+        out_of_range = finite & ((values < low[:, None]) | (values > high[:, None]))
+    range_counts = out_of_range.sum(axis=1)
+
+    curves = {}
+    issues = []
+    for row, log in enumerate(logs):
+        spike_at = np.flatnonzero(spikes[row])[:options['max_examples']]
+        segments = [
+            {'top': float(depth[s]), 'samples': int(c)}
+            for s, c in zip(flat_starts[flat_rows == row][:options['max_examples']],
+                            flat_counts[flat_rows == row][:options['max_examples']])
+        ]
+        checked_range = _normalise(log.name) in ranges
+        curves[log.name] = {
+            'nullFraction': round(float(null_fraction[row]), 6),
+            'min': float(np.nanmin(values[row])) if finite[row].any() else None,
+            'max': float(np.nanmax(values[row])) if finite[row].any() else None,
+            'spikes': int(spike_counts[row]),
+            'spikeDepths': [float(depth[i]) for i in spike_at],
+            'flatSegments': int(flat_segment_counts[row]),
+            'flatSamples': int(flat_sample_counts[row]),
+            'flatExamples': segments,
+            'range': list(ranges[_normalise(log.name)]) if checked_range else None,
+            'outOfRange': int(range_counts[row])
+        }
+        if null_fraction[row] >= 1.0:
+            issues.append(f'{log.name}: no valid samples')
+        elif null_fraction[row] > 0.5:
+            issues.append(f'{log.name}: {null_fraction[row]:.0%} missing')
+        if spike_counts[row]:
+            issues.append(f'{log.name}: {int(spike_counts[row])} spikes')
+        if flat_segment_counts[row]:
+            issues.append(f'{log.name}: {int(flat_segment_counts[row])} flat-lined segments')
+        if range_counts[row]:
+            issues.append(f'{log.name}: {int(range_counts[row])} values outside {ranges[_normalise(log.name)]}')
+
+    if index.get('duplicates'):
+        issues.append(f"{index['duplicates']} duplicate depths")
+    if index.get('reversals'):
+        issues.append(f"{index['reversals']} depth reversals")
+    if index.get('irregularSteps'):
+        issues.append(f"{index['irregularSteps']} irregular depth steps")
+    if index.get('null'):
+        issues.append(f"{index['null']} missing depths")
+
+    return {
+        'checkedAt': datetime.now().isoformat(),
+        'options': options,
+        'index': index,
+        'curves': curves,
+        'issues': issues
+    }
+
+
+def attach_qc(dataset: Dataset, options: Dict = None, ranges: Dict = None) -> Dict:
+    """Run QC on an in-memory dataset and store the report in its metadata"""
+    report = qc_dataset(dataset, options, ranges)
+    dataset.metadata[METADATA_KEY] = report
+    return report
+
+
+def qc_well(well_file: str, dataset_names: Optional[List[str]] = None, options: Dict = None,
+            ranges: Dict = None) -> Dict[str, Dict]:
+    """
+    QC every log dataset of a well and store the reports
+
+    Each dataset segment is read once, checked and written back with its
+    report. REFERENCE and WELL_HEADER datasets are skipped unless named.
+
+    Returns:
+        Dataset name to {'issues': [...]} (or {'error': message})
+    """
+    if dataset_names is None:
+        manifest = Well.read_manifest(well_file)
+        if manifest is not None:
+            dataset_names = [seg['name'] for seg in manifest['segments']
+                             if seg.get('type') not in ('REFERENCE', 'WELL_HEADER')]
+        else:
+            dataset_names = [ds.name for ds in Well.deserialize(filepath=well_file).datasets
+                             if ds.type not in ('REFERENCE', 'WELL_HEADER')]
+    results = {}
+    for name in dataset_names:
+        try:
+            # Locked from read to write-back so concurrent changes to the dataset are not lost
+            with well_lock(well_file, exclusive=True):
+                dataset = Well.load_dataset_from_file(well_file, name)
+                report = attach_qc(dataset, options, ranges)
+                Well.replace_dataset_in_file(well_file, dataset)
+            results[name] = {'issues': report['issues']}
+        except Exception as e:
+            results[name] = {'error': str(e)}
+    return results
+
+
+def qc_wells(well_files: List[str], max_workers: int = 4, **kwargs) -> Dict[str, Dict]:
+    """QC several wells concurrently"""
+    def run(well_file):
+        well_name = os.path.splitext(os.path.basename(well_file))[0]
+        try:
+            return well_name, qc_well(well_file, **kwargs)
+        except Exception as e:
+            return well_name, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(run, well_files))
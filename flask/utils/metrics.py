@@ -0,0 +1,169 @@
+"""
+Request Metrics Module
+Per-route latency, phase timing and response size histograms for the API,
+rendered in the Prometheus text exposition format by the /metrics endpoint.
+
+Every /api request is timed by middleware; routes and plot managers mark
+their own phases (validate, deserialize, search, render, encode) with the
+`phase` context manager or the `timed` decorator. Phase durations are also
+returned to clients in a Server-Timing header.
+
+Metrics live in process memory, so under gunicorn each worker reports its
+own series.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterable, List, Tuple
+
+from flask import g, has_request_context, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Thread-safe cumulative histogram keyed by label values"""
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {labels: (list(s[0]), s[1], s[2]) for labels, s in self._series.items()}
+        for labels, (counts, total, count) in sorted(snapshot.items()):
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f'{self.name}_bucket{{{label_text + "," if label_text else ""}{le}}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {count}')
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+REQUEST_SECONDS = Histogram(
+    'petro_http_request_duration_seconds', 'API request latency by route',
+    ('method', 'route', 'status'), LATENCY_BUCKETS)
+PHASE_SECONDS = Histogram(
+    'petro_http_request_phase_seconds', 'Time spent in a request phase by route',
+    ('route', 'phase'), LATENCY_BUCKETS)
+RESPONSE_BYTES = Histogram(
+    'petro_http_response_size_bytes', 'API response body size by route',
+    ('route',), SIZE_BUCKETS)
+
+HISTOGRAMS = (REQUEST_SECONDS, PHASE_SECONDS, RESPONSE_BYTES)
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def _route() -> str:
+    return request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block as a phase of the current request (no-op outside requests)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context() and 'metrics_started' in g:
+            elapsed = time.perf_counter() - started
+            g.metrics_phases.append((name, elapsed))
+            PHASE_SECONDS.observe(elapsed, _route(), name)
+
+
+def timed(name: str):
+    """Decorator form of `phase`"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.append('# HELP petro_http_requests_in_flight API requests currently being served')
+    lines.append('# TYPE petro_http_requests_in_flight gauge')
+    lines.append(f'petro_http_requests_in_flight {_in_flight}')
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app, prefix: str = '/api'):
+    """Register the timing middleware for requests under prefix"""
+    @app.before_request
+    def start_request_timer():
+        global _in_flight
+        if not request.path.startswith(prefix):
+            return
+        g.metrics_started = time.perf_counter()
+        g.metrics_phases = []
+        with _in_flight_lock:
+            _in_flight += 1
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_started' not in g:
+            return response
+        elapsed = time.perf_counter() - g.metrics_started
+        route = _route()
+        REQUEST_SECONDS.observe(elapsed, request.method, route, str(response.status_code))
+        # Streamed bodies have no length up front and are not measured
+        if response.content_length is not None:
+            RESPONSE_BYTES.observe(response.content_length, route)
+        timings = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in g.metrics_phases]
+        timings.append(f'total;dur={elapsed * 1000:.1f}')
+        response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    @app.teardown_request
+    def finish_request(exc):
+        global _in_flight
+        if g.pop('metrics_started', None) is not None:
+            with _in_flight_lock:
+                _in_flight -= 1
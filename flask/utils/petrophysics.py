@@ -0,0 +1,366 @@
+"""
+Petrophysics Module
+Vectorised petrophysical equations (shale volume, porosity, water
+saturation, permeability) evaluated over whole datasets, with parameters
+taken from WELL_HEADER constants and results stored as computed datasets
+"""
+
+import os
+import re
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.fe_data_objects import Well, Dataset, WellLog, Constant, well_lock
+from utils.expressions import curve_fingerprint
+
+COMPUTED_DATASET = 'PETRO'
+VOL_MODELS_FOLDER = '08-VOL_MODELS'
+# Key under Dataset.metadata describing how the dataset was computed
+PROVENANCE_KEY = 'provenance'
+
+# Mnemonics accepted for each input curve, in order of preference
+INPUT_MNEMONICS = {
+    'GR': ['GR', 'SGR', 'CGR', 'GRC', 'GAMMA'],
+    'RHOB': ['RHOB', 'RHOZ', 'DEN', 'ZDEN', 'RHO'],
+    'NPHI': ['NPHI', 'TNPH', 'NPOR', 'CNPOR', 'NEU'],
+    'RT': ['RT', 'RD', 'ILD', 'LLD', 'AT90', 'RDEP', 'RES'],
+}
+
+# Parameters read from WELL_HEADER constants (normalised names) unless
+# overridden by the caller; GR_CLEAN/GR_SHALE default to GR percentiles
+DEFAULT_PARAMETERS = {
+    'GR_CLEAN': None,
+    'GR_SHALE': None,
+    'RHOMA': 2.65,
+    'RHOF': 1.0,
+    'RHOSH': 2.45,
+    'RW': 0.05,
+    'RSH': 2.0,
+    'A': 1.0,
+    'M': 2.0,
+    'N': 2.0,
+    'VSH_METHOD': 'linear',
+    'SW_METHOD': 'archie',
+    'PERM_METHOD': 'timur',
+}
+
+
+def vshale(gr, gr_clean: float, gr_shale: float, method: str = 'linear') -> np.ndarray:
+    """
+    Shale volume from gamma ray
+
+    Args:
+        gr: Gamma ray values
+        gr_clean: Clean sand gamma ray
+        gr_shale: Shale gamma ray
+        method: 'linear', 'larionov_tertiary', 'larionov_older' or 'clavier'
+    """
+    igr = np.clip((np.asarray(gr, dtype=float) - gr_clean) / (gr_shale - gr_clean), 0.0, 1.0)
+    method = method.lower()
+    if method == 'linear':
+        return igr
+    if method == 'larionov_tertiary':
+        return 0.083 * (2.0 ** (3.7 * igr) - 1.0)
+    if method == 'larionov_older':
+        return 0.33 * (2.0 ** (2.0 * igr) - 1.0)
+    if method == 'clavier':
+        return np.clip(1.7 - np.sqrt(np.clip(3.38 - (igr + 0.7) ** 2, 0.0, None)), 0.0, 1.0)
+    raise ValueError(f"Unknown Vsh method '{method}'. Use linear, larionov_tertiary, larionov_older or clavier")
+
+
+def density_porosity(rhob, rhoma: float, rhof: float) -> np.ndarray:
+    """Porosity from bulk density"""
+    return (rhoma - np.asarray(rhob, dtype=float)) / (rhoma - rhof)
+
+
+def neutron_density_porosity(phid, nphi) -> np.ndarray:
+    """Root mean square combination of density and neutron porosity"""
+    phid = np.asarray(phid, dtype=float)
+    nphi = np.asarray(nphi, dtype=float)
+    return np.sqrt((phid ** 2 + nphi ** 2) / 2.0)
+
+
+def effective_porosity(phit, vsh, phit_shale: float = 0.0) -> np.ndarray:
+    """Total porosity corrected for the shale porosity fraction"""
+    return np.clip(np.asarray(phit, dtype=float) - np.asarray(vsh, dtype=float) * phit_shale, 0.0, None)
+
+
+def archie_sw(rt, phie, rw: float, a: float = 1.0, m: float = 2.0, n: float = 2.0) -> np.ndarray:
+    """Archie water saturation"""
+    rt = np.asarray(rt, dtype=float)
+    phie = np.asarray(phie, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.clip((a * rw / (phie ** m * rt)) ** (1.0 / n), 0.0, 1.0)
+
+
+def simandoux_sw(rt, phie, vsh, rw: float, rsh: float, a: float = 1.0, m: float = 2.0) -> np.ndarray:
+    """Simandoux water saturation (saturation exponent 2)"""
+    rt = np.asarray(rt, dtype=float)
+    phie = np.asarray(phie, dtype=float)
+    vsh = np.asarray(vsh, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c = a * rw / (2.0 * phie ** m)
+        shale = vsh / rsh
+        sw = c * (np.sqrt(shale ** 2 + 4.0 * phie ** m / (a * rw * rt)) - shale)
+    return np.clip(sw, 0.0, 1.0)
+
+
+def permeability(phie, swirr, method: str = 'timur') -> np.ndarray:
+    """
+    Permeability (mD) from effective porosity and irreducible saturation
+
+    Args:
+        method: 'timur' or 'coates'
+    """
+    phie = np.asarray(phie, dtype=float)
+    swirr = np.asarray(swirr, dtype=float)
+    method = method.lower()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'timur':
+            k = 0.136 * (100.0 * phie) ** 4.4 / (100.0 * swirr) ** 2
+        elif method == 'coates':
+            k = (100.0 * phie ** 2 * (1.0 - swirr) / swirr) ** 2
+        else:
+            raise ValueError(f"Unknown permeability method '{method}'. Use timur or coates")
+    return np.where(np.isfinite(k), k, np.nan)
+
+
+def _normalise(name: str) -> str:
+    # 'GR Clean', 'gr-clean' and 'GR_CLEAN' all map to GR_CLEAN
+    return re.sub(r'[^A-Z0-9]+', '_', str(name).upper()).strip('_')
+
+
+def header_parameters(header: Optional[Dataset]) -> Dict:
+    """Known parameters found in WELL_HEADER constants"""
+    if header is None:
+        return {}
+    found = {}
+    for const in header.constants:
+        name = _normalise(const.name)
+        if name in DEFAULT_PARAMETERS and const.value not in (None, ''):
+            found[name] = const.value
+    return found
+
+
+def resolve_parameters(header: Optional[Dataset] = None, overrides: Dict = None) -> Dict:
+    """Defaults, then WELL_HEADER constants, then caller overrides"""
+    params = dict(DEFAULT_PARAMETERS)
+    params.update(header_parameters(header))
+    params.update({_normalise(k): v for k, v in (overrides or {}).items() if v is not None})
+    for name, value in params.items():
+        if name.endswith('_METHOD') or value is None:
+            continue
+        try:
+            params[name] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter {name} must be numeric, got '{value}'")
+    return params
+
+
+def input_curves(dataset: Dataset, curves: Dict[str, str] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    """Input curve arrays found in a dataset, keyed by GR/RHOB/NPHI/RT, and the log names used"""
+    curves = {_normalise(k): v for k, v in (curves or {}).items()}
+    logs = {_normalise(log.name): log for log in dataset.well_logs if log.log_type != 'str'}
+    found, names = {}, {}
+    for key, mnemonics in INPUT_MNEMONICS.items():
+        candidates = [_normalise(curves[key])] if curves.get(key) else mnemonics
+        for candidate in candidates:
+            if candidate in logs:
+                found[key] = np.array([np.nan if v is None else v for v in logs[candidate].log], dtype=float)
+                names[key] = logs[candidate].name
+                break
+    return found, names
+
+
+def compute_arrays(inputs: Dict[str, np.ndarray], params: Dict) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Evaluate the petrophysical chain over whole arrays
+
+    Curves whose inputs are missing are skipped: VSH needs GR, porosity
+    needs RHOB (and NPHI for the neutron-density combination), SW and
+    PERM need RT and porosity.
+
+    Returns:
+        (computed curves, parameters actually used)
+    """
+    params = dict(params)
+    out = {}
+    vsh = None
+    if 'GR' in inputs:
+        gr = inputs['GR']
+        if params['GR_CLEAN'] is None:
+            params['GR_CLEAN'] = float(np.nanpercentile(gr, 5))
+        if params['GR_SHALE'] is None:
+            params['GR_SHALE'] = float(np.nanpercentile(gr, 95))
+        vsh = out['VSH'] = vshale(gr, params['GR_CLEAN'], params['GR_SHALE'], params['VSH_METHOD'])
+
+    phie = None
+    if 'RHOB' in inputs:
+        phid = out['PHID'] = np.clip(density_porosity(inputs['RHOB'], params['RHOMA'], params['RHOF']), 0.0, 1.0)
+        phit = phid
+        if 'NPHI' in inputs:
+            phit = out['PHIT'] = np.clip(neutron_density_porosity(phid, inputs['NPHI']), 0.0, 1.0)
+        if vsh is not None:
+            phit_shale = float(np.clip(density_porosity(params['RHOSH'], params['RHOMA'], params['RHOF']), 0.0, 1.0))
+            phie = out['PHIE'] = effective_porosity(phit, vsh, phit_shale)
+        else:
+            phie = out['PHIE'] = phit
+
+    if 'RT' in inputs and phie is not None:
+        method = params['SW_METHOD'].lower()
+        if method == 'archie':
+            sw = archie_sw(inputs['RT'], phie, params['RW'], params['A'], params['M'], params['N'])
+        elif method == 'simandoux':
+            if vsh is None:
+                raise ValueError('Simandoux saturation needs a Vsh curve (GR)')
+            sw = simandoux_sw(inputs['RT'], phie, vsh, params['RW'], params['RSH'], params['A'], params['M'])
+        else:
+            raise ValueError(f"Unknown Sw method '{params['SW_METHOD']}'. Use archie or simandoux")
+        out['SW'] = sw
+        out['BVW'] = phie * sw
+        out['PERM'] = permeability(phie, sw, params['PERM_METHOD'])
+
+    return out, params
+
+
+def compute_dataset(dataset: Dataset, header: Optional[Dataset] = None, parameters: Dict = None,
+                    curves: Dict[str, str] = None, output_name: str = COMPUTED_DATASET) -> Dataset:
+    """
+    Compute petrophysical curves for one dataset
+
+    Args:
+        dataset: Dataset holding the input logs
+        header: WELL_HEADER dataset providing parameters (optional)
+        parameters: Parameter overrides
+        curves: Input curve name overrides, e.g. {'GR': 'GR_EDTC'}
+        output_name: Name of the computed dataset
+
+    Returns:
+        New Dataset on the input index, with the used parameters as constants
+
+    Raises:
+        ValueError: If no curve can be computed or a parameter is invalid
+    """
+    inputs, input_names = input_curves(dataset, curves)
+    computed, used = compute_arrays(inputs, resolve_parameters(header, parameters))
+    if not computed:
+        raise ValueError(f"Dataset '{dataset.name}' has none of the GR, RHOB or RT input curves")
+
+    now = datetime.now()
+    well_logs = [
+        WellLog(
+            name=name,
+            date=now.isoformat(),
+            description=f'Computed from {dataset.name}',
+            interpolation='CONTINUOUS',
+            log_type='float',
+            log=[None if not np.isfinite(v) else float(v) for v in values],
+            dtst=output_name
+        )
+        for name, values in computed.items()
+    ]
+    return Dataset(
+        date_created=now,
+        name=output_name,
+        type='Computed',
+        wellname=dataset.wellname,
+        constants=[Constant(name=k, value=v, tag='PARAMETER') for k, v in used.items()],
+        index_log=list(dataset.index_log),
+        index_name=dataset.index_name,
+        well_logs=well_logs,
+        metadata={
+            'source': 'Computed with petrophysics engine',
+            'input_dataset': dataset.name,
+            'inputs': input_names,
+            'parameters': used,
+            PROVENANCE_KEY: {
+                'operation': 'petrophysics',
+                'inputs': [
+                    {'dataset': dataset.name, 'curve': input_names[key], 'fingerprint': curve_fingerprint(values)}
+                    for key, values in inputs.items()
+                ],
+                'header': header_parameters(header),
+                'overrides': dict(parameters or {}),
+                'curves': dict(curves or {})
+            }
+        }
+    )
+
+
+def compute_well(well_file: str, dataset_name: str = 'MAIN', parameters: Dict = None,
+                 curves: Dict[str, str] = None, output_name: str = COMPUTED_DATASET) -> Dict:
+    """Compute one well and store the result in its file (replacing an older run)"""
+    # Locked from read to write so a concurrent write of the output dataset is not lost
+    with well_lock(well_file, exclusive=True):
+        dataset = Well.load_dataset_from_file(well_file, dataset_name)
+        try:
+            header = Well.load_dataset_from_file(well_file, 'WELL_HEADER')
+        except ValueError:
+            header = None
+        result = compute_dataset(dataset, header, parameters, curves, output_name)
+        Well.replace_dataset_in_file(well_file, result)
+    return {
+        'dataset': result.name,
+        'curves': [log.name for log in result.well_logs],
+        'samples': len(result.index_log)
+    }
+
+
+def compute_wells(well_files: List[str], max_workers: int = 4, **kwargs) -> Dict[str, Dict]:
+    """
+    Compute several wells concurrently (NumPy releases the GIL in the array work)
+
+    Returns:
+        Well name to the compute_well result or {'error': message}
+    """
+    def run(well_file):
+        well_name = os.path.splitext(os.path.basename(well_file))[0]
+        try:
+            return well_name, compute_well(well_file, **kwargs)
+        except Exception as e:
+            return well_name, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(run, well_files))
+
+
+def load_vol_model(project_path: str, model_name: str) -> Dict:
+    """
+    Load saved parameters from 08-VOL_MODELS/<model_name>.json
+
+    Raises:
+        ValueError: If the model file does not exist or is not a JSON object
+    """
+    model_path = os.path.join(project_path, VOL_MODELS_FOLDER, f'{model_name}.json')
+    if not os.path.exists(model_path):
+        raise ValueError(f"Volume model '{model_name}' not found")
+    with open(model_path, 'r') as f:
+        model = json.load(f)
+    if not isinstance(model, dict):
+        raise ValueError(f"Volume model '{model_name}' must be a JSON object of parameters")
+    return model
+
+
+def save_vol_model(project_path: str, model_name: str, parameters: Dict) -> str:
+    """Save parameters to 08-VOL_MODELS/<model_name>.json and return the path"""
+    folder = os.path.join(project_path, VOL_MODELS_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    model_path = os.path.join(folder, f'{model_name}.json')
+    # A unique temp name per save, so concurrent saves of one model cannot
+    # write into each other's temp file
+    tmp_path = f'{model_path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(parameters, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, model_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return model_path
@@ -0,0 +1,294 @@
+"""
+Request Profiling Module
+Opt-in profiling of slow API requests for production diagnostics.
+
+When enabled (PETRO_PROFILE=1) a background sampler records the Python
+stack of every thread serving an /api request at a fixed interval. Requests
+slower than the threshold have their samples written as a report; faster
+requests are discarded at no cost beyond the sampling. A request carrying
+the `X-Profile: 1` header is instead profiled deterministically with
+cProfile and always saved.
+
+Reports go to `<project>/01-OUTPUT/diagnostics` when the request names a
+project or well inside the workspace, otherwise to the server diagnostics
+folder. Each report has a .json file with the route, parameters, timing and
+well size, plus either a .prof (cProfile, open with pstats/snakeviz) and a
+.txt summary, or a .folded stack file (flame graph input) and a .txt summary.
+
+Environment:
+    PETRO_PROFILE               1 to enable
+    PETRO_PROFILE_SLOW_MS       slow request threshold (default 2000)
+    PETRO_PROFILE_INTERVAL_MS   sampling interval (default 5)
+    PETRO_PROFILE_DIR           server diagnostics folder
+    PETRO_PROFILE_KEEP          reports kept per folder (default 200)
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from flask import g, request
+
+PROFILE_HEADER = 'X-Profile'
+OUTPUT_FOLDER = '01-OUTPUT'
+DIAGNOSTICS_FOLDER = 'diagnostics'
+MAX_STACK_DEPTH = 64
+
+
+class StackSampler:
+    """Samples the stacks of registered threads from a daemon thread"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._targets: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+            self._thread.start()
+
+    def register(self, ident: int) -> Counter:
+        samples = Counter()
+        with self._lock:
+            self._targets[ident] = samples
+            self._ensure_started()
+        return samples
+
+    def unregister(self, ident: int):
+        with self._lock:
+            self._targets.pop(ident, None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._targets:
+                    continue
+                frames = sys._current_frames()
+                for ident, samples in self._targets.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[_stack(frame)] += 1
+
+
+def _stack(frame) -> tuple:
+    """Root-first tuple of 'function (file:line)' entries"""
+    entries = []
+    while frame is not None and len(entries) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        entries.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+        frame = frame.f_back
+    return tuple(reversed(entries))
+
+
+def _sample_summary(samples: Counter, interval: float, top: int = 40) -> str:
+    """Top functions by own and inclusive sample time"""
+    own, inclusive = Counter(), Counter()
+    for stack, count in samples.items():
+        own[stack[-1]] += count
+        for entry in set(stack):
+            inclusive[entry] += count
+    total = sum(samples.values()) or 1
+    lines = [f'{total} samples at {interval * 1000:.1f} ms', '', 'Own time:']
+    lines += [f'{count * interval * 1000:10.1f} ms {100 * count / total:5.1f}%  {entry}' for entry, count in own.most_common(top)]
+    lines += ['', 'Inclusive time:']
+    lines += [f'{count * interval * 1000:10.1f} ms {100 * count / total:5.1f}%  {entry}' for entry, count in inclusive.most_common(top)]
+    return '\n'.join(lines) + '\n'
+
+
+def _summarise_value(value, limit: int = 200):
+    """Request parameters with large payloads reduced to a description"""
+    if isinstance(value, str):
+        return value if len(value) <= limit else f'{value[:limit]}... ({len(value)} chars)'
+    if isinstance(value, list):
+        if len(value) > 20:
+            return f'<list of {len(value)} items>'
+        return [_summarise_value(v, limit) for v in value]
+    if isinstance(value, dict):
+        return {k: _summarise_value(v, limit) for k, v in value.items()}
+    return value
+
+
+def _request_parameters() -> Dict:
+    params = {'args': _summarise_value(request.args.to_dict()), 'view_args': request.view_args or {}}
+    if request.is_json:
+        params['json'] = _summarise_value(request.get_json(silent=True))
+    if request.files:
+        params['files'] = [f.filename for f in request.files.values()]
+    return params
+
+
+def _sources(params: Dict) -> Dict:
+    """Query string and JSON body parameters merged"""
+    body = params.get('json')
+    return {**params.get('args', {}), **(body if isinstance(body, dict) else {})}
+
+
+def _well_file(params: Dict) -> Optional[str]:
+    """Well file named by the request, if any"""
+    sources = _sources(params)
+    for key in ('wellPath', 'filePath'):
+        path = sources.get(key)
+        if isinstance(path, str) and path.endswith('.ptrc'):
+            return os.path.abspath(path)
+    project = sources.get('projectPath')
+    well = (params.get('view_args') or {}).get('well_id') or sources.get('wellName')
+    if isinstance(project, str) and well:
+        return os.path.join(os.path.abspath(project), '10-WELLS', f'{well}.ptrc')
+    return None
+
+
+def _well_size(well_file: Optional[str]) -> Optional[Dict]:
+    if not well_file or not os.path.isfile(well_file):
+        return None
+    size = os.path.getsize(well_file)
+    head, tail = os.path.split(well_file)
+    segment_folder = os.path.join(head, f'.{tail}.d')
+    segments = 0
+    if os.path.isdir(segment_folder):
+        for entry in os.scandir(segment_folder):
+            if entry.is_file():
+                size += entry.stat().st_size
+                segments += 1
+    return {'file': well_file, 'bytes': size, 'segments': segments}
+
+
+def _within(path: str, root: str) -> bool:
+    path, root = os.path.normpath(os.path.realpath(path)), os.path.normpath(os.path.realpath(root))
+    return path == root or path.startswith(root + os.sep)
+
+
+def _report_folder(params: Dict, well_file: Optional[str], workspace_root: str, server_folder: str) -> str:
+    project = None
+    project_path = _sources(params).get('projectPath')
+    if isinstance(project_path, str):
+        project = os.path.abspath(project_path)
+    elif well_file:
+        project = os.path.dirname(os.path.dirname(well_file))
+    if project and os.path.isdir(project) and _within(project, workspace_root):
+        return os.path.join(project, OUTPUT_FOLDER, DIAGNOSTICS_FOLDER)
+    return server_folder
+
+
+def _prune(folder: str, keep: int):
+    reports = sorted(
+        (entry for entry in os.scandir(folder) if entry.name.endswith('.json')),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in reports[:max(0, len(reports) - keep)]:
+        stem = entry.path[:-len('.json')]
+        for suffix in ('.json', '.prof', '.txt', '.folded'):
+            try:
+                os.remove(stem + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def init_app(app, workspace_root: str, prefix: str = '/api'):
+    """Register the profiling hooks when PETRO_PROFILE=1"""
+    if os.environ.get('PETRO_PROFILE') != '1':
+        return
+    threshold = float(os.environ.get('PETRO_PROFILE_SLOW_MS', 2000)) / 1000.0
+    sampler = StackSampler(float(os.environ.get('PETRO_PROFILE_INTERVAL_MS', 5)) / 1000.0)
+    server_folder = os.environ.get('PETRO_PROFILE_DIR', os.path.join(workspace_root, '.diagnostics'))
+    keep = int(os.environ.get('PETRO_PROFILE_KEEP', 200))
+    app.logger.info(f'Request profiling enabled: slow threshold {threshold * 1000:.0f} ms, reports in {server_folder}')
+
+    @app.before_request
+    def start_profiling():
+        if not request.path.startswith(prefix):
+            return
+        g.profile_started = time.perf_counter()
+        if request.headers.get(PROFILE_HEADER) == '1':
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                g.profiler = profiler
+                return
+            except ValueError:
+                # Another request holds the interpreter-wide profiler; sample instead
+                pass
+        g.profile_samples = sampler.register(threading.get_ident())
+
+    @app.after_request
+    def save_profile(response):
+        if 'profile_started' not in g:
+            return response
+        elapsed = time.perf_counter() - g.profile_started
+        profiler = g.pop('profiler', None)
+        samples = g.pop('profile_samples', None)
+        if profiler is not None:
+            profiler.disable()
+        else:
+            sampler.unregister(threading.get_ident())
+            forced = request.headers.get(PROFILE_HEADER) == '1'
+            if (elapsed < threshold and not forced) or not samples:
+                return response
+        try:
+            path = _write_report(response, elapsed, profiler, samples)
+            response.headers['X-Profile-Report'] = os.path.basename(path)
+        except Exception as e:
+            app.logger.warning(f'Could not save request profile: {e}')
+        return response
+
+    @app.teardown_request
+    def stop_profiling(exc):
+        # Covers requests that raised before after_request ran
+        if g.pop('profile_started', None) is None:
+            return
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+        if g.pop('profile_samples', None) is not None:
+            sampler.unregister(threading.get_ident())
+
+    def _write_report(response, elapsed, profiler, samples) -> str:
+        params = _request_parameters()
+        well_file = _well_file(params)
+        folder = _report_folder(params, well_file, workspace_root, server_folder)
+        os.makedirs(folder, exist_ok=True)
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        slug = ''.join(c if c.isalnum() else '_' for c in route.replace(prefix, '', 1)).strip('_')
+        stem = os.path.join(folder, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{slug}_{uuid.uuid4().hex[:6]}")
+
+        if profiler is not None:
+            profiler.dump_stats(stem + '.prof')
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(40)
+            with open(stem + '.txt', 'w') as file:
+                file.write(text.getvalue())
+        else:
+            with open(stem + '.folded', 'w') as file:
+                for stack, count in samples.most_common():
+                    file.write(f"{';'.join(stack)} {count}\n")
+            with open(stem + '.txt', 'w') as file:
+                file.write(_sample_summary(samples, sampler.interval))
+
+        metadata = {
+            'route': route,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'elapsedSeconds': round(elapsed, 4),
+            'trigger': 'header' if request.headers.get(PROFILE_HEADER) == '1' else 'slow',
+            'profiler': 'cProfile' if profiler is not None else 'sampling',
+            'recordedAt': datetime.now().isoformat(),
+            'parameters': params,
+            'well': _well_size(well_file),
+            'responseBytes': response.content_length,
+        }
+        with open(stem + '.json', 'w') as file:
+            json.dump(metadata, file, indent=2, default=str)
+        _prune(folder, keep)
+        return stem + '.json'
@@ -0,0 +1,245 @@
+"""
+Provenance Module
+Dependency graph between computed curves and their inputs, built from the
+records kept in Dataset.metadata by the petrophysics engine and expression
+curves, and an incremental scheduler that recomputes only stale curves in
+topological order, in parallel across wells
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from utils.fe_data_objects import Well, Dataset, well_lock
+from utils.expressions import METADATA_KEY as EXPRESSIONS_KEY, curve_fingerprint, evaluate_curve, resolve_scalars
+from utils.petrophysics import PROVENANCE_KEY, compute_dataset, header_parameters
+
+HEADER_DATASET = 'WELL_HEADER'
+
+
+@dataclass
+class Job:
+    """One recomputable unit: an expression curve or a whole computed dataset"""
+    operation: str
+    dataset: str
+    outputs: List[str]
+    inputs: List[Tuple[str, str]]
+    fingerprints: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    spec: Dict = field(default_factory=dict)
+
+    @property
+    def id(self) -> str:
+        if self.operation == 'expression':
+            return f'{self.dataset}.{self.outputs[0]}'
+        return f'{self.dataset}.*'
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'operation': self.operation,
+            'dataset': self.dataset,
+            'outputs': self.outputs,
+            'inputs': [f'{ds}.{curve}' for ds, curve in self.inputs]
+        }
+
+
+def collect_jobs(datasets: Dict[str, Dataset]) -> List[Job]:
+    """Jobs described by the provenance records of a well's datasets"""
+    jobs = []
+    for ds in datasets.values():
+        record = ds.metadata.get(PROVENANCE_KEY)
+        if record and record.get('operation') == 'petrophysics':
+            inputs = [(item['dataset'], item['curve']) for item in record['inputs']]
+            jobs.append(Job(
+                operation='petrophysics',
+                dataset=ds.name,
+                outputs=[log.name for log in ds.well_logs if log.name not in ds.metadata.get(EXPRESSIONS_KEY, {})],
+                inputs=inputs,
+                fingerprints={(item['dataset'], item['curve']): item['fingerprint'] for item in record['inputs']},
+                spec=record
+            ))
+        for name, definition in ds.metadata.get(EXPRESSIONS_KEY, {}).items():
+            jobs.append(Job(
+                operation='expression',
+                dataset=ds.name,
+                outputs=[name],
+                inputs=[(ds.name, curve) for curve in definition['inputs']],
+                fingerprints={(ds.name, curve): fp for curve, fp in definition['inputs'].items()},
+                spec=definition
+            ))
+    return jobs
+
+
+def topological_order(jobs: List[Job]) -> List[Job]:
+    """
+    Order jobs so every job runs after the jobs producing its inputs
+
+    Raises:
+        ValueError: If the dependencies form a cycle
+    """
+    producers = {}
+    for job in jobs:
+        for curve in job.outputs:
+            producers[(job.dataset, curve)] = job.id
+    by_id = {job.id: job for job in jobs}
+    dependants: Dict[str, List[str]] = {job.id: [] for job in jobs}
+    pending = {job.id: 0 for job in jobs}
+    for job in jobs:
+        for upstream in {producers[i] for i in job.inputs if i in producers and producers[i] != job.id}:
+            dependants[upstream].append(job.id)
+            pending[job.id] += 1
+
+    ready = deque(job.id for job in jobs if pending[job.id] == 0)
+    order = []
+    while ready:
+        job_id = ready.popleft()
+        order.append(by_id[job_id])
+        for dependant in dependants[job_id]:
+            pending[dependant] -= 1
+            if pending[dependant] == 0:
+                ready.append(dependant)
+    if len(order) != len(jobs):
+        cyclic = sorted(job_id for job_id, count in pending.items() if count > 0)
+        raise ValueError(f"Circular curve dependencies: {', '.join(cyclic)}")
+    return order
+
+
+def _current_fingerprint(datasets: Dict[str, Dataset], dataset_name: str, curve: str) -> Optional[str]:
+    ds = datasets.get(dataset_name)
+    if ds is None:
+        return None
+    for log in ds.well_logs:
+        if log.name == curve:
+            size = len(ds.index_log)
+            values = np.array([np.nan if v is None else v for v in log.log], dtype=float)
+            if values.size < size:
+                values = np.concatenate((values, np.full(size - values.size, np.nan)))
+            return curve_fingerprint(values[:size] if size else values)
+    return None
+
+
+def stale_reason(job: Job, datasets: Dict[str, Dataset], dirty: Set[Tuple[str, str]] = frozenset()) -> Optional[str]:
+    """Why a job must be recomputed, or None when it is up to date"""
+    for key in job.inputs:
+        if key in dirty:
+            return f'upstream {key[0]}.{key[1]} recomputed'
+        current = _current_fingerprint(datasets, *key)
+        if current is None:
+            return f'input {key[0]}.{key[1]} missing'
+        if current != job.fingerprints.get(key):
+            return f'input {key[0]}.{key[1]} changed'
+
+    header = datasets.get(HEADER_DATASET)
+    if job.operation == 'petrophysics':
+        if header_parameters(header) != job.spec.get('header', {}):
+            return 'WELL_HEADER parameters changed'
+    else:
+        scalars = resolve_scalars(datasets[job.dataset], job.spec.get('overrides'),
+                                  header.constants if header else None)
+        for name, value in job.spec.get('parameters', {}).items():
+            if scalars.get(name) != value:
+                return f'parameter {name} changed'
+    return None
+
+
+def run_job(job: Job, datasets: Dict[str, Dataset]):
+    """Recompute a job in place in the datasets dictionary"""
+    header = datasets.get(HEADER_DATASET)
+    if job.operation == 'expression':
+        evaluate_curve(
+            datasets[job.dataset],
+            f"{job.outputs[0]} = {job.spec['expression']}",
+            parameters=job.spec.get('overrides'),
+            header_constants=header.constants if header else None
+        )
+        return
+
+    old = datasets[job.dataset]
+    input_dataset = job.spec['inputs'][0]['dataset'] if job.spec.get('inputs') else old.metadata.get('input_dataset')
+    if input_dataset not in datasets:
+        raise ValueError(f"Input dataset '{input_dataset}' of {job.dataset} no longer exists")
+    new = compute_dataset(datasets[input_dataset], header, job.spec.get('overrides'),
+                          job.spec.get('curves'), output_name=job.dataset)
+    # Expression curves defined on the computed dataset are carried over and
+    # refreshed by their own (downstream) jobs
+    expressions = old.metadata.get(EXPRESSIONS_KEY)
+    if expressions:
+        new.metadata[EXPRESSIONS_KEY] = expressions
+        computed = {log.name for log in new.well_logs}
+        new.well_logs.extend(log for log in old.well_logs if log.name in expressions and log.name not in computed)
+    datasets[job.dataset] = new
+
+
+def recompute_well(well_file: str, dry_run: bool = False) -> Dict:
+    """
+    Recompute the stale computed curves of one well
+
+    Jobs are visited in topological order; a job runs when one of its
+    inputs or parameters changed since it was last computed. Only the
+    datasets that changed are written back.
+
+    Returns:
+        {'jobs': n, 'stale': [{'job', 'reason'}], 'recomputed': [...], 'datasets': [...]}
+    """
+    # Dry runs only read; a recompute holds the write lock from read to write-back
+    # so curves another worker adds to the same datasets in between are not lost
+    with well_lock(well_file, exclusive=not dry_run):
+        return _recompute_well(well_file, dry_run)
+
+
+def _recompute_well(well_file: str, dry_run: bool) -> Dict:
+    well = Well.deserialize(filepath=well_file)
+    datasets = {ds.name: ds for ds in well.datasets}
+    order = topological_order(collect_jobs(datasets))
+
+    stale, recomputed, changed = [], [], []
+    dirty: Set[Tuple[str, str]] = set()
+    for job in order:
+        reason = stale_reason(job, datasets, dirty if dry_run else frozenset())
+        if reason is None:
+            continue
+        stale.append({'job': job.id, 'reason': reason})
+        if dry_run:
+            dirty.update((job.dataset, curve) for curve in job.outputs)
+            continue
+        run_job(job, datasets)
+        recomputed.append(job.id)
+        if job.dataset not in changed:
+            changed.append(job.dataset)
+
+    for name in changed:
+        Well.replace_dataset_in_file(well_file, datasets[name])
+    return {'jobs': len(order), 'stale': stale, 'recomputed': recomputed, 'datasets': changed}
+
+
+def recompute_wells(well_files: List[str], dry_run: bool = False, max_workers: int = 4) -> Dict[str, Dict]:
+    """Recompute several wells concurrently; failures are reported per well"""
+    def run(well_file):
+        well_name = os.path.splitext(os.path.basename(well_file))[0]
+        try:
+            return well_name, recompute_well(well_file, dry_run)
+        except Exception as e:
+            return well_name, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(run, well_files))
+
+
+def provenance_graph(well_file: str) -> Dict:
+    """Nodes (jobs) and edges (curve dependencies) of a well's computed curves"""
+    well = Well.deserialize(filepath=well_file)
+    datasets = {ds.name: ds for ds in well.datasets}
+    jobs = topological_order(collect_jobs(datasets))
+    producers = {(job.dataset, curve): job.id for job in jobs for curve in job.outputs}
+    edges = [
+        {'from': producers.get(key, f'{key[0]}.{key[1]}'), 'to': job.id, 'curve': f'{key[0]}.{key[1]}'}
+        for job in jobs for key in job.inputs
+    ]
+    return {
+        'nodes': [dict(job.to_dict(), stale=stale_reason(job, datasets)) for job in jobs],
+        'edges': edges
+    }
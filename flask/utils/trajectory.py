@@ -0,0 +1,253 @@
+"""
+Trajectory Module
+Builds minimum curvature trajectories from DIRECTIONAL datasets, for a
+single well or for every well of a project, and cached MD <-> TVD lookups
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.fe_data_objects import Well, Dataset, Trajectory, minimum_curvature, project_well_files
+
+DIRECTIONAL_DATASET = 'DIRECTIONAL'
+
+# Mnemonics accepted for each survey column, in order of preference
+MD_MNEMONICS = ['MD', 'DEPTH', 'DEPT', 'MDEPTH']
+INCLINATION_MNEMONICS = ['INC', 'INCL', 'INCLINATION', 'DEVI', 'DEV', 'DEVIATION']
+AZIMUTH_MNEMONICS = ['AZI', 'AZIM', 'AZIMUTH', 'HAZI']
+# WELL_HEADER constants accepted as the depth reference elevation (normalised names)
+ELEVATION_CONSTANTS = ['KB', 'KBELEV', 'KBELEVATION', 'ELEVKB', 'EKB', 'RKB', 'DF', 'ELEVATION']
+
+
+def _find_log(dataset: Dataset, mnemonics) -> Optional[np.ndarray]:
+    logs = {log.name.upper(): log for log in dataset.well_logs}
+    for mnemonic in mnemonics:
+        if mnemonic in logs:
+            return np.array([np.nan if v is None else v for v in logs[mnemonic].log], dtype=float)
+    return None
+
+
+def survey_arrays(dataset: Dataset) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract (md, inclination, azimuth) column arrays from a directional dataset
+
+    Stations with a missing value are dropped and the result is sorted by MD.
+
+    Raises:
+        ValueError: If the dataset has no MD, inclination or azimuth curve
+    """
+    md = _find_log(dataset, MD_MNEMONICS)
+    if md is None and dataset.index_log:
+        md = np.array([np.nan if v is None else v for v in dataset.index_log], dtype=float)
+    inc = _find_log(dataset, INCLINATION_MNEMONICS)
+    azi = _find_log(dataset, AZIMUTH_MNEMONICS)
+
+    if md is None or inc is None or azi is None:
+        raise ValueError(f"Dataset '{dataset.name}' needs MD, inclination and azimuth curves")
+
+    n = min(md.size, inc.size, azi.size)
+    md, inc, azi = md[:n], inc[:n], azi[:n]
+    valid = np.isfinite(md) & np.isfinite(inc) & np.isfinite(azi)
+    md, inc, azi = md[valid], inc[valid], azi[valid]
+    order = np.argsort(md, kind='stable')
+    return md[order], inc[order], azi[order]
+
+
+def well_trajectory(well: Well, dataset_name: str = DIRECTIONAL_DATASET) -> Trajectory:
+    """Minimum curvature trajectory of a well from its directional dataset"""
+    md, inc, azi = survey_arrays(well.get_dataset(dataset_name))
+    return minimum_curvature(md, inc, azi)
+
+
+def _trajectory_from_file(well_file: str, dataset_name: str) -> Trajectory:
+    dataset = Well.load_dataset_from_file(well_file, dataset_name)
+    md, inc, azi = survey_arrays(dataset)
+    return minimum_curvature(md, inc, azi)
+
+
+def project_trajectories(project_path: str, dataset_name: str = DIRECTIONAL_DATASET,
+                         max_workers: int = 4) -> Dict[str, Dict]:
+    """
+    Compute trajectories for every well of a project
+
+    Only the directional dataset segment of each well is read.
+
+    Args:
+        project_path: Root folder of the project
+        dataset_name: Name of the directional dataset
+        max_workers: Number of wells processed concurrently
+
+    Returns:
+        Dictionary mapping well name to {'trajectory': Trajectory} or
+        {'error': message} for wells without a usable survey
+    """
+    well_files = project_well_files(project_path)
+
+    def run(well_file):
+        well_name = os.path.splitext(os.path.basename(well_file))[0]
+        try:
+            return well_name, {'trajectory': _trajectory_from_file(well_file, dataset_name)}
+        except Exception as e:
+            return well_name, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(run, well_files))
+
+
+def trajectory_summary(traj: Trajectory) -> Dict:
+    """Key figures of a trajectory for listings"""
+    if traj.md.size == 0:
+        return {'stations': 0}
+    return {
+        'stations': int(traj.md.size),
+        'tdMd': float(traj.md[-1]),
+        'tdTvd': float(traj.tvd[-1]),
+        'maxInclination': float(np.max(traj.inclination)),
+        'maxDls': float(np.max(traj.dls)),
+        'horizontalDisplacement': float(np.hypot(traj.north[-1], traj.east[-1]))
+    }
+
+
+def _arc_tvd(traj: Trajectory, md: np.ndarray) -> np.ndarray:
+    """TVD at MD values between the stations, following each minimum curvature arc.
+
+    Along an arc of dogleg DL the tangent is the slerp of the station
+    tangents; integrating it from the upper station to angle phi gives
+    R / sin(DL) * (t1 * (cos(DL - phi) - cos(DL)) + t2 * (1 - cos(phi))),
+    which at phi = DL is the ratio-factor step used by minimum_curvature.
+    """
+    k = np.clip(np.searchsorted(traj.md, md, side='right') - 1, 0, traj.md.size - 2)
+    course = traj.md[k + 1] - traj.md[k]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(course > 0, (md - traj.md[k]) / course, 0.0)
+    dogleg = np.radians(traj.dogleg[k + 1])
+    cos1 = np.cos(np.radians(traj.inclination[k]))
+    cos2 = np.cos(np.radians(traj.inclination[k + 1]))
+
+    step = fraction * course * cos1
+    arc = dogleg > 1e-9
+    dl, phi = dogleg[arc], fraction[arc] * dogleg[arc]
+    radius = course[arc] / dl
+    step[arc] = radius / np.sin(dl) * (cos1[arc] * (np.cos(dl - phi) - np.cos(dl)) + cos2[arc] * (1.0 - np.cos(phi)))
+    return traj.tvd[k] + step
+
+
+class DepthConverter:
+    """
+    MD <-> TVD/TVDSS lookup table for one well
+
+    The table is the minimum curvature trajectory of the survey stations,
+    with TVD evaluated along each circular arc at table_step intervals, so
+    it matches minimum_curvature at the stations and conversions are a
+    single np.interp call regardless of the number of samples requested.
+    """
+
+    def __init__(self, md, inclination, azimuth, elevation: float = 0.0, table_step: float = 1.0):
+        md = np.asarray(md, dtype=float)
+        if md.size == 0:
+            raise ValueError('Survey has no stations')
+        traj = minimum_curvature(md, inclination, azimuth)
+        self.md, self.tvd = traj.md, traj.tvd
+        if md.size > 1 and table_step > 0:
+            dense = np.union1d(np.arange(md[0], md[-1], table_step), md)
+            self.md, self.tvd = dense, _arc_tvd(traj, dense)
+        self.elevation = elevation
+        # TVD stops increasing in horizontal or upward sections; the inverse
+        # lookup maps such a TVD to the first MD that reaches it
+        tvd_monotonic = np.maximum.accumulate(self.tvd)
+        keep = np.concatenate(([True], np.diff(tvd_monotonic) > 0))
+        self._inverse_tvd = tvd_monotonic[keep]
+        self._inverse_md = self.md[keep]
+
+    def to_tvd(self, md) -> np.ndarray:
+        """TVD for an array of MD values (vertical hole above the first station,
+        straight tangent below the last)"""
+        md = np.array(md, dtype=float, ndmin=1)
+        tvd = np.interp(md, self.md, self.tvd)
+        above = md < self.md[0]
+        tvd[above] = self.tvd[0] - (self.md[0] - md[above])
+        if self.md.size > 1:
+            below = md > self.md[-1]
+            slope = (self.tvd[-1] - self.tvd[-2]) / (self.md[-1] - self.md[-2])
+            tvd[below] = self.tvd[-1] + (md[below] - self.md[-1]) * slope
+        return tvd
+
+    def to_tvdss(self, md) -> np.ndarray:
+        """True vertical depth subsea (positive down) for an array of MD values"""
+        return self.to_tvd(md) - self.elevation
+
+    def to_md(self, tvd) -> np.ndarray:
+        """MD for an array of TVD values (clamped to the deepest surveyed TVD)"""
+        tvd = np.array(tvd, dtype=float, ndmin=1)
+        table_tvd, table_md = self._inverse_tvd, self._inverse_md
+        md = np.interp(tvd, table_tvd, table_md)
+        above = tvd < table_tvd[0]
+        md[above] = table_md[0] - (table_tvd[0] - tvd[above])
+        return md
+
+    def convert(self, values, depth_type: str) -> np.ndarray:
+        """Convert MD values to 'MD', 'TVD' or 'TVDSS'"""
+        depth_type = depth_type.upper()
+        if depth_type == 'MD':
+            return np.array(values, dtype=float, ndmin=1)
+        if depth_type == 'TVD':
+            return self.to_tvd(values)
+        if depth_type == 'TVDSS':
+            return self.to_tvdss(values)
+        raise ValueError(f"Unknown depth type '{depth_type}'. Use MD, TVD or TVDSS")
+
+
+def reference_elevation(dataset: Dataset) -> float:
+    """Depth reference elevation from WELL_HEADER constants, 0 if none is set"""
+    constants = {re.sub(r'[^A-Z0-9]', '', str(c.name).upper()): c.value for c in dataset.constants}
+    for name in ELEVATION_CONSTANTS:
+        try:
+            return float(constants[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return 0.0
+
+
+# Converters keyed by well file, rebuilt only when the survey or header changes
+_converter_cache: Dict[str, Tuple[tuple, DepthConverter]] = {}
+_converter_lock = threading.Lock()
+
+
+def _survey_signature(well_file: str, dataset_name: str) -> tuple:
+    manifest = Well.read_manifest(well_file)
+    if manifest is None:
+        stat = os.stat(well_file)
+        return ('file', stat.st_mtime_ns, stat.st_size)
+    hashes = {seg['name']: seg.get('sha256') for seg in manifest['segments']}
+    return ('segments', hashes.get(dataset_name), hashes.get('WELL_HEADER'))
+
+
+def get_depth_converter(well_file: str, dataset_name: str = DIRECTIONAL_DATASET) -> DepthConverter:
+    """
+    Cached DepthConverter for a well file
+
+    Raises:
+        ValueError: If the well has no usable directional survey
+    """
+    key = f'{os.path.abspath(well_file)}::{dataset_name}'
+    signature = _survey_signature(well_file, dataset_name)
+    with _converter_lock:
+        cached = _converter_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    md, inc, azi = survey_arrays(Well.load_dataset_from_file(well_file, dataset_name))
+    try:
+        elevation = reference_elevation(Well.load_dataset_from_file(well_file, 'WELL_HEADER'))
+    except ValueError:
+        elevation = 0.0
+    converter = DepthConverter(md, inc, azi, elevation=elevation)
+
+    with _converter_lock:
+        _converter_cache[key] = (signature, converter)
+    return converter
@@ -0,0 +1,450 @@
+"""
+Zonation Module
+Turns TOPS/ZONES datasets into sorted depth intervals, assigns dataset
+samples to zones and computes per-zone statistics and RESSUM rows for
+one or many wells with grouped (bincount) reductions
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.fe_data_objects import Well, Dataset, RESSUM
+
+TOPS_DATASET = 'TOPS'
+
+# Mnemonics accepted for each reservoir curve, in order of preference
+PHIE_MNEMONICS = ['PHIE', 'PHIT_E', 'POR', 'PHI', 'PHIT']
+SW_MNEMONICS = ['SWE', 'SW', 'SWT', 'SWA']
+VSH_MNEMONICS = ['VSH', 'VCL', 'VSHALE', 'VCLAY', 'VSHGR']
+# Logs describing zones in TOPS/ZONES datasets (normalised names)
+ZONE_NAME_LOGS = ['TOP', 'ZONE', 'NAME', 'FORMATION', 'SURFACE']
+ZONE_TOP_LOGS = ['DEPTH', 'TOPDEPTH', 'TOPMD', 'MD', 'TOP']
+ZONE_BOTTOM_LOGS = ['BOTTOM', 'BASE', 'BOTTOMDEPTH', 'BASEDEPTH', 'BASEMD']
+
+DEFAULT_CUTOFFS = {'phie': 0.1, 'sw': 0.5, 'vsh': 0.4}
+
+
+@dataclass
+class ZoneIntervals:
+    """Sorted, non-overlapping depth intervals [top, bottom) with zone names"""
+    names: np.ndarray
+    tops: np.ndarray
+    bottoms: np.ndarray
+
+    def __len__(self):
+        return int(self.tops.size)
+
+    def assign(self, depth) -> np.ndarray:
+        """
+        Zone number of every depth sample (-1 outside all zones)
+
+        One searchsorted over the zone tops; a sample belongs to the last
+        zone starting at or above it if it lies above that zone's bottom.
+        """
+        depth = np.asarray(depth, dtype=float)
+        zone = np.searchsorted(self.tops, depth, side='right') - 1
+        inside = zone >= 0
+        inside[inside] = depth[inside] < self.bottoms[zone[inside]]
+        zone[~inside] = -1
+        return zone
+
+
+def _normalise(name: str) -> str:
+    return re.sub(r'[^A-Z0-9]', '', str(name).upper())
+
+
+def _log_values(dataset: Dataset, candidates, log_type: str = None):
+    logs = {_normalise(log.name): log for log in dataset.well_logs}
+    for candidate in candidates:
+        log = logs.get(candidate)
+        if log is None:
+            continue
+        if log_type == 'str' and log.log_type != 'str':
+            continue
+        if log_type == 'float' and log.log_type == 'str':
+            continue
+        return log.log
+    return None
+
+
+def intervals_from_dataset(dataset: Dataset, bottom: float = np.inf) -> ZoneIntervals:
+    """
+    Build zone intervals from a TOPS or ZONES dataset
+
+    TOPS datasets hold a name log (TOP) and a DEPTH log; each zone runs
+    from its top to the next one, the last to bottom. ZONES datasets may
+    also carry an explicit BOTTOM/BASE log.
+
+    Raises:
+        ValueError: If the dataset has no zone name or top depth logs
+    """
+    names = _log_values(dataset, ZONE_NAME_LOGS, 'str')
+    tops = _log_values(dataset, ZONE_TOP_LOGS, 'float')
+    if tops is None and dataset.index_log:
+        tops = dataset.index_log
+    if names is None or tops is None:
+        raise ValueError(f"Dataset '{dataset.name}' needs zone name and top depth logs")
+    bottoms = _log_values(dataset, ZONE_BOTTOM_LOGS, 'float')
+
+    n = min(len(names), len(tops))
+    names = np.array(names[:n], dtype=object)
+    tops = np.array([np.nan if v is None else v for v in tops[:n]], dtype=float)
+    valid = np.isfinite(tops) & np.array([v is not None for v in names], dtype=bool)
+    order = np.argsort(tops[valid], kind='stable')
+    names, tops = names[valid][order], tops[valid][order]
+
+    if bottoms is not None:
+        explicit = np.array([np.nan if v is None else v for v in bottoms[:n]], dtype=float)[valid][order]
+    else:
+        explicit = np.full(tops.size, np.nan)
+    # Zones end at the next top unless an explicit (shallower) bottom is given
+    next_top = np.append(tops[1:], bottom)
+    bottoms = np.where(np.isfinite(explicit), np.minimum(explicit, next_top), next_top)
+    return ZoneIntervals(names=names, tops=tops, bottoms=bottoms)
+
+
+def sample_thickness(depth) -> np.ndarray:
+    """Thickness represented by each sample (half the distance to each neighbour)"""
+    depth = np.asarray(depth, dtype=float)
+    if depth.size < 2:
+        return np.zeros(depth.size)
+    edges = np.concatenate(([depth[0]], (depth[1:] + depth[:-1]) / 2.0, [depth[-1]]))
+    edges[0] -= (depth[1] - depth[0]) / 2.0
+    edges[-1] += (depth[-1] - depth[-2]) / 2.0
+    return np.abs(np.diff(edges))
+
+
+def zonal_statistics(zone, n_zones: int, curves: Dict[str, np.ndarray]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Count, mean, min and max of each curve per zone
+
+    Args:
+        zone: Zone number of every sample (-1 outside all zones)
+        n_zones: Number of zones
+        curves: Curve name to sample values
+
+    Returns:
+        Curve name to {'count', 'mean', 'min', 'max'} arrays of length n_zones
+    """
+    zone = np.asarray(zone)
+    stats = {}
+    for name, values in curves.items():
+        values = np.asarray(values, dtype=float)
+        keep = (zone >= 0) & np.isfinite(values)
+        z, v = zone[keep], values[keep]
+        count = np.bincount(z, minlength=n_zones)
+        total = np.bincount(z, weights=v, minlength=n_zones)
+        zmin = np.full(n_zones, np.inf)
+        zmax = np.full(n_zones, -np.inf)
+        np.minimum.at(zmin, z, v)
+        np.maximum.at(zmax, z, v)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats[name] = {
+                'count': count,
+                'mean': np.where(count > 0, total / count, np.nan),
+                'min': np.where(count > 0, zmin, np.nan),
+                'max': np.where(count > 0, zmax, np.nan)
+            }
+    return stats
+
+
+def reservoir_sums(zone, n_zones: int, thickness, phie, sw, vsh,
+                   cutoffs: Dict[str, float] = None) -> Dict[str, np.ndarray]:
+    """
+    RESSUM figures for every zone in one grouped pass
+
+    Net reservoir is PHIE >= phie cutoff and VSH <= vsh cutoff; pay is net
+    reservoir with SW <= sw cutoff. Averages are thickness weighted over pay.
+    """
+    cutoffs = {**DEFAULT_CUTOFFS, **(cutoffs or {})}
+    zone = np.asarray(zone)
+    thickness = np.asarray(thickness, dtype=float)
+    phie, sw, vsh = (np.asarray(a, dtype=float) for a in (phie, sw, vsh))
+
+    inside = zone >= 0
+    with np.errstate(invalid='ignore'):
+        pay = inside & (phie >= cutoffs['phie']) & (vsh <= cutoffs['vsh']) & (sw <= cutoffs['sw'])
+    z = zone[inside]
+    gross = np.bincount(z, weights=thickness[inside], minlength=n_zones)
+
+    zp, h = zone[pay], thickness[pay]
+    netpay = np.bincount(zp, weights=h, minlength=n_zones)
+    phih = np.bincount(zp, weights=phie[pay] * h, minlength=n_zones)
+    swh = np.bincount(zp, weights=sw[pay] * h, minlength=n_zones)
+    vshh = np.bincount(zp, weights=vsh[pay] * h, minlength=n_zones)
+    sophih = np.bincount(zp, weights=phie[pay] * (1.0 - sw[pay]) * h, minlength=n_zones)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            'gross': gross,
+            'netpay': netpay,
+            'ntg': np.where(gross > 0, netpay / gross, np.nan),
+            'phie': np.where(netpay > 0, phih / netpay, np.nan),
+            'swe': np.where(netpay > 0, swh / netpay, np.nan),
+            'vsh': np.where(netpay > 0, vshh / netpay, np.nan),
+            'phih': phih,
+            'sophih': sophih
+        }
+
+
+def _reservoir_curves(dataset: Dataset, curves: Dict[str, str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    curves = curves or {}
+    result = []
+    for key, mnemonics in (('phie', PHIE_MNEMONICS), ('sw', SW_MNEMONICS), ('vsh', VSH_MNEMONICS)):
+        candidates = [_normalise(curves[key])] if curves.get(key) else mnemonics
+        values = _log_values(dataset, candidates, 'float')
+        if values is None:
+            raise ValueError(f"Dataset '{dataset.name}' has no {key.upper()} curve ({', '.join(candidates)})")
+        result.append(np.array([np.nan if v is None else v for v in values], dtype=float))
+    return tuple(result)
+
+
+@dataclass
+class WellZonation:
+    """Samples of one well assigned to its zones, ready for grouped reductions"""
+    well: str
+    dataset: str
+    reference: str
+    intervals: ZoneIntervals
+    depth: np.ndarray
+    zone: np.ndarray
+    thickness: np.ndarray
+    phie: np.ndarray
+    sw: np.ndarray
+    vsh: np.ndarray
+    curves: Dict[str, np.ndarray]
+
+
+def well_zonation(well_file: str, dataset_name: str = 'MAIN', zones_dataset: str = TOPS_DATASET,
+                  curves: Dict[str, str] = None, log_names: List[str] = None) -> WellZonation:
+    """
+    Load a well's zones and curves (only the two dataset segments are read)
+
+    Raises:
+        ValueError: If a dataset or a required curve is missing
+    """
+    well_name = os.path.splitext(os.path.basename(well_file))[0]
+    dataset = Well.load_dataset_from_file(well_file, dataset_name)
+    depth = np.array([np.nan if v is None else v for v in dataset.index_log], dtype=float)
+    thickness = sample_thickness(depth)
+    # The deepest zone ends at the base of the last sample
+    bottom = float(np.nanmax(depth + thickness / 2.0)) if depth.size else np.inf
+    intervals = intervals_from_dataset(Well.load_dataset_from_file(well_file, zones_dataset), bottom=bottom)
+    phie, sw, vsh = _reservoir_curves(dataset, curves)
+    extra = {}
+    for name in log_names or []:
+        extra[name] = np.array([np.nan if v is None else v for v in dataset.get_log(name).log], dtype=float)
+    return WellZonation(
+        well=well_name,
+        dataset=dataset.name,
+        reference=zones_dataset,
+        intervals=intervals,
+        depth=depth,
+        zone=intervals.assign(depth),
+        thickness=thickness,
+        phie=phie,
+        sw=sw,
+        vsh=vsh,
+        curves=extra
+    )
+
+
+def load_zonations(well_files: List[str], max_workers: int = 4, **kwargs) -> Tuple[List[WellZonation], Dict[str, str]]:
+    """Load several wells concurrently; returns (zonations, errors by well name)"""
+    def run(well_file):
+        try:
+            return well_zonation(well_file, **kwargs), None
+        except Exception as e:
+            return os.path.splitext(os.path.basename(well_file))[0], str(e)
+
+    zonations, errors = [], {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for result, error in pool.map(run, well_files):
+            if error is None:
+                zonations.append(result)
+            else:
+                errors[result] = error
+    return zonations, errors
+
+
+def _stack(zonations: List[WellZonation]):
+    """Concatenate the samples of all wells with project-wide zone numbers"""
+    offsets = np.cumsum([0] + [len(zn.intervals) for zn in zonations])
+    zone = np.concatenate([np.where(zn.zone >= 0, zn.zone + off, -1) for zn, off in zip(zonations, offsets)]) \
+        if zonations else np.array([], dtype=int)
+    return int(offsets[-1]), zone
+
+
+def ressum_table(zonations: List[WellZonation], cutoffs: Dict[str, float] = None) -> List[RESSUM]:
+    """RESSUM rows for every zone of every well in a single grouped pass"""
+    cutoffs = {**DEFAULT_CUTOFFS, **(cutoffs or {})}
+    if not zonations:
+        return []
+    n_zones, zone = _stack(zonations)
+    sums = reservoir_sums(
+        zone, n_zones,
+        np.concatenate([zn.thickness for zn in zonations]),
+        np.concatenate([zn.phie for zn in zonations]),
+        np.concatenate([zn.sw for zn in zonations]),
+        np.concatenate([zn.vsh for zn in zonations]),
+        cutoffs
+    )
+    rows, i = [], 0
+    for zn in zonations:
+        for name, top, bottom in zip(zn.intervals.names, zn.intervals.tops, zn.intervals.bottoms):
+            rows.append(RESSUM(
+                well=zn.well, interval=str(name), top=float(top), bottom=float(bottom),
+                gross=float(sums['gross'][i]),
+                phiec=cutoffs['phie'], swec=cutoffs['sw'], vshc=cutoffs['vsh'],
+                phie=float(sums['phie'][i]), swe=float(sums['swe'][i]), vsh=float(sums['vsh'][i]),
+                phih=float(sums['phih'][i]), sophih=float(sums['sophih'][i]),
+                netpay=float(sums['netpay'][i]), ntg=float(sums['ntg'][i]),
+                dataset=zn.dataset, reference=zn.reference
+            ))
+            i += 1
+    return rows
+
+
+def cutoff_sensitivity(zone, n_zones: int, thickness, phie, sw, vsh,
+                       phie_cutoffs, sw_cutoffs, vsh_cutoffs) -> Dict[str, np.ndarray]:
+    """
+    RESSUM figures for every zone and every cutoff combination in one sweep
+
+    Each sample is binned once against each sorted cutoff list, and the
+    thickness-weighted sums are accumulated in a (zone, vsh, sw, phie) bin
+    histogram. Cumulative sums along the cutoff axes then give the sums
+    for every combination without re-filtering the samples:
+    VSH <= c and SW <= c accumulate upwards, PHIE >= c accumulates downwards.
+
+    Returns:
+        Arrays shaped (n_zones, len(vsh_cutoffs), len(sw_cutoffs), len(phie_cutoffs))
+        for netpay, ntg, phie, swe, vsh, phih and sophih, plus 'gross' per zone
+        and the sorted cutoff lists
+    """
+    vc = np.sort(np.asarray(vsh_cutoffs, dtype=float))
+    sc = np.sort(np.asarray(sw_cutoffs, dtype=float))
+    pc = np.sort(np.asarray(phie_cutoffs, dtype=float))
+    nv, ns, npc = vc.size, sc.size, pc.size
+
+    zone = np.asarray(zone)
+    thickness = np.asarray(thickness, dtype=float)
+    phie, sw, vsh = (np.asarray(a, dtype=float) for a in (phie, sw, vsh))
+
+    inside = zone >= 0
+    gross = np.bincount(zone[inside], weights=thickness[inside], minlength=n_zones)
+
+    use = inside & np.isfinite(phie) & np.isfinite(sw) & np.isfinite(vsh)
+    z, h, ph, s, v = zone[use], thickness[use], phie[use], sw[use], vsh[use]
+    # Bin b passes cutoff j when j >= b (VSH, SW) or j < b (PHIE)
+    bv = np.searchsorted(vc, v, side='left')
+    bs = np.searchsorted(sc, s, side='left')
+    bp = np.searchsorted(pc, ph, side='right')
+    shape = (n_zones, nv + 1, ns + 1, npc + 1)
+    flat = np.ravel_multi_index((z, bv, bs, bp), shape)
+
+    def sweep(weights):
+        hist = np.bincount(flat, weights=weights, minlength=int(np.prod(shape))).reshape(shape)
+        hist = np.cumsum(hist, axis=1)[:, :nv]
+        hist = np.cumsum(hist, axis=2)[:, :, :ns]
+        hist = np.flip(np.cumsum(np.flip(hist, axis=3), axis=3), axis=3)
+        return hist[:, :, :, 1:]
+
+    netpay = sweep(h)
+    phih = sweep(ph * h)
+    swh = sweep(s * h)
+    vshh = sweep(v * h)
+    sophih = sweep(ph * (1.0 - s) * h)
+
+    g = gross[:, None, None, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            'gross': gross,
+            'netpay': netpay,
+            'ntg': np.where(g > 0, netpay / g, np.nan),
+            'phie': np.where(netpay > 0, phih / netpay, np.nan),
+            'swe': np.where(netpay > 0, swh / netpay, np.nan),
+            'vsh': np.where(netpay > 0, vshh / netpay, np.nan),
+            'phih': phih,
+            'sophih': sophih,
+            'vsh_cutoffs': vc,
+            'sw_cutoffs': sc,
+            'phie_cutoffs': pc
+        }
+
+
+def sensitivity_table(zonations: List[WellZonation], phie_cutoffs, sw_cutoffs, vsh_cutoffs) -> Dict[str, np.ndarray]:
+    """
+    Columnar RESSUM table over all wells, zones and cutoff combinations
+
+    Returns:
+        RESSUM field name to a column array, one row per
+        (well zone, vsh cutoff, sw cutoff, phie cutoff)
+    """
+    fields = list(RESSUM.__dataclass_fields__)
+    if not zonations:
+        return {name: np.array([]) for name in fields}
+    n_zones, zone = _stack(zonations)
+    sums = cutoff_sensitivity(
+        zone, n_zones,
+        np.concatenate([zn.thickness for zn in zonations]),
+        np.concatenate([zn.phie for zn in zonations]),
+        np.concatenate([zn.sw for zn in zonations]),
+        np.concatenate([zn.vsh for zn in zonations]),
+        phie_cutoffs, sw_cutoffs, vsh_cutoffs
+    )
+    vc, sc, pc = sums['vsh_cutoffs'], sums['sw_cutoffs'], sums['phie_cutoffs']
+    combos = vc.size * sc.size * pc.size
+
+    def per_zone(values):
+        return np.repeat(np.asarray(values), combos)
+
+    grid_v, grid_s, grid_p = np.meshgrid(vc, sc, pc, indexing='ij')
+    table = {
+        'well': per_zone([zn.well for zn in zonations for _ in range(len(zn.intervals))]),
+        'interval': per_zone([str(name) for zn in zonations for name in zn.intervals.names]),
+        'top': per_zone(np.concatenate([zn.intervals.tops for zn in zonations])),
+        'bottom': per_zone(np.concatenate([zn.intervals.bottoms for zn in zonations])),
+        'gross': per_zone(sums['gross']),
+        'phiec': np.tile(grid_p.ravel(), n_zones),
+        'swec': np.tile(grid_s.ravel(), n_zones),
+        'vshc': np.tile(grid_v.ravel(), n_zones),
+        'dataset': per_zone([zn.dataset for zn in zonations for _ in range(len(zn.intervals))]),
+        'reference': per_zone([zn.reference for zn in zonations for _ in range(len(zn.intervals))])
+    }
+    for name in ('phie', 'swe', 'vsh', 'phih', 'sophih', 'netpay', 'ntg'):
+        table[name] = sums[name].ravel()
+    return {name: table[name] for name in fields}
+
+
+def zone_statistics_table(zonations: List[WellZonation]) -> List[Dict]:
+    """Per-zone count/mean/min/max of the extra curves of every well"""
+    if not zonations:
+        return []
+    n_zones, zone = _stack(zonations)
+    names = sorted({name for zn in zonations for name in zn.curves})
+    curves = {
+        name: np.concatenate([zn.curves.get(name, np.full(zn.depth.size, np.nan)) for zn in zonations])
+        for name in names
+    }
+    stats = zonal_statistics(zone, n_zones, curves)
+    rows, i = [], 0
+    for zn in zonations:
+        for name in zn.intervals.names:
+            rows.append({
+                'well': zn.well,
+                'interval': str(name),
+                'curves': {curve: {key: float(values[i]) for key, values in stats[curve].items()}
+                           for curve in names}
+            })
+            i += 1
+    return rows
+
+
+def ressum_to_dict(row: RESSUM) -> Dict:
+    """RESSUM row as a plain dictionary"""
+    return asdict(row)
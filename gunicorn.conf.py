@@ -0,0 +1,102 @@
+"""
+Gunicorn configuration for production serving
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_PROFILE        cpu | io (default cpu)
+    GUNICORN_WORKERS        worker processes
+    GUNICORN_THREADS        threads per worker
+    GUNICORN_WORKER_CLASS   sync | gthread | gevent | eventlet
+    GUNICORN_TIMEOUT        seconds before a silent worker is restarted
+    GUNICORN_MAX_REQUESTS   requests before a worker is recycled (0 = never)
+    GUNICORN_PIDFILE        pid file used by `production.sh reload`
+    FLASK_PORT / GUNICORN_BIND
+
+Profiles:
+    cpu  One process per core with a few threads. Plot rendering
+         (matplotlib) and the petrophysics/QC engines hold the GIL, so
+         extra processes scale them and extra threads do not.
+    io   Fewer processes with many threads. Suited to deployments
+         dominated by directory listing, file reads and data browsing.
+         GUNICORN_WORKER_CLASS=gevent switches to greenlets when gevent
+         is installed.
+
+The heavy scientific libraries are imported here, in the master, before
+the workers fork, so their import cost is paid once and their pages are
+shared copy-on-write. The application itself is loaded in each worker,
+so `kill -HUP <master pid>` (`bash production.sh reload`) restarts
+workers gracefully on new application code without dropping the socket.
+
+Import and batch jobs run in the worker that started them and publish
+their status to PETRO_JOB_STATE_DIR (see flask/utils/job_state.py), so
+status, list, stream and cancel requests can reach any worker. The NDJSON
+streams (/api/data/watch and batch job streams) each hold a thread for as
+long as the client listens; raise GUNICORN_THREADS when many clients keep
+them open.
+"""
+
+import multiprocessing
+import os
+import secrets
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+os.environ.setdefault('NODE_ENV', 'production')
+# One key shared by all workers (and kept across reloads) so sessions stay valid
+os.environ.setdefault('SECRET_KEY', secrets.token_hex(32))
+
+import numpy  # noqa: E402,F401
+import pandas  # noqa: E402,F401
+import matplotlib  # noqa: E402
+import matplotlib.pyplot  # noqa: E402,F401
+import lasio  # noqa: E402,F401
+
+matplotlib.use('Agg')
+
+PROFILES = {
+    'cpu': {
+        'workers': multiprocessing.cpu_count(),
+        'threads': 4,
+        'worker_class': 'gthread',
+    },
+    'io': {
+        'workers': max(2, multiprocessing.cpu_count() // 2),
+        'threads': 16,
+        'worker_class': 'gthread',
+    },
+}
+
+profile = PROFILES.get(os.environ.get('GUNICORN_PROFILE', 'cpu').lower(), PROFILES['cpu'])
+
+wsgi_app = 'main:app'
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('FLASK_PORT', '5000')}")
+workers = int(os.environ.get('GUNICORN_WORKERS', profile['workers']))
+threads = int(os.environ.get('GUNICORN_THREADS', profile['threads']))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', profile['worker_class'])
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+pidfile = os.environ.get('GUNICORN_PIDFILE', '/tmp/petrophysics-gunicorn.pid')
+preload_app = False
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+if worker_class in ('gevent', 'eventlet'):
+    try:
+        __import__(worker_class)
+    except ImportError:
+        worker_class = 'gthread'
+
+
+def on_starting(server):
+    server.log.info(
+        f'Profile {os.environ.get("GUNICORN_PROFILE", "cpu")}: '
+        f'{workers} workers x {threads} threads ({worker_class})'
+    )
+
+
+def post_fork(server, worker):
+    # Workers inherit the master's random state; reseed so they diverge
+    numpy.random.seed()
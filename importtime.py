@@ -0,0 +1,88 @@
+"""
+Import-time profile of the Flask app
+Runs `python -X importtime` on a fresh interpreter that builds the app and
+prints the slowest modules, a per-package breakdown and the cold start
+time. Also lists heavy libraries that were imported eagerly.
+
+Usage:
+    python importtime.py                 # top 25 modules
+    python importtime.py --top 50 --budget 1.0
+    python importtime.py --module routes # profile a single module import
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+FLASK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flask')
+
+# Libraries that should only be imported by the routes that need them
+HEAVY_MODULES = ('pandas', 'scipy', 'matplotlib', 'lasio')
+
+PROBE = """
+import sys, time
+sys.path.insert(0, {flask_dir!r})
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print('ELAPSED', elapsed)
+print('LOADED', ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def profile(statement: str):
+    """Run the statement under -X importtime; returns (rows, elapsed, eager heavy modules)"""
+    code = PROBE.format(flask_dir=FLASK_DIR, statement=statement, heavy=HEAVY_MODULES)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, cwd=os.path.dirname(FLASK_DIR))
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    elapsed, loaded = 0.0, []
+    for line in proc.stdout.splitlines():
+        if line.startswith('ELAPSED'):
+            elapsed = float(line.split()[1])
+        elif line.startswith('LOADED'):
+            loaded = [m for m in line.split(' ', 1)[1].split(',') if m]
+    return rows, elapsed, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time profile of the Flask app')
+    parser.add_argument('--top', type=int, default=25, help='Number of modules to list')
+    parser.add_argument('--module', help='Profile `import <module>` instead of building the app')
+    parser.add_argument('--budget', type=float, help='Fail when cold start exceeds this many seconds')
+    args = parser.parse_args()
+
+    statement = f'import {args.module}' if args.module else 'import app; app.create_app()'
+    rows, elapsed, loaded = profile(statement)
+
+    print(f'{"cumulative ms":>14}{"self ms":>10}  module')
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f'{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}')
+
+    packages = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.strip().split('.')[0]] += self_us
+    print(f'\n{"self ms":>10}  package')
+    for package, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:15]:
+        print(f'{self_us / 1000:>10.1f}  {package}')
+
+    print(f'\nCold start ({statement}): {elapsed:.3f} s')
+    if loaded:
+        print(f'Heavy modules imported eagerly: {", ".join(loaded)}')
+    if args.budget is not None and elapsed > args.budget:
+        sys.exit(f'Cold start {elapsed:.3f} s exceeds budget {args.budget:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
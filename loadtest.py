@@ -0,0 +1,113 @@
+"""
+Load test for the Flask API
+Fires concurrent requests at the main /api/wells/* routes of a running
+server and reports requests/s and latency percentiles per route.
+
+Usage:
+    python loadtest.py --project petrophysics-workplace/MyProject
+    python loadtest.py --base-url http://localhost:5000 --project <path> \\
+        --well W1 --concurrency 16 --requests 200 --routes list,datasets,log-plot
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def build_scenarios(project_path: str, well: str, log_names: list) -> dict:
+    """Route name -> (method, path, params, json body)"""
+    well_file = os.path.join(project_path, '10-WELLS', f'{well}.ptrc')
+    return {
+        'health': ('GET', '/health', None, None),
+        'list': ('GET', '/api/wells/list', {'projectPath': project_path}, None),
+        'datasets': ('GET', '/api/wells/datasets', {'projectPath': project_path, 'wellName': well}, None),
+        'load': ('GET', '/api/wells/load', {'filePath': well_file}, None),
+        'data': ('GET', '/api/wells/data', {'wellPath': well_file}, None),
+        'log-plot': ('POST', f'/api/wells/{well}/log-plot', None,
+                     {'projectPath': project_path, 'logNames': log_names}),
+        'cross-plot': ('POST', f'/api/wells/{well}/cross-plot', None,
+                       {'projectPath': project_path, 'xLog': log_names[0], 'yLog': log_names[-1]}),
+    }
+
+
+def discover(base_url: str, project_path: str, well: str = None):
+    """Pick a well and up to three of its logs from the running server"""
+    if not well:
+        wells = requests.get(f'{base_url}/api/wells/list', params={'projectPath': project_path}, timeout=60).json()
+        if not wells.get('wells'):
+            sys.exit(f'No wells found in {project_path}')
+        well = wells['wells'][0]['name']
+    details = requests.get(f'{base_url}/api/wells/datasets',
+                           params={'projectPath': project_path, 'wellName': well}, timeout=60).json()
+    # Log entries carry a description; dataset entries do not
+    logs = [item['name'] for item in details.get('datasets', [])
+            if 'description' in item and item['name'] not in ('DEPT', 'DEPTH', 'MD', 'TOP')]
+    return well, logs[:3] or ['GR']
+
+
+def run_route(base_url: str, scenario: tuple, total: int, concurrency: int) -> dict:
+    method, path, params, body = scenario
+    session = requests.Session()
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, params=params, json=body, timeout=300)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if not r[1])
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': total / elapsed if elapsed else 0.0,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': percentile(0.95),
+        'max': latencies[-1] * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the petrophysics API')
+    parser.add_argument('--base-url', default=f"http://localhost:{os.environ.get('FLASK_PORT', '5000')}")
+    parser.add_argument('--project', required=True, help='Project path as the server sees it')
+    parser.add_argument('--well', help='Well name (defaults to the first well of the project)')
+    parser.add_argument('--routes', default='health,list,datasets,load,log-plot',
+                        help='Comma separated route names')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100, help='Requests per route')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    project_path = os.path.abspath(args.project)
+    well, log_names = discover(base_url, project_path, args.well)
+    scenarios = build_scenarios(project_path, well, log_names)
+
+    print(f'{base_url}  well={well}  logs={",".join(log_names)}  '
+          f'concurrency={args.concurrency}  requests/route={args.requests}')
+    print(f"{'route':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'errors':>8}")
+    for name in [r.strip() for r in args.routes.split(',') if r.strip()]:
+        if name not in scenarios:
+            print(f'{name:<12}unknown route (choose from {", ".join(scenarios)})')
+            continue
+        stats = run_route(base_url, scenarios[name], args.requests, args.concurrency)
+        print(f"{name:<12}{stats['rps']:>10.1f}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+              f"{stats['max']:>10.1f}{stats['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,28 @@
 #!/bin/bash
 
 # Production startup script
-# Flask serves both API and static files on port 5000
+# Flask serves both API and static files on port 5000 through gunicorn
+# (worker model configured in gunicorn.conf.py / GUNICORN_* variables)
+#
+#   bash production.sh          start the server
+#   bash production.sh reload   gracefully restart workers on new code
+#   bash production.sh stop     stop the server
 
 export NODE_ENV=production
-export FLASK_PORT=5000
+export FLASK_PORT=${FLASK_PORT:-5000}
+export GUNICORN_PIDFILE=${GUNICORN_PIDFILE:-/tmp/petrophysics-gunicorn.pid}
 
-echo "Starting production server..."
-uv run python flask/app.py
+case "$1" in
+  reload)
+    echo "Reloading production server..."
+    kill -HUP "$(cat "$GUNICORN_PIDFILE")"
+    ;;
+  stop)
+    echo "Stopping production server..."
+    kill -TERM "$(cat "$GUNICORN_PIDFILE")"
+    ;;
+  *)
+    echo "Starting production server..."
+    exec uv run gunicorn --config gunicorn.conf.py main:app
+    ;;
+esac
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the backend tests
+The backend imports its modules as utils.<module>, as the Flask app does,
+so the flask folder goes on the import path.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'flask'))
+
+from utils.fe_data_objects import Dataset, WellLog  # noqa: E402
+
+
+def make_dataset(name: str, curves: dict, depth=None, well_name: str = 'W1') -> Dataset:
+    """Dataset with a DEPT index and one float log per curves entry"""
+    size = len(next(iter(curves.values()))) if curves else 0
+    depth = np.arange(size, dtype=float) if depth is None else depth
+    return Dataset(
+        date_created=datetime(2024, 1, 1),
+        name=name,
+        type='Cont',
+        wellname=well_name,
+        index_log=[float(d) for d in depth],
+        index_name='DEPT',
+        well_logs=[
+            WellLog(name=curve, date='2024-01-01', description='', interpolation='CONTINUOUS',
+                    log_type='float', log=[float(v) for v in values], dtst=name)
+            for curve, values in curves.items()
+        ]
+    )
+
+
+@pytest.fixture
+def write_las(tmp_path):
+    """Write a small LAS 2.0 file and return its path"""
+    import lasio
+
+    def write(filename: str, well: str, set_name: str = 'MAIN', samples: int = 50, seed: int = 0) -> str:
+        las = lasio.LASFile()
+        las.well['WELL'].value = well
+        las.params.append(lasio.HeaderItem('SET', value=set_name))
+        depth = 1000.0 + np.arange(samples) * 0.5
+        las.well['STRT'].value, las.well['STOP'].value, las.well['STEP'].value = depth[0], depth[-1], 0.5
+        rng = np.random.default_rng(seed)
+        las.append_curve('DEPT', depth)
+        las.append_curve('GR', rng.uniform(20, 150, samples))
+        las.append_curve('RHOB', rng.uniform(2.0, 2.7, samples))
+        path = str(tmp_path / filename)
+        las.write(path, version=2.0)
+        return path
+
+    return write
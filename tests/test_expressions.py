@@ -0,0 +1,112 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import make_dataset
+from utils.expressions import (METADATA_KEY, ExpressionError, compile_expression, evaluate_curve,
+                               evaluate_curves, stored_definitions)
+from utils.fe_data_objects import Constant, Well
+
+
+@pytest.mark.parametrize('text', [
+    "X = __import__('os').system('true')",
+    'X = RHOB.__class__',
+    'X = open("/etc/passwd")',
+    'X = [RHOB for RHOB in GR]',
+    'X = lambda: 1',
+    'X = GR if RHOB else 1',
+    "X = 'text'",
+    'X = 1 < GR < 2',
+    'X = GR // 2',
+    'X = clip(GR, a_min=0)',
+])
+def test_rejects_unsafe_or_unsupported_syntax(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_rejects_bad_definitions():
+    for text in ('GR + 1', 'X = ', 'X = (GR'):
+        with pytest.raises(ExpressionError):
+            compile_expression(text)
+
+
+def test_huge_power_fails_fast():
+    started = time.perf_counter()
+    with pytest.raises(ExpressionError):
+        compile_expression('X = 9**9**9').evaluate({}, 4)
+    with pytest.raises(ExpressionError):
+        compile_expression(f'X = {2 ** 2000} + GR')
+    assert time.perf_counter() - started < 1.0
+
+
+def test_inputs_and_chunked_evaluation():
+    compiled = compile_expression('PHIE = (RHOMA - RHOB) / (RHOMA - RHOF) * (1 - VSH)')
+    assert compiled.name == 'PHIE'
+    assert compiled.inputs == ['RHOB', 'RHOF', 'RHOMA', 'VSH']
+
+    rhob = np.linspace(2.0, 2.65, 1001)
+    vsh = np.linspace(0.0, 0.5, 1001)
+    variables = {'RHOB': rhob, 'VSH': vsh, 'RHOMA': 2.65, 'RHOF': 1.0}
+    expected = (2.65 - rhob) / 1.65 * (1 - vsh)
+    np.testing.assert_allclose(compiled.evaluate(variables, rhob.size, chunk_size=64), expected)
+
+
+def test_logical_operators_are_element_wise():
+    gr = np.array([10.0, 80.0, 150.0])
+    result = compile_expression('SAND = GR > 20 and GR < 100 or not GR > 0').evaluate({'GR': gr}, 3)
+    assert result.tolist() == [0.0, 1.0, 0.0]
+
+
+def test_curve_is_stored_with_its_definition():
+    ds = make_dataset('MAIN', {'GR': [30.0, 60.0, 90.0, 120.0]})
+    ds.constants.append(Constant(name='GRMAX', value='120', tag=''))
+
+    result = evaluate_curve(ds, 'VSH = (GR - GRMIN) / (GRMAX - GRMIN)', parameters={'GRMIN': 30})
+    assert result['changed']
+    assert ds.get_log('VSH').log == pytest.approx([0.0, 1 / 3, 2 / 3, 1.0])
+    record = ds.metadata[METADATA_KEY]['VSH']
+    assert record['parameters'] == {'GRMAX': 120.0, 'GRMIN': 30.0}
+    assert record['overrides'] == {'GRMIN': 30.0}
+    assert stored_definitions(ds) == ['VSH = (GR - GRMIN) / (GRMAX - GRMIN)']
+
+    again = evaluate_curve(ds, 'VSH = (GR - GRMIN) / (GRMAX - GRMIN)', parameters={'GRMIN': 30})
+    assert again['cached'] and not again['changed']
+
+
+def test_unknown_name_and_self_reference():
+    ds = make_dataset('MAIN', {'GR': [1.0, 2.0]})
+    with pytest.raises(ExpressionError):
+        evaluate_curve(ds, 'X = GR * NOPE')
+    with pytest.raises(ExpressionError):
+        evaluate_curve(ds, 'GR = GR * 2')
+
+
+def test_switching_back_to_a_cached_result_still_changes_the_dataset():
+    ds = make_dataset('MAIN', {'GR': [1.0, 2.0, 3.0]})
+    evaluate_curve(ds, 'X = GR * 2')
+    evaluate_curve(ds, 'X = GR * 3')
+    result = evaluate_curve(ds, 'X = GR * 2')
+
+    # The values come from the result cache, but the stored curve was GR * 3
+    assert result['cached'] and result['changed']
+    assert ds.get_log('X').log == [2.0, 4.0, 6.0]
+
+
+def test_expression_curves_persist_in_the_well_file(tmp_path):
+    path = str(tmp_path / 'W1.ptrc')
+    Well(date_created=datetime(2024, 1, 1), well_name='W1', well_type='Dev',
+         datasets=[make_dataset('MAIN', {'GR': [20.0, 40.0, 60.0]})]).serialize(path)
+
+    ds = Well.load_dataset_from_file(path, 'MAIN')
+    results = evaluate_curves(ds, ['GR2 = GR * 2', 'GR4 = GR2 * 2'])
+    assert all(result['changed'] for result in results)
+    Well.replace_dataset_in_file(path, ds)
+
+    stored = Well.deserialize(path).get_dataset('MAIN')
+    assert stored.get_log('GR4').log == [80.0, 160.0, 240.0]
+    assert stored_definitions(stored) == ['GR2 = GR * 2', 'GR4 = GR2 * 2']
+    # Reloaded definitions are up to date, so re-running them changes nothing
+    assert not any(result['changed'] for result in evaluate_curves(stored, stored_definitions(stored)))
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from utils.fe_data_objects import DatasetExistsError, Well
+from utils.las_import import LasParseError, import_las_file, load_ingest_index
+
+
+def test_import_creates_well_then_appends(tmp_path, write_las):
+    project = str(tmp_path / 'P1')
+    first = import_las_file(write_las('a.las', 'W1', 'MAIN'), project)
+    second = import_las_file(write_las('b.las', 'W1', 'EXTRA', seed=1), project)
+
+    assert first['created'] and not second['created']
+    well = Well.deserialize(first['filePath'])
+    names = [ds.name for ds in well.datasets]
+    assert {'REFERENCE', 'WELL_HEADER', 'MAIN', 'EXTRA'} <= set(names)
+    assert {'GR', 'RHOB'} <= {log.name for log in well.get_dataset('MAIN').well_logs}
+    assert os.path.exists(os.path.join(project, '02-INPUT_LAS_FOLDER', 'b.las'))
+    assert {first['hash'], second['hash']} == set(load_ingest_index(project))
+
+
+def test_duplicate_dataset_raises_and_keeps_well(tmp_path, write_las):
+    project = str(tmp_path / 'P1')
+    result = import_las_file(write_las('a.las', 'W1', 'MAIN'), project)
+    before = Well.read_manifest(result['filePath'])
+
+    with pytest.raises(DatasetExistsError):
+        import_las_file(write_las('again.las', 'W1', 'MAIN', seed=2), project)
+    assert Well.read_manifest(result['filePath'])['segments'] == before['segments']
+
+
+def test_unparseable_file_raises_parse_error(tmp_path):
+    path = tmp_path / 'broken.las'
+    path.write_text('~V\nnot a las file\n~A\n1 2 3\n')
+
+    with pytest.raises(LasParseError) as info:
+        import_las_file(str(path), str(tmp_path / 'P1'))
+    assert 'broken.las' in str(info.value)
+    assert not isinstance(info.value, DatasetExistsError)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.fe_data_objects import minimum_curvature
+from utils.trajectory import DepthConverter
+
+
+def build_and_hold_survey():
+    """Vertical to 500 m, build at 3 deg/30 m to 60 deg, then hold"""
+    md = np.arange(0.0, 2000.0 + 1.0, 30.0)
+    inc = np.clip((md - 500.0) / 10.0, 0.0, 60.0)
+    azi = np.full(md.size, 45.0)
+    return md, inc, azi
+
+
+def test_stations_match_minimum_curvature():
+    md, inc, azi = build_and_hold_survey()
+    converter = DepthConverter(md, inc, azi, table_step=5.0)
+    expected = minimum_curvature(md, inc, azi).tvd
+    np.testing.assert_allclose(converter.to_tvd(md), expected, atol=1e-9)
+
+
+def test_quarter_circle_between_stations():
+    # A constant build to horizontal over a quarter circle of radius 100,
+    # surveyed only at both ends: points in between lie on the arc
+    md = np.array([0.0, np.pi * 50.0])
+    converter = DepthConverter(md, [0.0, 90.0], [0.0, 0.0], table_step=0.1)
+    phi = np.linspace(0.0, np.pi / 2, 11)
+    np.testing.assert_allclose(converter.to_tvd(100.0 * phi), 100.0 * np.sin(phi), atol=1e-3)
+
+
+def test_md_tvd_round_trip():
+    md, inc, azi = build_and_hold_survey()
+    converter = DepthConverter(md, inc, azi, elevation=25.0)
+    samples = np.linspace(0.0, md[-1], 3961)
+    tvd = converter.to_tvd(samples)
+
+    assert np.all(np.diff(tvd) > 0)
+    np.testing.assert_allclose(converter.to_md(tvd), samples, atol=1e-6)
+    np.testing.assert_allclose(converter.to_tvdss(samples), tvd - 25.0)
+    np.testing.assert_allclose(converter.convert(samples, 'md'), samples)
+
+
+def test_extrapolates_outside_the_survey():
+    md, inc, azi = build_and_hold_survey()
+    converter = DepthConverter(md[md >= 300.0], inc[md >= 300.0], azi[md >= 300.0])
+
+    # Vertical above the first station, straight tangent (60 deg) below the last
+    assert converter.to_tvd(100.0)[0] == pytest.approx(100.0)
+    below = converter.to_tvd([md[-1], md[-1] + 100.0])
+    assert below[1] - below[0] == pytest.approx(100.0 * np.cos(np.radians(60.0)), rel=1e-6)
+
+
+def test_horizontal_section_maps_tvd_to_first_md():
+    md = np.array([0.0, 1000.0, 1000.0 + np.pi * 50.0, 2000.0])
+    converter = DepthConverter(md, [0.0, 0.0, 90.0, 90.0], [0.0] * 4)
+    landing = converter.to_tvd(md[2])[0]
+
+    assert converter.to_md(landing)[0] == pytest.approx(md[2], abs=1e-6)
+    assert converter.to_md(landing + 50.0)[0] == pytest.approx(md[2], abs=1e-6)
+
+
+def test_unknown_depth_type_and_empty_survey():
+    with pytest.raises(ValueError):
+        DepthConverter([], [], [])
+    md, inc, azi = build_and_hold_survey()
+    with pytest.raises(ValueError):
+        DepthConverter(md, inc, azi).convert(md, 'TWT')
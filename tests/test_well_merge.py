@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_dataset
+from utils.fe_data_objects import Well, WellConflictError
+
+
+@pytest.fixture
+def well_file(tmp_path):
+    path = str(tmp_path / 'W1.ptrc')
+    Well(date_created=datetime(2024, 1, 1), well_name='W1', well_type='Dev', datasets=[
+        make_dataset('A', {'GR': [1.0, 2.0]}),
+        make_dataset('B', {'GR': [3.0, 4.0]}),
+    ]).serialize(path)
+    return path
+
+
+def gr(well: Well, name: str):
+    return well.get_dataset(name).get_log('GR').log
+
+
+def test_disjoint_changes_are_merged(well_file):
+    ours, theirs = Well.deserialize(well_file), Well.deserialize(well_file)
+    theirs.get_dataset('B').well_logs[0].log = [30.0, 40.0]
+    theirs.add_dataset(make_dataset('C', {'GR': [5.0, 6.0]}))
+    theirs.serialize(well_file)
+
+    ours.get_dataset('A').well_logs[0].log = [10.0, 20.0]
+    ours.serialize(well_file)
+
+    stored = Well.deserialize(well_file)
+    assert [ds.name for ds in stored.datasets] == ['A', 'B', 'C']
+    assert gr(stored, 'A') == [10.0, 20.0]
+    assert gr(stored, 'B') == [30.0, 40.0]
+
+
+def test_removal_on_one_side_is_kept(well_file):
+    ours, theirs = Well.deserialize(well_file), Well.deserialize(well_file)
+    theirs.remove_dataset('B')
+    theirs.serialize(well_file)
+
+    ours.add_dataset(make_dataset('C', {'GR': [5.0, 6.0]}))
+    ours.serialize(well_file)
+
+    assert [ds.name for ds in Well.deserialize(well_file).datasets] == ['A', 'C']
+
+
+def test_same_dataset_changed_on_both_sides_conflicts(well_file):
+    ours, theirs = Well.deserialize(well_file), Well.deserialize(well_file)
+    theirs.get_dataset('A').well_logs[0].log = [7.0, 8.0]
+    theirs.serialize(well_file)
+
+    ours.get_dataset('A').well_logs[0].log = [9.0, 9.0]
+    with pytest.raises(WellConflictError, match=r'Dataset\(s\) A '):
+        ours.serialize(well_file)
+    # The conflicting write left the other writer's version in place
+    assert gr(Well.deserialize(well_file), 'A') == [7.0, 8.0]
+
+
+def test_identical_change_on_both_sides_is_not_a_conflict(well_file):
+    ours, theirs = Well.deserialize(well_file), Well.deserialize(well_file)
+    for well in (theirs, ours):
+        well.get_dataset('A').well_logs[0].log = [7.0, 8.0]
+    theirs.serialize(well_file)
+    ours.serialize(well_file)
+
+    assert gr(Well.deserialize(well_file), 'A') == [7.0, 8.0]
+
+
+def test_append_by_another_writer_is_not_lost(well_file):
+    ours = Well.deserialize(well_file)
+    Well.append_dataset_to_file(well_file, make_dataset('C', {'GR': [5.0, 6.0]}))
+
+    ours.get_dataset('B').well_logs[0].log = [0.0, 0.0]
+    ours.serialize(well_file)
+
+    stored = Well.deserialize(well_file)
+    assert [ds.name for ds in stored.datasets] == ['A', 'B', 'C']
+    assert gr(stored, 'B') == [0.0, 0.0]
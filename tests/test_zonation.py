@@ -0,0 +1,59 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.zonation import cutoff_sensitivity, reservoir_sums
+
+FIGURES = ('netpay', 'ntg', 'phie', 'swe', 'vsh', 'phih', 'sophih')
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(7)
+    n = 5000
+    zone = rng.integers(-1, 4, n)  # -1: outside every zone
+    thickness = rng.uniform(0.1, 0.5, n)
+    # Values on a 0.05 grid so many samples sit exactly on a cutoff
+    phie = np.round(rng.uniform(0.0, 0.35, n) / 0.05) * 0.05
+    sw = np.round(rng.uniform(0.0, 1.0, n) / 0.05) * 0.05
+    vsh = np.round(rng.uniform(0.0, 1.0, n) / 0.05) * 0.05
+    phie[rng.choice(n, 50, replace=False)] = np.nan
+    sw[rng.choice(n, 50, replace=False)] = np.nan
+    return zone, 4, thickness, phie, sw, vsh
+
+
+def test_matches_reservoir_sums_for_every_combination(samples):
+    phie_cutoffs = [0.15, 0.05, 0.1, 0.2]
+    sw_cutoffs = [0.6, 0.4, 0.5]
+    vsh_cutoffs = [0.3, 0.5]
+    result = cutoff_sensitivity(*samples, phie_cutoffs, sw_cutoffs, vsh_cutoffs)
+
+    for (i, v), (j, s), (k, p) in itertools.product(
+            enumerate(result['vsh_cutoffs']), enumerate(result['sw_cutoffs']), enumerate(result['phie_cutoffs'])):
+        expected = reservoir_sums(*samples, cutoffs={'phie': p, 'sw': s, 'vsh': v})
+        for figure in FIGURES:
+            np.testing.assert_allclose(result[figure][:, i, j, k], expected[figure], rtol=1e-9, atol=1e-12,
+                                       err_msg=f'{figure} at vsh={v}, sw={s}, phie={p}')
+    np.testing.assert_allclose(result['gross'], expected['gross'])
+
+
+def test_cutoffs_are_sorted_and_shape_follows_them(samples):
+    result = cutoff_sensitivity(*samples, [0.2, 0.1], [0.5], [0.4, 0.2, 0.3])
+
+    assert result['netpay'].shape == (4, 3, 1, 2)
+    assert list(result['phie_cutoffs']) == [0.1, 0.2]
+    assert list(result['vsh_cutoffs']) == [0.2, 0.3, 0.4]
+    # Net pay can only grow as the VSH cutoff loosens and shrink as PHIE tightens
+    assert np.all(np.diff(result['netpay'], axis=1) >= 0)
+    assert np.all(np.diff(result['netpay'], axis=3) <= 0)
+
+
+def test_zone_without_pay():
+    zone = np.array([0, 0, 1, 1])
+    result = cutoff_sensitivity(zone, 2, np.ones(4), [0.3, 0.3, 0.01, 0.01], [0.2] * 4, [0.1] * 4,
+                                [0.1], [0.5], [0.5])
+
+    assert result['netpay'][:, 0, 0, 0].tolist() == [2.0, 0.0]
+    assert result['ntg'][1, 0, 0, 0] == 0.0
+    assert np.isnan(result['phie'][1, 0, 0, 0])